@@ -248,9 +248,12 @@ class PipedriveClient:
         return True
 
     async def fetch_all_ids(self, entity: EntityConfig) -> set[int]:
-        """Fetch all record IDs for an entity (lightweight, for comparison)."""
+        """Fetch all record IDs for an entity (lightweight, for comparison).
+
+        Uses the largest page size the entity allows to minimize round-trips.
+        """
         ids: set[int] = set()
-        async for record in self.fetch_all(entity):
+        async for record in self.fetch_all(entity, limit=entity.max_limit):
             record_id = record.get("id")
             if record_id is not None:
                 ids.add(record_id)
@@ -3,7 +3,12 @@
 import csv
 import hashlib
 import json
+import re
+import sys
 import time
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Any, Callable
 
@@ -55,16 +60,45 @@ def coerce_value(value: str, field_type: str) -> Any:
     if value is None or value == "":
         return None
 
+    if field_type in _MEMOIZED_COERCION_TYPES:
+        return _coerce_scalar(value, field_type)
+    return _coerce(value, field_type)
+
+
+# Types whose coerced values are immutable scalars: safe to share between records
+_MEMOIZED_COERCION_TYPES = frozenset({"integer", "number", "boolean"})
+
+
+def _coerce(value: str, field_type: str) -> Any:
+    """Coerce a non-empty CSV value (see coerce_value())."""
     coercer = FRICTIONLESS_TYPE_COERCERS.get(field_type)
     if coercer is None:
         return value  # Unknown type, return as-is
 
+    if field_type in _NUMERIC_TYPES and not _may_be_numeric(value):
+        return value  # Cannot parse: skip raising and catching ValueError
+
     try:
         return coercer(value)
     except (ValueError, TypeError, json.JSONDecodeError):
         return value  # Coercion failed, return original string
 
 
+_NUMERIC_TYPES = frozenset({"integer", "number"})
+_DIGIT_PATTERN = re.compile(r"\d")
+_FLOAT_SPECIAL_PATTERN = re.compile(r"\s*[+-]?(?:inf|infinity|nan)\s*", re.IGNORECASE)
+
+
+def _may_be_numeric(value: str) -> bool:
+    """Cheap prefilter: False only if int()/float() would certainly reject value."""
+    return bool(_DIGIT_PATTERN.search(value) or _FLOAT_SPECIAL_PATTERN.fullmatch(value))
+
+
+# Numeric and boolean columns repeat values (IDs, counts, flags): convert each
+# distinct value once, including ones that fail to parse
+_coerce_scalar = lru_cache(maxsize=8192)(_coerce)
+
+
 def generate_local_field_key() -> str:
     """Generate a unique local field key.
 
@@ -155,6 +189,7 @@ def load_records(
     base_path: Path,
     entity_name: str,
     coerce_types: bool = True,
+    raw_rows: list[dict[str, str]] | None = None,
 ) -> list[dict[str, Any]]:
     """Load records from CSV file with optional type coercion.
 
@@ -162,13 +197,38 @@ def load_records(
         base_path: Path to the datapackage directory
         entity_name: Name of the entity (e.g., 'persons')
         coerce_types: If True, coerce values according to Frictionless schema types
+        raw_rows: If given, the unparsed CSV row of each record is appended to it
+            (same order as the returned records)
 
     Returns:
         List of record dicts with values coerced to their schema types
     """
+    return list(iter_records(base_path, entity_name, coerce_types, raw_rows))
+
+
+def iter_records(
+    base_path: Path,
+    entity_name: str,
+    coerce_types: bool = True,
+    raw_rows: list[dict[str, str]] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Iterate over records from CSV file with optional type coercion.
+
+    Same parsing as load_records(), but yields one record at a time so that
+    callers processing records sequentially keep memory flat.
+
+    Args:
+        base_path: Path to the datapackage directory
+        entity_name: Name of the entity (e.g., 'persons')
+        coerce_types: If True, coerce values according to Frictionless schema types
+        raw_rows: If given, the unparsed CSV row of each record is appended to it
+
+    Yields:
+        Record dicts with values coerced to their schema types
+    """
     csv_path = base_path / f"{entity_name}.csv"
     if not csv_path.exists():
-        return []
+        return
 
     # Load field types from schema if coercion enabled
     field_types: dict[str, str] = {}
@@ -179,10 +239,14 @@ def load_records(
         except FileNotFoundError:
             pass  # No datapackage, skip type coercion
 
-    records: list[dict[str, Any]] = []
     with open(csv_path, encoding="utf-8") as f:
         reader = csv.DictReader(f)
+        if reader.fieldnames:
+            # Interned header keys match field-def keys by identity in dict lookups
+            reader.fieldnames = [sys.intern(name) for name in reader.fieldnames]
         for row in reader:
+            if raw_rows is not None:
+                raw_rows.append(row)
             parsed_row: dict[str, Any] = {}
             for key, value in row.items():
                 # Handle JSON-encoded complex values first (array/object)
@@ -199,8 +263,76 @@ def load_records(
                 else:
                     parsed_row[key] = value
 
-            records.append(parsed_row)
-    return records
+            yield parsed_row
+
+
+def load_record_ids(
+    base_path: Path,
+    entity_name: str,
+    max_records: int | None = None,
+) -> set[Any]:
+    """Collect record IDs from an entity CSV, parsing only the id column.
+
+    The id values are coerced like load_records() does, so they compare equal
+    to the 'id' of loaded records.
+
+    Args:
+        base_path: Path to the datapackage directory
+        entity_name: Name of the entity (e.g., 'persons')
+        max_records: Only consider the first N records (None = all)
+
+    Returns:
+        Set of non-empty record IDs
+    """
+    csv_path = base_path / f"{entity_name}.csv"
+    if not csv_path.exists():
+        return set()
+
+    id_type = None
+    try:
+        id_type = get_schema_field_types(load_package(base_path), entity_name).get("id")
+    except FileNotFoundError:
+        pass  # No datapackage, keep IDs as strings
+
+    ids: set[Any] = set()
+    with open(csv_path, encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or "id" not in header:
+            return ids
+        id_index = header.index("id")
+        # Blank lines are skipped, as csv.DictReader does
+        rows = (row for row in reader if row)
+        if max_records is not None:
+            rows = islice(rows, max_records)
+        for row in rows:
+            value = row[id_index] if id_index < len(row) else None
+            if id_type is not None:
+                value = coerce_value(value, id_type)
+            if value is not None:
+                ids.add(value)
+    return ids
+
+
+def count_records(base_path: Path, entity_name: str) -> int:
+    """Count the records in an entity CSV without parsing them into dicts.
+
+    Uses the csv module so quoted values spanning several lines count once.
+
+    Args:
+        base_path: Path to the datapackage directory
+        entity_name: Name of the entity (e.g., 'persons')
+
+    Returns:
+        Number of data rows (0 if the CSV does not exist)
+    """
+    csv_path = base_path / f"{entity_name}.csv"
+    if not csv_path.exists():
+        return 0
+    with open(csv_path, encoding="utf-8") as f:
+        # Blank lines are skipped, as csv.DictReader does
+        rows = sum(1 for row in csv.reader(f) if row)
+    return max(rows - 1, 0)
 
 
 def save_records(
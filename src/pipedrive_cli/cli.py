@@ -5,6 +5,7 @@ import copy
 import json
 import os
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -79,6 +80,7 @@ from .importer import (
 from .matching import (
     AmbiguousMatchError,
     NoMatchError,
+    build_field_index,
     find_field_by_key,
     match_entities,
     match_entity,
@@ -90,20 +92,19 @@ from .restore import restore_backup
 from .search import (
     FilterError,
     extract_filter_keys,
-    filter_record,
-    format_csv,
+    filter_records,
     format_json,
     format_resolved_expression,
     format_table,
-    preprocess_record_for_filter,
+    make_field_selector,
     resolve_field_prefixes,
     resolve_filter_expression,
-    select_fields,
     validate_expression,
+    write_records_csv,
 )
 from .transform import (
     apply_update_local,
-    evaluate_assignment,
+    compile_assignment,
     format_resolved_assignment,
     parse_assignment,
     resolve_assignment,
@@ -383,7 +384,9 @@ def entities() -> None:
 @click.option(
     "--skip-unchanged",
     is_flag=True,
-    help="Skip records that haven't changed (compares with Pipedrive data)",
+    help="Skip records that haven't changed (compares with Pipedrive data, "
+    "or with the last stored version when the local record is unchanged; "
+    "edits made in Pipedrive since then are not detected)",
 )
 @click.option(
     "--limit",
@@ -2720,6 +2723,9 @@ def record_search(
         else:
             fields = []
 
+    # Index fields once for the filter and --include/--exclude resolution
+    field_index = build_field_index(fields)
+
     # Resolve filter expression
     resolved_expr = None
     resolutions: dict[str, tuple[str, str]] = {}
@@ -2729,7 +2735,7 @@ def record_search(
     if filter_expr:
         try:
             resolved_expr, resolutions = resolve_filter_expression(
-                fields, filter_expr, on_ambiguous=on_ambiguous
+                fields, filter_expr, on_ambiguous=on_ambiguous, index=field_index
             )
             filter_keys = extract_filter_keys(fields, resolved_expr)
         except AmbiguousMatchError as e:
@@ -2771,7 +2777,7 @@ def record_search(
         prefixes = [p.strip() for p in include.split(",")]
         try:
             include_keys, unmatched = resolve_field_prefixes(
-                fields, prefixes, fail_on_ambiguous=False
+                fields, prefixes, fail_on_ambiguous=False, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(str(e))
@@ -2789,7 +2795,7 @@ def record_search(
         prefixes = [p.strip() for p in exclude.split(",")]
         try:
             exclude_keys, unmatched = resolve_field_prefixes(
-                fields, prefixes, fail_on_ambiguous=False
+                fields, prefixes, fail_on_ambiguous=False, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(str(e))
@@ -2826,15 +2832,13 @@ def record_search(
             console.print(f"[yellow]No records found for '{matched_entity.name}'[/yellow]")
             return
 
+    # Build option lookup for enum/set fields (filter comparison and table display)
+    option_lookup = build_option_lookup(fields) if fields else {}
+
     # Apply filter
     if resolved_expr:
         try:
-            # Build option lookup for enum/set field comparison
-            option_lookup = build_option_lookup(fields) if fields else {}
-            filtered = [
-                r for r in records
-                if filter_record(preprocess_record_for_filter(r, option_lookup), resolved_expr)
-            ]
+            filtered = filter_records(records, resolved_expr, option_lookup)
         except FilterError as e:
             raise click.ClickException(str(e))
     else:
@@ -2845,13 +2849,16 @@ def record_search(
         filtered = filtered[:limit]
 
     # Apply field selection
-    selected = [select_fields(r, include_keys, exclude_keys) for r in filtered]
+    selector = make_field_selector(include_keys, exclude_keys)
+    selected = [selector(r) for r in filtered]
 
     # Output
     if output_format == "json":
         print(format_json(selected))
     elif output_format == "csv":
-        print(format_csv(selected))
+        # Stream rows to stdout instead of building the whole document first
+        write_records_csv(selected, sys.stdout)
+        print()
     else:
         # Show all columns if user specified --include (they chose what to see)
         format_table(
@@ -2861,6 +2868,7 @@ def record_search(
             title=f"{matched_entity.name.title()} Search",
             show_all_columns=bool(include_keys),
             filter_keys=filter_keys,
+            option_lookup=option_lookup,
         )
 
 
@@ -3017,10 +3025,12 @@ def record_duplicates(
     # Parse and resolve key fields
     key_prefixes = [k.strip() for k in key.split(",")]
     on_ambiguous = prompt_field_choice if not quiet else None
+    # Index fields once for key, filter and --include/--exclude resolution
+    field_index = build_field_index(fields)
 
     try:
         key_fields, unmatched = resolve_field_prefixes(
-            fields, key_prefixes, fail_on_ambiguous=True
+            fields, key_prefixes, fail_on_ambiguous=True, index=field_index
         )
     except AmbiguousMatchError as e:
         raise click.ClickException(f"Ambiguous key field: {e}")
@@ -3045,7 +3055,7 @@ def record_duplicates(
     if filter_expr:
         try:
             resolved_expr, resolutions = resolve_filter_expression(
-                fields, filter_expr, on_ambiguous=on_ambiguous
+                fields, filter_expr, on_ambiguous=on_ambiguous, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(f"Ambiguous field in filter: {e}")
@@ -3107,10 +3117,7 @@ def record_duplicates(
     if resolved_expr:
         try:
             option_lookup = build_option_lookup(fields) if fields else {}
-            filtered = [
-                r for r in records
-                if filter_record(preprocess_record_for_filter(r, option_lookup), resolved_expr)
-            ]
+            filtered = filter_records(records, resolved_expr, option_lookup)
         except FilterError as e:
             raise click.ClickException(str(e))
     else:
@@ -3127,7 +3134,7 @@ def record_duplicates(
         prefixes = [p.strip() for p in include.split(",")]
         try:
             include_keys, unmatched = resolve_field_prefixes(
-                fields, prefixes, fail_on_ambiguous=False
+                fields, prefixes, fail_on_ambiguous=False, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(str(e))
@@ -3140,7 +3147,7 @@ def record_duplicates(
         prefixes = [p.strip() for p in exclude.split(",")]
         try:
             exclude_keys, unmatched = resolve_field_prefixes(
-                fields, prefixes, fail_on_ambiguous=False
+                fields, prefixes, fail_on_ambiguous=False, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(str(e))
@@ -3149,8 +3156,9 @@ def record_duplicates(
 
     # Apply field selection to records in groups
     if include_keys or exclude_keys:
+        selector = make_field_selector(include_keys, exclude_keys)
         for group in groups:
-            group.records = [select_fields(r, include_keys, exclude_keys) for r in group.records]
+            group.records = [selector(r) for r in group.records]
 
     # Apply limit to groups
     if limit and limit > 0:
@@ -3701,14 +3709,13 @@ def record_update(
         else:
             fields = []
 
-    # Build field lookup by key
-    field_by_key: dict[str, dict] = {f.get("key", ""): f for f in fields}
-
     # Build set of field keys for validation
     field_keys = {f["key"] for f in fields}
 
     # Use interactive prompt for ambiguous fields unless quiet mode
     on_ambiguous = prompt_field_choice if not quiet else None
+    # Index fields once for the filter, every assignment and the change summary
+    field_index = build_field_index(fields)
 
     # Resolve filter expression
     resolved_filter = None
@@ -3716,7 +3723,7 @@ def record_update(
     if filter_expr:
         try:
             resolved_filter, filter_resolutions = resolve_filter_expression(
-                fields, filter_expr, on_ambiguous=on_ambiguous
+                fields, filter_expr, on_ambiguous=on_ambiguous, index=field_index
             )
         except AmbiguousMatchError as e:
             raise click.ClickException(f"Ambiguous field in filter: {e}")
@@ -3745,7 +3752,7 @@ def record_update(
     for assignment in assignments:
         try:
             target_key, original_expr, resolved_expr, resolutions = resolve_assignment(
-                fields, assignment, on_ambiguous=on_ambiguous
+                fields, assignment, on_ambiguous=on_ambiguous, index=field_index
             )
 
             # Validate set expression (use TRANSFORM_FUNCTIONS for iif, coalesce, etc.)
@@ -3816,10 +3823,7 @@ def record_update(
     # Apply filter
     if resolved_filter:
         try:
-            filtered_records = [
-                r for r in records
-                if filter_record(preprocess_record_for_filter(r, option_lookup), resolved_filter)
-            ]
+            filtered_records = filter_records(records, resolved_filter, option_lookup)
         except FilterError as e:
             raise click.ClickException(str(e))
     else:
@@ -3896,7 +3900,7 @@ def record_update(
             console.print()
             console.print("[dim]Changes:[/dim]")
             for change in changes:
-                field_def = field_by_key.get(change["field"], {})
+                field_def = field_index.get(change["field"]) or {}
                 field_name = field_def.get("name", change["field"])
                 console.print(
                     f"  [cyan]#{change['id']}[/cyan] {field_name}: "
@@ -3920,6 +3924,10 @@ def record_update(
         updated_count = 0
         failed_count = 0
         errors: list[str] = []
+        compiled_assignments = [
+            (target_key, compile_assignment(resolved_expr))
+            for target_key, _, resolved_expr in resolved_assignments
+        ]
 
         try:
             with Progress(
@@ -3941,10 +3949,10 @@ def record_update(
 
                             if dry_run:
                                 # Just compute what would change
-                                for target_key, _, resolved_expr in resolved_assignments:
+                                for target_key, evaluate in compiled_assignments:
                                     try:
                                         old_value = record.get(target_key)
-                                        new_value = evaluate_assignment(record, resolved_expr)
+                                        new_value = evaluate(record)
                                         if new_value != old_value:
                                             updated_count += 1
                                             if log_file:
@@ -3963,9 +3971,9 @@ def record_update(
                                 update_payload: dict[str, Any] = {}
                                 record_failed = False
 
-                                for target_key, _, resolved_expr in resolved_assignments:
+                                for target_key, evaluate in compiled_assignments:
                                     try:
-                                        new_value = evaluate_assignment(record, resolved_expr)
+                                        new_value = evaluate(record)
                                         update_payload[target_key] = new_value
                                     except Exception as e:
                                         record_failed = True
@@ -4181,10 +4189,7 @@ def record_delete(
         records = load_records(base, matched_entity.name)
 
         if resolved_expr:
-            records_to_delete = [
-                r for r in records
-                if filter_record(preprocess_record_for_filter(r, option_lookup), resolved_expr)
-            ]
+            records_to_delete = filter_records(records, resolved_expr, option_lookup)
         else:
             records_to_delete = records
 
@@ -4274,12 +4279,7 @@ def record_delete(
 
                 # Filter records
                 if resolved_expr:
-                    records_to_del = [
-                        r for r in all_records
-                        if filter_record(
-                            preprocess_record_for_filter(r, option_lookup), resolved_expr
-                        )
-                    ]
+                    records_to_del = filter_records(all_records, resolved_expr, option_lookup)
                 else:
                     records_to_del = all_records
 
@@ -69,11 +69,23 @@ RATE_LIMIT_WINDOW = 2.0  # seconds
 
 # Restore configuration
 RESTORE_ORDER = ["organizations", "persons", "deals", "activities", "notes", "products"]
+STORE_CONCURRENCY = 10  # Records sent concurrently (still bound by the rate limiter)
+
+# Entities whose records each restorable entity references (restored first).
+# Entities that don't depend on each other are restored concurrently.
+RESTORE_DEPENDENCIES: dict[str, set[str]] = {
+    "organizations": set(),
+    "persons": {"organizations"},
+    "deals": {"organizations", "persons"},
+    "activities": {"organizations", "persons", "deals"},
+    "notes": {"organizations", "persons", "deals"},
+    "products": set(),
+}
 
 # Entities that can be backed up but not restored (read-only from API)
 READONLY_ENTITIES = {"users"}
 
-READONLY_FIELDS = {
+READONLY_FIELDS = frozenset({
     # System IDs
     "id",
     "creator_user_id",
@@ -144,4 +156,4 @@ READONLY_FIELDS = {
     "cc_email",
     "picture_id",
     "active_flag",
-}
+})
@@ -6,13 +6,24 @@ Provides shared functionality for:
 - Display formatting for resolved expressions
 """
 
+import ast
+import copy
 import re
 import warnings
+from bisect import bisect_right
+from collections import ChainMap
+from collections.abc import Mapping
+from functools import lru_cache
 from typing import Any, Callable
 
-from simpleeval import EvalWithCompoundTypes, NameNotDefined
+from simpleeval import (
+    DISALLOW_FUNCTIONS,
+    MAX_STRING_LENGTH,
+    EvalWithCompoundTypes,
+    NameNotDefined,
+)
 
-from .matching import AmbiguousMatchError, find_field_matches
+from .matching import AmbiguousMatchError, FieldIndex, build_field_index, find_field_matches
 
 # Type alias for ambiguous match callback
 AmbiguousCallback = Callable[[str, list[dict[str, Any]]], str]
@@ -20,8 +31,41 @@ AmbiguousCallback = Callable[[str, list[dict[str, Any]]], str]
 # Pattern for field("name") or field('name') - exact field name lookup
 FIELD_FUNC_PATTERN = re.compile(r'field\(\s*(["\'])(.+?)\1\s*\)')
 
+# String literals ('...' or "...") and Python identifiers in expressions
+STRING_LITERAL_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"")
+IDENTIFIER_PATTERN = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b')
 
-def resolve_field_name(fields: list[dict[str, Any]], name: str) -> str | None:
+# Hex-like tokens starting with a digit (e.g., '25da'): potential field key prefixes
+# that aren't valid Python identifiers. At least one hex letter (a-f) is required
+# to avoid matching pure numbers like '25'.
+HEX_KEY_PATTERN = re.compile(
+    r'(?<![a-zA-Z0-9_])([0-9][a-fA-F0-9]*[a-fA-F][a-fA-F0-9]*)(?![a-zA-Z0-9_])'
+)
+
+# Any token resolve_expression may replace: hex-like key prefix or identifier
+TOKEN_PATTERN = re.compile(f"{HEX_KEY_PATTERN.pattern}|{IDENTIFIER_PATTERN.pattern}")
+
+
+def _replace_tokens(text: str, replacements: dict[str, str]) -> str:
+    """Replace whole identifier/hex-key tokens in a single pass.
+
+    Args:
+        text: Text to rewrite
+        replacements: Map of token -> replacement
+
+    Returns:
+        Text with the tokens replaced
+    """
+    if not replacements:
+        return text
+    return TOKEN_PATTERN.sub(lambda m: replacements.get(m.group(0), m.group(0)), text)
+
+
+def resolve_field_name(
+    fields: list[dict[str, Any]],
+    name: str,
+    index: FieldIndex | None = None,
+) -> str | None:
     """Resolve exact field name to key. Used by field("name") syntax.
 
     Case-insensitive exact match on field name.
@@ -29,13 +73,16 @@ def resolve_field_name(fields: list[dict[str, Any]], name: str) -> str | None:
     Args:
         fields: List of field definitions with 'key' and 'name' attributes
         name: Field name to look up (exact match, case-insensitive)
+        index: Prebuilt build_field_index(fields), when resolving many names
 
     Returns:
         Field key if exactly one match found, None otherwise
     """
-    matching = [f for f in fields if f.get("name", "").lower() == name.lower()]
+    if index is None:
+        index = build_field_index(fields)
+    matching = index.name_equals(name.lower())
     if len(matching) == 1:
-        return matching[0]["key"]
+        return index.fields[matching[0]]["key"]
     return None
 
 
@@ -79,10 +126,59 @@ class EnumValue:
         return f"EnumValue({self.raw_id!r}, {self.label!r})"
 
 
+def wrap_enum_values(
+    record: dict[str, Any],
+    option_lookup: dict[str, dict[str, str]],
+    cache: dict[tuple[str, str], EnumValue] | None = None,
+) -> Mapping[str, Any]:
+    """Wrap enum/set values in EnumValue for expression evaluation.
+
+    The record is not copied: wrapped values are overlaid on it with a
+    ChainMap, or the record itself is returned when there is nothing to wrap.
+    The view is only consistent while the record is unchanged; writes to a
+    wrapped field stay hidden behind the overlay, so callers that assign
+    must not write to the record until they are done evaluating.
+    Pass the same cache for every record of a batch so identical option values
+    share one (immutable) EnumValue.
+
+    Args:
+        record: Original record
+        option_lookup: {field_key: {id: label}} for enum/set fields
+        cache: Optional {(field_key, id): EnumValue} reused across records
+
+    Returns:
+        Read-only view of the record with EnumValue wrappers for enum/set fields
+    """
+    overlay: dict[str, EnumValue] = {}
+    for field_key, opts in option_lookup.items():
+        raw_value = record.get(field_key)
+        if raw_value is None or raw_value == "":
+            continue
+
+        str_val = str(raw_value)
+        wrapped = cache.get((field_key, str_val)) if cache is not None else None
+        if wrapped is None:
+            wrapped = EnumValue(str_val, opts.get(str_val))
+            if cache is not None:
+                cache[(field_key, str_val)] = wrapped
+        overlay[field_key] = wrapped
+
+    return ChainMap(overlay, record) if overlay else record
+
+
 # -----------------------------------------------------------------------------
 # Type checking functions
 # -----------------------------------------------------------------------------
 
+# Plain ASCII numbers are accepted without calling int()/float(). Strings with
+# no digit at all can only be floats when spelled inf/infinity/nan, so anything
+# else is rejected up front: only the remaining oddities (underscores, non-ASCII
+# digits, malformed numbers) fall through to the exception-based parse.
+_PLAIN_INT_PATTERN = re.compile(r"[+-]?[0-9]+")
+_PLAIN_FLOAT_PATTERN = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+_DIGIT_PATTERN = re.compile(r"\d")
+_FLOAT_SPECIAL_PATTERN = re.compile(r"[+-]?(?:inf|infinity|nan)", re.IGNORECASE)
+
 
 def _isint(s: Any) -> bool:
     """Check if value is or can be parsed as an integer."""
@@ -94,8 +190,13 @@ def _isint(s: Any) -> bool:
         return True
     if isinstance(s, float):
         return s == int(s)
+    text = str(s).strip()
+    if _PLAIN_INT_PATTERN.fullmatch(text):
+        return True
+    if not _DIGIT_PATTERN.search(text):
+        return False
     try:
-        int(str(s).strip())
+        int(text)
         return True
     except (ValueError, TypeError):
         return False
@@ -109,16 +210,21 @@ def _isfloat(s: Any) -> bool:
         return False
     if isinstance(s, (int, float)):
         return True
+    text = str(s).strip()
+    if _PLAIN_FLOAT_PATTERN.fullmatch(text):
+        return True
+    if not _DIGIT_PATTERN.search(text) and not _FLOAT_SPECIAL_PATTERN.fullmatch(text):
+        return False
     try:
-        float(str(s).strip())
+        float(text)
         return True
     except (ValueError, TypeError):
         return False
 
 
-def _isnumeric(s: Any) -> bool:
-    """Check if value is numeric (int or float)."""
-    return _isfloat(s)
+# Numeric (int or float) is exactly what _isfloat accepts: alias it rather
+# than paying an extra call per evaluation
+_isnumeric = _isfloat
 
 
 # -----------------------------------------------------------------------------
@@ -159,22 +265,79 @@ FILTER_FUNCTIONS: dict[str, callable] = {
     **BASE_FUNCTIONS,
 }
 
+# String functions for transform expressions. They return None and "" unchanged,
+# use str inputs directly and stringify anything else (including 0 and False).
+
+
+def _transform_lower(s: Any) -> Any:
+    if isinstance(s, str):
+        return s.lower()
+    return s if s is None else str(s).lower()
+
+
+def _transform_upper(s: Any) -> Any:
+    if isinstance(s, str):
+        return s.upper()
+    return s if s is None else str(s).upper()
+
+
+def _transform_strip(s: Any) -> Any:
+    if isinstance(s, str):
+        return s.strip()
+    return s if s is None else str(s).strip()
+
+
+def _transform_lstrip(s: Any) -> Any:
+    if isinstance(s, str):
+        return s.lstrip()
+    return s if s is None else str(s).lstrip()
+
+
+def _transform_rstrip(s: Any) -> Any:
+    if isinstance(s, str):
+        return s.rstrip()
+    return s if s is None else str(s).rstrip()
+
+
+def _transform_replace(s: Any, old: str, new: str) -> Any:
+    if s is None or s == "":
+        return s
+    return (s if isinstance(s, str) else str(s)).replace(old, new)
+
+
+def _transform_substr(s: Any, start: Any, end: Any = None) -> Any:
+    if s is None or s == "":
+        return s
+    text = s if isinstance(s, str) else str(s)
+    return text[int(start) : int(end) if end is not None else None]
+
+
+def _transform_lpad(s: Any, width: Any, char: str = " ") -> Any:
+    if s is None or s == "":
+        return s
+    return (s if isinstance(s, str) else str(s)).rjust(int(width), char)
+
+
+def _transform_rpad(s: Any, width: Any, char: str = " ") -> Any:
+    if s is None or s == "":
+        return s
+    return (s if isinstance(s, str) else str(s)).ljust(int(width), char)
+
+
 # Functions for transform expressions (value update)
 # String functions return original value (None) when input is None, unlike filter functions
 TRANSFORM_FUNCTIONS: dict[str, callable] = {
     **BASE_FUNCTIONS,
     # String manipulation - preserve None (override BASE_FUNCTIONS behavior)
-    "lower": lambda s: str(s).lower() if s else s,
-    "upper": lambda s: str(s).upper() if s else s,
-    "strip": lambda s: str(s).strip() if s else s,
-    "lstrip": lambda s: str(s).lstrip() if s else s,
-    "rstrip": lambda s: str(s).rstrip() if s else s,
-    "replace": lambda s, old, new: str(s).replace(old, new) if s else s,
-    "substr": lambda s, start, end=None: (
-        str(s)[int(start) : int(end) if end is not None else None] if s else s
-    ),
-    "lpad": lambda s, width, char=" ": str(s).rjust(int(width), char) if s else s,
-    "rpad": lambda s, width, char=" ": str(s).ljust(int(width), char) if s else s,
+    "lower": _transform_lower,
+    "upper": _transform_upper,
+    "strip": _transform_strip,
+    "lstrip": _transform_lstrip,
+    "rstrip": _transform_rstrip,
+    "replace": _transform_replace,
+    "substr": _transform_substr,
+    "lpad": _transform_lpad,
+    "rpad": _transform_rpad,
     # Type conversion
     "int": lambda s: int(float(s)) if s else 0,
     "float": lambda s: float(s) if s else 0.0,
@@ -193,9 +356,9 @@ EXPRESSION_CONSTANTS: dict[str, Any] = {
 }
 
 # Keywords to exclude from field resolution
-EXPRESSION_KEYWORDS: set[str] = {
+EXPRESSION_KEYWORDS: frozenset[str] = frozenset({
     "and", "or", "not", "True", "False", "None", "in", "null",
-}
+})
 
 
 # -----------------------------------------------------------------------------
@@ -208,6 +371,7 @@ def resolve_field_identifier(
     identifier: str,
     *,
     on_ambiguous: AmbiguousCallback | None = None,
+    index: FieldIndex | None = None,
 ) -> str:
     """Resolve a field identifier to its exact key.
 
@@ -228,6 +392,7 @@ def resolve_field_identifier(
         on_ambiguous: Callback called when multiple matches found.
                       Receives (identifier, matches), returns selected key.
                       If None, raises AmbiguousMatchError.
+        index: Prebuilt build_field_index(fields), when resolving many identifiers
 
     Returns:
         The resolved field key
@@ -235,7 +400,7 @@ def resolve_field_identifier(
     Raises:
         AmbiguousMatchError: If identifier matches multiple fields and no callback
     """
-    matches = find_field_matches(fields, identifier)
+    matches = find_field_matches(fields, identifier, index)
 
     if not matches:
         # No match: return as-is (simpleeval will handle unknown variables)
@@ -257,13 +422,36 @@ def resolve_field_identifier(
     return matches[0]["key"]
 
 
-def _find_string_positions(expression: str) -> set[int]:
-    """Find all character positions inside string literals."""
-    positions: set[int] = set()
-    for match in re.finditer(r"'[^']*'|\"[^\"]*\"", expression):
-        for i in range(match.start(), match.end()):
-            positions.add(i)
-    return positions
+def _has_identifier_chars(expression: str) -> bool:
+    """Check whether an expression can contain a field identifier.
+
+    Identifiers and hex-like key prefixes need at least one letter or '_'.
+    """
+    return any(c.isalpha() or c == "_" for c in expression)
+
+
+def _string_literal_checker(expression: str) -> Callable[[int], bool]:
+    """Build a test for whether an offset lies inside a string literal.
+
+    Literal spans are kept as sorted (start, end) pairs and searched with bisect.
+
+    Args:
+        expression: The expression to scan
+
+    Returns:
+        Function taking a character offset and returning True if it is in a literal
+    """
+    if "'" not in expression and '"' not in expression:
+        return lambda offset: False
+
+    spans = [(m.start(), m.end()) for m in STRING_LITERAL_PATTERN.finditer(expression)]
+    starts = [start for start, _ in spans]
+
+    def in_literal(offset: int) -> bool:
+        i = bisect_right(starts, offset) - 1
+        return i >= 0 and offset < spans[i][1]
+
+    return in_literal
 
 
 def _escape_digit_key(key: str) -> str:
@@ -280,12 +468,18 @@ def _escape_digit_key(key: str) -> str:
     return key
 
 
+def _field_display_name(index: FieldIndex, key: str) -> str:
+    """Name of the field with the given key, or the key itself if unnamed."""
+    return (index.get(key) or {}).get("name", key)
+
+
 def resolve_expression(
     fields: list[dict[str, Any]],
     expression: str,
     functions: dict[str, callable],
     *,
     on_ambiguous: AmbiguousCallback | None = None,
+    index: FieldIndex | None = None,
 ) -> tuple[str, dict[str, tuple[str, str]]]:
     """Resolve all field identifiers in an expression.
 
@@ -303,6 +497,7 @@ def resolve_expression(
         on_ambiguous: Callback called when multiple matches found.
                       Receives (identifier, matches), returns selected key.
                       If None, raises AmbiguousMatchError.
+        index: Prebuilt build_field_index(fields) (built here if omitted)
 
     Returns:
         Tuple of (resolved_expression, resolutions_dict)
@@ -315,8 +510,9 @@ def resolve_expression(
     if not expression:
         return expression, {}
 
-    # Build field lookup by key
-    field_by_key: dict[str, dict] = {f.get("key", ""): f for f in fields}
+    # Index fields once (lowercased keys/names) for all identifiers in the expression
+    if index is None:
+        index = build_field_index(fields)
 
     # Track resolutions for display (identifier -> (key, name))
     resolutions: dict[str, tuple[str, str]] = {}
@@ -325,7 +521,7 @@ def resolve_expression(
     def _resolve_field_call(match: re.Match) -> str:
         quote_char = match.group(1)  # Preserve original quote style
         field_name = match.group(2)
-        matching = [f for f in fields if f.get("name", "").lower() == field_name.lower()]
+        matching = [fields[i] for i in index.name_equals(field_name.lower())]
         if not matching:
             raise FilterError(f"Field not found: '{field_name}'")
         if len(matching) > 1:
@@ -341,84 +537,85 @@ def resolve_expression(
         )
         return escaped_key
 
-    expression = FIELD_FUNC_PATTERN.sub(_resolve_field_call, expression)
+    if "field(" in expression:
+        expression = FIELD_FUNC_PATTERN.sub(_resolve_field_call, expression)
+
+    # Nothing to resolve in purely numeric/operator expressions
+    if not _has_identifier_chars(expression):
+        return expression, resolutions
 
-    # Build set of known names to exclude from resolution
-    known_names = set(functions.keys()) | EXPRESSION_KEYWORDS
+    # Fast path: every token is already an exact field key, function or keyword
+    if all(
+        token in index.by_key or token in functions or token in EXPRESSION_KEYWORDS
+        for token in (match.group(0) for match in TOKEN_PATTERN.finditer(expression))
+    ):
+        return expression, resolutions
 
     # Find string literal positions to exclude
-    string_positions = _find_string_positions(expression)
+    in_literal = _string_literal_checker(expression)
 
-    # Track replacements to make (identifier -> escaped_resolved_key)
+    # Track replacements to make (identifier -> escaped_resolved_key), and
+    # every identifier already looked up so repeats are resolved only once
     replacements: dict[str, str] = {}
+    checked: set[str] = set()
 
     # First pass: detect hex-like patterns starting with digits (e.g., '25da')
     # These are potential field key prefixes that aren't valid Python identifiers
-    # Pattern requires at least one hex letter (a-f) to avoid matching pure numbers like '25'
-    hex_pattern = r'(?<![a-zA-Z0-9_])([0-9][a-fA-F0-9]*[a-fA-F][a-fA-F0-9]*)(?![a-zA-Z0-9_])'
-    for match in re.finditer(hex_pattern, expression):
-        if match.start() in string_positions:
+    for match in HEX_KEY_PATTERN.finditer(expression):
+        if in_literal(match.start()):
             continue
 
         identifier = match.group(1)
-        if identifier in replacements:
+        if identifier in checked:
             continue
+        checked.add(identifier)
 
         # Try to resolve as field key prefix
-        resolved = resolve_field_identifier(fields, identifier, on_ambiguous=on_ambiguous)
+        resolved = resolve_field_identifier(
+            fields, identifier, on_ambiguous=on_ambiguous, index=index
+        )
         if resolved != identifier:
             # Escape the resolved key since it starts with a digit
             escaped = _escape_digit_key(resolved)
             replacements[identifier] = escaped
-            field_def = field_by_key.get(resolved, {})
-            field_name = field_def.get("name", resolved)
-            resolutions[identifier] = (resolved, field_name)
+            resolutions[identifier] = (resolved, _field_display_name(index, resolved))
 
     # Second pass: standard Python identifiers
-    identifier_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
-    for match in re.finditer(identifier_pattern, expression):
+    for match in IDENTIFIER_PATTERN.finditer(expression):
         # Skip if inside a string literal
-        if match.start() in string_positions:
+        if in_literal(match.start()):
             continue
 
         identifier = match.group(1)
 
         # Skip known functions, keywords, and already-resolved identifiers
-        if identifier in known_names:
+        if identifier in functions or identifier in EXPRESSION_KEYWORDS:
             continue
-        if identifier in replacements:
+        if identifier in checked:
             continue
+        checked.add(identifier)
 
         # Resolve the identifier
-        resolved = resolve_field_identifier(fields, identifier, on_ambiguous=on_ambiguous)
+        resolved = resolve_field_identifier(
+            fields, identifier, on_ambiguous=on_ambiguous, index=index
+        )
         if resolved != identifier:
             # Escape the resolved key if it starts with a digit
             escaped = _escape_digit_key(resolved)
             replacements[identifier] = escaped
-            # Get the field name for display
-            field_def = field_by_key.get(resolved, {})
-            field_name = field_def.get("name", resolved)
-            resolutions[identifier] = (resolved, field_name)
-
-    # Apply replacements (longest first to avoid partial replacements)
-    result = expression
-    for old, new in sorted(replacements.items(), key=lambda x: -len(x[0])):
-        # Use word boundary replacement for standard identifiers
-        # For digit-starting patterns, use negative lookbehind/lookahead
-        if old[0].isdigit():
-            pattern = rf'(?<![a-zA-Z0-9_]){re.escape(old)}(?![a-zA-Z0-9_])'
-        else:
-            pattern = rf'\b{re.escape(old)}\b'
-
-        new_result = []
-        last_end = 0
-        for match in re.finditer(pattern, result):
-            if match.start() not in string_positions:
-                new_result.append(result[last_end:match.start()])
-                new_result.append(new)
-                last_end = match.end()
-        new_result.append(result[last_end:])
-        result = "".join(new_result) if new_result else result
+            resolutions[identifier] = (resolved, _field_display_name(index, resolved))
+
+    if not replacements:
+        return expression, resolutions
+
+    # Apply all replacements in one left-to-right pass over the tokens
+    def _replace_token(match: re.Match) -> str:
+        token = match.group(0)
+        if in_literal(match.start()):
+            return token
+        return replacements.get(token, token)
+
+    result = TOKEN_PATTERN.sub(_replace_token, expression)
 
     return result, resolutions
 
@@ -445,12 +642,12 @@ def format_resolved_expression(
     if not resolutions:
         return resolved_expr, ""
 
-    # Build expression with names
-    name_expr = original_expr
-    for identifier, (key, name) in sorted(resolutions.items(), key=lambda x: -len(x[0])):
-        # Quote names with spaces
-        display_name = f'"{name}"' if " " in name else name
-        name_expr = re.sub(rf'\b{re.escape(identifier)}\b', display_name, name_expr)
+    # Build expression with names (quoted when they contain spaces)
+    display_names = {
+        identifier: f'"{name}"' if " " in name else name
+        for identifier, (_, name) in resolutions.items()
+    }
+    name_expr = _replace_tokens(original_expr, display_names)
 
     return name_expr, resolved_expr
 
@@ -480,6 +677,34 @@ def _add_digit_key_aliases(names: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
+def _referenced_record_names(
+    record: Mapping[str, Any],
+    referenced: frozenset[str],
+) -> dict[str, Any]:
+    """Build evaluator names for the identifiers an expression references.
+
+    Same values as create_evaluator() would expose for those identifiers:
+    constants first, then '_' aliases of digit-starting keys, then record keys.
+    Unreferenced record fields are left out.
+
+    Args:
+        record: The record whose fields become available as variables
+        referenced: Names used in the parsed expression
+
+    Returns:
+        Names dict for the evaluator
+    """
+    names: dict[str, Any] = {}
+    for name in referenced:
+        if name in EXPRESSION_CONSTANTS:
+            names[name] = EXPRESSION_CONSTANTS[name]
+        elif name[:1] == "_" and name[1:2].isdigit() and name[1:] in record:
+            names[name] = record[name[1:]]
+        elif name in record:
+            names[name] = record[name]
+    return names
+
+
 def create_evaluator(
     record: dict[str, Any],
     functions: dict[str, callable],
@@ -557,6 +782,315 @@ def validate_expression(
                 raise FilterError("Multiple expressions not allowed (remove ';')")
 
 
+@lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.AST:
+    """Parse an expression once for every evaluator that runs it.
+
+    simpleeval never mutates parsed trees, so they can be shared.
+
+    Args:
+        expression: The expression to parse (already resolved)
+
+    Returns:
+        Statement node to pass as previously_parsed to the evaluator
+    """
+    return EvalWithCompoundTypes.parse(expression)
+
+
+def referenced_option_lookup(
+    option_lookup: dict[str, dict[str, str]],
+    expressions: list[str],
+) -> dict[str, dict[str, str]]:
+    """Keep the enum/set option lookups for fields the expressions reference.
+
+    Records then only need wrapping (and copying) for fields the expressions
+    can actually see. A digit-starting key is referenced via its '_' alias.
+
+    Args:
+        option_lookup: {field_key: {id: label}} for enum/set fields
+        expressions: Expressions that will be evaluated (already resolved)
+
+    Returns:
+        Subset of option_lookup; all of it if an expression cannot be parsed,
+        so the evaluation error still surfaces per record as before
+    """
+    if not option_lookup:
+        return option_lookup
+    names: set[str] = set()
+    for expression in expressions:
+        try:
+            parsed = _parse_expression(expression)
+        except Exception:
+            return option_lookup
+        names.update(node.id for node in ast.walk(parsed) if isinstance(node, ast.Name))
+    return {
+        key: opts
+        for key, opts in option_lookup.items()
+        if key in names or f"_{key}" in names
+    }
+
+
+# Marks a record-independent result that has not been computed yet
+_NOT_EVALUATED = object()
+
+# Immutable result types a record-independent expression can hand out to
+# every record (a list or dict result would be shared between records)
+_SHAREABLE_RESULT_TYPES = (str, int, float, bool, type(None))
+
+
+def compile_expression(
+    expression: str,
+    functions: dict[str, callable],
+) -> Callable[[dict[str, Any]], Any]:
+    """Prepare an expression for evaluation against many records.
+
+    One evaluator is reused and the expression is parsed once (on first
+    evaluation, so syntax errors still surface per record); only the record
+    names change between calls. Only the names the expression references are
+    copied from each record. Expressions limited to comparisons, boolean
+    logic, arithmetic and function calls run as Python bytecode instead. An
+    expression reading no field (e.g. upper('fr')) is evaluated once when its
+    result is immutable.
+
+    Args:
+        expression: The expression to evaluate (already resolved)
+        functions: Function dictionary to use
+
+    Returns:
+        Function taking a record and returning the evaluated result
+    """
+    evaluator = EvalWithCompoundTypes()
+    evaluator.functions = {**evaluator.functions, **functions}
+    parsed = None
+    referenced: frozenset[str] = frozenset()
+    direct: Callable[[dict[str, Any]], Any] | None = None
+    record_independent = False
+    constant_result: Any = _NOT_EVALUATED
+
+    def evaluate(record: dict[str, Any]) -> Any:
+        nonlocal parsed, referenced, direct, record_independent, constant_result
+        if constant_result is not _NOT_EVALUATED:
+            return constant_result
+        if parsed is None:
+            parsed = _parse_expression(expression)
+            referenced = frozenset(
+                node.id for node in ast.walk(parsed) if isinstance(node, ast.Name)
+            )
+            direct = _direct_evaluator(
+                parsed, expression, evaluator.functions
+            ) or _bytecode_evaluator(parsed, expression, evaluator)
+            record_independent = _is_record_independent(parsed, functions)
+        if direct is not None:
+            result = direct(record)
+        else:
+            evaluator.names = _referenced_record_names(record, referenced)
+            result = evaluator.eval(expression, previously_parsed=parsed)
+        if record_independent and type(result) in _SHAREABLE_RESULT_TYPES:
+            # Same value for every record (e.g. upper('fr')): evaluate only once
+            constant_result = result
+        return result
+
+    return evaluate
+
+
+# Nodes _bytecode_evaluator() may compile, besides operators the evaluator defines
+_BYTECODE_NODES = (
+    ast.Name, ast.Load, ast.Constant, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp,
+    ast.BinOp, ast.Compare, ast.IfExp, ast.Call,
+)
+_BYTECODE_OPERATOR_PREFIX = "__operator_"
+
+
+class _OperatorCalls(ast.NodeTransformer):
+    """Rewrite binary operations as calls to the evaluator's operator functions.
+
+    Keeps simpleeval's guarded operators (e.g. safe_add's length limit).
+    """
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.Call:
+        self.generic_visit(node)
+        func = ast.Name(f"{_BYTECODE_OPERATOR_PREFIX}{type(node.op).__name__}", ast.Load())
+        return ast.Call(func, [node.left, node.right], [])
+
+
+def _bytecode_evaluator(
+    parsed: ast.AST,
+    expression: str,
+    evaluator: EvalWithCompoundTypes,
+) -> Callable[[Mapping[str, Any]], Any] | None:
+    """Compile a simple expression to Python bytecode instead of walking it.
+
+    Only names, literals, boolean/comparison/unary/binary operators the
+    evaluator defines, conditional expressions and positional calls to its
+    functions are accepted; there are no attributes, subscripts or builtins.
+    Results and NameNotDefined errors are the same as with the evaluator.
+
+    Args:
+        parsed: Statement returned by the evaluator's parse()
+        expression: The expression text, for error messages
+        evaluator: Evaluator whose functions and operators the code may use
+
+    Returns:
+        Function taking a record and returning the result, or None when the
+        expression needs the evaluator
+    """
+    if not isinstance(parsed, ast.Expr):
+        return None
+    called: set[str] = set()
+    values: set[str] = set()
+    call_targets = {
+        id(node.func) for node in ast.walk(parsed.value) if isinstance(node, ast.Call)
+    }
+    for node in ast.walk(parsed.value):
+        if id(node) in call_targets:
+            continue
+        if isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.keywords
+                or any(isinstance(arg, ast.Starred) for arg in node.args)
+                or node.func.id not in evaluator.functions
+                or evaluator.functions[node.func.id] in DISALLOW_FUNCTIONS
+            ):
+                return None
+            called.add(node.func.id)
+        elif isinstance(node, ast.Name):
+            values.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if hasattr(node.value, "__len__") and len(node.value) > MAX_STRING_LENGTH:
+                return None
+        elif type(node) in evaluator.operators:
+            continue
+        elif not isinstance(node, _BYTECODE_NODES):
+            return None
+    # Call targets must resolve to functions, never to same-named record fields
+    if any(name in called or name.startswith("__") for name in values):
+        return None
+
+    # The parsed tree is shared through _parse_expression's cache: rewrite a copy
+    tree = ast.Expression(_OperatorCalls().visit(copy.deepcopy(parsed.value)))
+    code = compile(ast.fix_missing_locations(tree), "<expression>", "eval")
+    code_globals = {
+        "__builtins__": {},
+        **evaluator.functions,
+        **{
+            f"{_BYTECODE_OPERATOR_PREFIX}{op.__name__}": func
+            for op, func in evaluator.operators.items()
+        },
+    }
+    value_names = frozenset(values)
+
+    def run(record: Mapping[str, Any]) -> Any:
+        try:
+            return eval(code, code_globals, _referenced_record_names(record, value_names))
+        except NameError as e:
+            raise NameNotDefined(e.name, expression) from None
+
+    return run
+
+
+def _is_record_independent(parsed: ast.AST, functions: dict[str, callable]) -> bool:
+    """Check whether an expression reads no record field.
+
+    Every name must be a built-in constant (null) or a call to one of the
+    given functions, which are pure (unlike simpleeval's default rand()), so
+    the result is the same for every record.
+
+    Args:
+        parsed: Statement returned by the evaluator's parse()
+        functions: Function dictionary the expression was compiled with
+
+    Returns:
+        True if the expression's value does not depend on the record
+    """
+    called = {
+        id(node.func)
+        for node in ast.walk(parsed)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in functions
+    }
+    return all(
+        node.id in EXPRESSION_CONSTANTS or id(node) in called
+        for node in ast.walk(parsed)
+        if isinstance(node, ast.Name)
+    )
+
+
+def _direct_evaluator(
+    parsed: ast.AST,
+    expression: str,
+    functions: dict[str, callable],
+) -> Callable[[dict[str, Any]], Any] | None:
+    """Evaluate trivial expressions without walking them through simpleeval.
+
+    Handles a bare literal (e.g. "0") and a bare name (e.g. copying another
+    field), with the same results and NameNotDefined errors as the evaluator.
+
+    Args:
+        parsed: Statement returned by the evaluator's parse()
+        expression: The expression text, for error messages
+        functions: The evaluator's functions (a bare function name yields it)
+
+    Returns:
+        Function taking a record and returning the result, or None when the
+        expression needs the evaluator
+    """
+    node = parsed.value if isinstance(parsed, ast.Expr) else None
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if hasattr(value, "__len__") and len(value) > MAX_STRING_LENGTH:
+            return None  # Let the evaluator raise IterableTooLong
+        return lambda record: value
+    if not isinstance(node, ast.Name):
+        return None
+
+    name = node.id
+    if name in EXPRESSION_CONSTANTS:
+        constant = EXPRESSION_CONSTANTS[name]
+        return lambda record: constant
+    alias_of = name[1:] if name[:1] == "_" and name[1:2].isdigit() else None
+
+    def lookup(record: dict[str, Any]) -> Any:
+        if alias_of is not None and alias_of in record:
+            return record[alias_of]
+        if name in record:
+            return record[name]
+        if name in functions:
+            return functions[name]
+        raise NameNotDefined(name, expression)
+
+    return lookup
+
+
+def compile_filter(
+    expression: str,
+    functions: dict[str, callable],
+) -> Callable[[dict[str, Any]], bool]:
+    """Prepare a filter expression for evaluation against many records.
+
+    Args:
+        expression: The filter expression (already resolved)
+        functions: Function dictionary to use
+
+    Returns:
+        Function taking a record and returning True if it matches the filter.
+        It raises FilterError if the expression cannot be evaluated.
+    """
+    if not expression:
+        return lambda record: True
+
+    evaluate = compile_expression(expression, functions)
+
+    def matches(record: dict[str, Any]) -> bool:
+        try:
+            return bool(evaluate(record))
+        except Exception as e:
+            raise FilterError(f"Filter evaluation error: {e}")
+
+    return matches
+
+
 def evaluate_expression(
     record: dict[str, Any],
     expression: str,
@@ -564,6 +1098,9 @@ def evaluate_expression(
 ) -> Any:
     """Evaluate an expression with record fields as variables.
 
+    The parsed expression is cached; use compile_expression() when evaluating
+    the same expression for many records.
+
     Args:
         record: The record whose fields become available as variables
         expression: The expression to evaluate (already resolved)
@@ -576,7 +1113,7 @@ def evaluate_expression(
         Exception: If evaluation fails
     """
     evaluator = create_evaluator(record, functions)
-    return evaluator.eval(expression)
+    return evaluator.eval(expression, previously_parsed=_parse_expression(expression))
 
 
 def filter_record(
@@ -586,6 +1123,8 @@ def filter_record(
 ) -> bool:
     """Evaluate a filter expression against a record.
 
+    Use compile_filter() when filtering many records with the same expression.
+
     Args:
         record: The record to evaluate
         expression: The filter expression (already resolved)
@@ -597,11 +1136,4 @@ def filter_record(
     Raises:
         FilterError: If the expression cannot be evaluated
     """
-    if not expression:
-        return True
-
-    try:
-        result = evaluate_expression(record, expression, functions)
-        return bool(result)
-    except Exception as e:
-        raise FilterError(f"Filter evaluation error: {e}")
+    return compile_filter(expression, functions)(record)
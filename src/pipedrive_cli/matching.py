@@ -5,6 +5,11 @@ Provides user-friendly prefix matching for CLI arguments:
 - Fields: prefix match with confirmation before execution
 """
 
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+
 import click
 
 from .config import ENTITIES, EntityConfig
@@ -32,9 +37,88 @@ class NoMatchError(Exception):
         super().__init__(f"No {item_type} matches prefix '{prefix}'. Available: {available_str}")
 
 
+@dataclass
+class FieldIndex:
+    """Lookup tables over a field list for repeated identifier matching.
+
+    Sorted (lowercase text, position) lists allow prefix searches with bisect;
+    matches are returned in the original field order.
+    """
+
+    fields: list[dict]
+    by_key: dict[str, int]
+    by_name_lower: dict[str, int]
+    keys_lower: list[tuple[str, int]]
+    names_lower: list[tuple[str, int]]
+    # identifier -> matching positions, filled by find_field_matches()
+    matches: dict[str, list[int]] = dataclass_field(default_factory=dict, repr=False)
+
+    def get(self, key: str) -> dict | None:
+        """First field with exactly this key, or None."""
+        position = self.by_key.get(key)
+        return None if position is None else self.fields[position]
+
+    def key_prefix(self, prefix_lower: str) -> list[int]:
+        """Positions of fields whose lowercase key starts with prefix_lower."""
+        return _prefix_positions(self.keys_lower, prefix_lower)
+
+    def name_prefix(self, prefix_lower: str) -> list[int]:
+        """Positions of fields whose lowercase name starts with prefix_lower."""
+        return _prefix_positions(self.names_lower, prefix_lower)
+
+    def name_equals(self, name_lower: str) -> list[int]:
+        """Positions of all fields whose lowercase name equals name_lower."""
+        start = bisect_left(self.names_lower, (name_lower,))
+        end = bisect_left(self.names_lower, (name_lower, len(self.fields)), start)
+        return [position for _, position in self.names_lower[start:end]]
+
+
+def _prefix_positions(entries: list[tuple[str, int]], prefix: str) -> list[int]:
+    """Collect positions of sorted entries whose text starts with prefix.
+
+    Both ends of the matching run are found with bisect: texts starting with
+    prefix sort before prefix with its last character incremented.
+    """
+    start = bisect_left(entries, (prefix,))
+    if prefix and prefix[-1] != chr(sys.maxunicode):
+        end = bisect_left(entries, (prefix[:-1] + chr(ord(prefix[-1]) + 1),), start)
+    else:
+        end = start
+        while end < len(entries) and entries[end][0].startswith(prefix):
+            end += 1
+    return [position for _, position in entries[start:end]]
+
+
+def build_field_index(fields: list[dict]) -> FieldIndex:
+    """Build lookup tables for matching many identifiers against the same fields.
+
+    Args:
+        fields: List of field definitions
+
+    Returns:
+        FieldIndex to pass to find_field_matches()
+    """
+    by_key: dict[str, int] = {}
+    by_name_lower: dict[str, int] = {}
+    keys_lower: list[tuple[str, int]] = []
+    names_lower: list[tuple[str, int]] = []
+    for position, f in enumerate(fields):
+        key = f.get("key", "")
+        name_lower = f.get("name", "").lower()
+        # First field wins, as with a linear scan
+        by_key.setdefault(key, position)
+        by_name_lower.setdefault(name_lower, position)
+        keys_lower.append((key.lower(), position))
+        names_lower.append((name_lower, position))
+    keys_lower.sort()
+    names_lower.sort()
+    return FieldIndex(fields, by_key, by_name_lower, keys_lower, names_lower)
+
+
 def find_field_matches(
     fields: list[dict],
     identifier: str,
+    index: FieldIndex | None = None,
 ) -> list[dict]:
     """Find fields matching an identifier.
 
@@ -52,58 +136,58 @@ def find_field_matches(
     Args:
         fields: List of field definitions
         identifier: The identifier to match (key prefix, name prefix, or _escaped)
+        index: Prebuilt build_field_index(fields), when matching many identifiers
 
     Returns:
-        List of matching field dicts (empty, one, or multiple)
+        List of matching field dicts (empty, one, or multiple), in field order
     """
     if not identifier:
         return []
 
+    if index is None:
+        index = build_field_index(fields)
+    positions = index.matches.get(identifier)
+    if positions is None:
+        positions = index.matches[identifier] = _match_positions(index, identifier)
+    return [index.fields[i] for i in positions]
+
+
+def _match_positions(index: FieldIndex, identifier: str) -> list[int]:
+    """Positions of the fields find_field_matches() returns, in field order."""
     identifier_lower = identifier.lower()
     # Normalize underscores to spaces for name matching (tel_s → tel s)
     identifier_normalized = identifier_lower.replace("_", " ")
 
     # 1. Exact key match
-    for f in fields:
-        if f.get("key", "") == identifier:
-            return [f]
+    if identifier in index.by_key:
+        return [index.by_key[identifier]]
 
     # 2. Key prefix match (case-insensitive)
-    key_matches = [
-        f for f in fields
-        if f.get("key", "").lower().startswith(identifier_lower)
-    ]
+    key_matches = index.key_prefix(identifier_lower)
     if key_matches:
-        return key_matches
+        return sorted(key_matches)
 
     # 3. Escaped digit-key prefix: _25 → matches keys starting with 25
     if identifier.startswith("_") and len(identifier) > 1 and identifier[1].isdigit():
-        unescaped = identifier[1:]
-        unescaped_lower = unescaped.lower()
-        digit_key_matches = [
-            f for f in fields
-            if f.get("key", "").lower().startswith(unescaped_lower)
-        ]
+        digit_key_matches = index.key_prefix(identifier_lower[1:])
         if digit_key_matches:
-            return digit_key_matches
+            return sorted(digit_key_matches)
 
     # 4. Exact name match (case-insensitive, with normalization)
-    for f in fields:
-        name = f.get("name", "").lower()
-        if name == identifier_lower or name == identifier_normalized:
-            return [f]
-
-    # 5. Name prefix match (case-insensitive, with normalization)
-    name_matches = [
-        f for f in fields
-        if f.get("name", "").lower().startswith(identifier_lower)
-        or f.get("name", "").lower().startswith(identifier_normalized)
+    exact = [
+        index.by_name_lower[name]
+        for name in (identifier_lower, identifier_normalized)
+        if name in index.by_name_lower
     ]
-    if name_matches:
-        return name_matches
+    if exact:
+        return [min(exact)]
 
-    # No match
-    return []
+    # 5. Name prefix match (case-insensitive, with normalization)
+    name_matches = set(index.name_prefix(identifier_lower))
+    if identifier_normalized != identifier_lower:
+        name_matches.update(index.name_prefix(identifier_normalized))
+    # Empty when nothing matches
+    return sorted(name_matches)
 
 
 def match_entity(prefix: str) -> EntityConfig:
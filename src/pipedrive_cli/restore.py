@@ -1,8 +1,14 @@
 """Restore functionality for Pipedrive backups."""
 
+import asyncio
 import csv
+import hashlib
 import json
+import sys
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 from typing import Any, TextIO
 
@@ -10,8 +16,27 @@ import click
 from frictionless import Package
 
 from .api import PipedriveClient
-from .base import load_package, load_records, rename_csv_column, rename_field_key, save_package
-from .config import ENTITIES, READONLY_ENTITIES, READONLY_FIELDS, RESTORE_ORDER, EntityConfig
+from .base import (
+    count_records,
+    iter_records,
+    load_package,
+    load_record_ids,
+    load_records,
+    rename_csv_column,
+    rename_field_key,
+    save_package,
+)
+from .config import (
+    API_BASE_URL,
+    ENTITIES,
+    READONLY_ENTITIES,
+    READONLY_FIELDS,
+    RESTORE_DEPENDENCIES,
+    RESTORE_ORDER,
+    STORE_CONCURRENCY,
+    EntityConfig,
+)
+from .serialize import dumps_line, loads
 
 
 @dataclass
@@ -74,6 +99,15 @@ def clean_record(record: dict[str, Any]) -> dict[str, Any]:
 # Reference field types that store objects but API expects integers
 REFERENCE_FIELD_TYPES = {"org", "people", "user"}
 
+# Shared default for field lookups that miss (read-only, never mutate)
+_EMPTY_FIELD: dict[str, Any] = {}
+
+# Sidecar file with payload hashes of stored records (see record_hash)
+STORE_HASHES_FILE = "store_hashes.json"
+
+# Minimum seconds between record progress updates during store
+PROGRESS_INTERVAL = 0.1
+
 # Mapping from field_type to entity name for ID remapping
 REFERENCE_FIELD_TO_ENTITY = {
     "org": "organizations",
@@ -96,25 +130,37 @@ def extract_reference_id(value: Any) -> Any:
     return value
 
 
+def get_reference_fields(field_defs: list[dict[str, Any]]) -> dict[str, str]:
+    """Map reference field keys to the entity their IDs point to.
+
+    An entity only has a handful of reference fields (org_id, person_id,
+    owner_id...), so per-record loops walk this map instead of every record key.
+    """
+    field_by_key = {f.get("key"): f for f in field_defs}
+    return {
+        sys.intern(key): REFERENCE_FIELD_TO_ENTITY[f["field_type"]]
+        for key, f in field_by_key.items()
+        if key and f.get("field_type") in REFERENCE_FIELD_TYPES
+    }
+
+
 def convert_record_for_api(
     record: dict[str, Any],
     field_defs: list[dict[str, Any]],
+    ref_fields: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Convert record values to API-expected format.
 
     Extracts integer IDs from reference objects (org_id, owner_id, person_id).
+    Pass ref_fields (from get_reference_fields) to avoid recomputing it per record.
     """
-    field_by_key = {f.get("key"): f for f in field_defs}
+    if ref_fields is None:
+        ref_fields = get_reference_fields(field_defs)
 
-    converted = {}
-    for key, value in record.items():
-        field_def = field_by_key.get(key, {})
-        field_type = field_def.get("field_type", "")
-
-        if field_type in REFERENCE_FIELD_TYPES:
-            converted[key] = extract_reference_id(value)
-        else:
-            converted[key] = value
+    converted = dict(record)
+    for key in ref_fields:
+        if key in converted:
+            converted[key] = extract_reference_id(converted[key])
 
     return converted
 
@@ -123,53 +169,94 @@ def remap_reference_fields(
     record: dict[str, Any],
     field_defs: list[dict[str, Any]],
     id_mappings: dict[str, dict[int, int]],
+    ref_fields: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Remap reference field values using accumulated ID mappings.
 
     For records with reference fields (org_id, person_id, etc.), replace
     local IDs with Pipedrive-assigned IDs from previous entity restores.
 
+    The returned dict is a shallow copy, but reference objects
+    ({"value": 431, "name": "..."}) are updated in place: callers must not
+    share them with data that has to keep the local IDs.
+
     Args:
         record: Record data with potential reference fields
         field_defs: Field definitions with field_type info
         id_mappings: Accumulated mappings {entity: {local_id: pipedrive_id}}
+        ref_fields: Precomputed get_reference_fields(field_defs) (optional)
 
     Returns:
         Record with remapped reference field values
     """
-    field_by_key = {f.get("key"): f for f in field_defs}
+    if ref_fields is None:
+        ref_fields = get_reference_fields(field_defs)
 
-    remapped = {}
-    for key, value in record.items():
-        field_def = field_by_key.get(key, {})
-        field_type = field_def.get("field_type", "")
+    remapped = dict(record)
+    for key, ref_entity in ref_fields.items():
+        value = remapped.get(key)
+        if value is None or ref_entity not in id_mappings:
+            continue
+        entity_mappings = id_mappings[ref_entity]
 
-        if field_type in REFERENCE_FIELD_TYPES and value is not None:
-            # Get the entity this reference points to
-            ref_entity = REFERENCE_FIELD_TO_ENTITY.get(field_type)
-            if ref_entity and ref_entity in id_mappings:
-                entity_mappings = id_mappings[ref_entity]
-
-                # Extract the ID (could be integer or object with "value" key)
-                if isinstance(value, dict) and "value" in value:
-                    old_id = value["value"]
-                    if old_id in entity_mappings:
-                        # Update the value inside the object
-                        remapped[key] = {**value, "value": entity_mappings[old_id]}
-                    else:
-                        remapped[key] = value
-                elif isinstance(value, int):
-                    remapped[key] = entity_mappings.get(value, value)
-                else:
-                    remapped[key] = value
-            else:
-                remapped[key] = value
-        else:
-            remapped[key] = value
+        # Extract the ID (could be integer or object with "value" key)
+        if isinstance(value, dict) and "value" in value:
+            old_id = value["value"]
+            if old_id in entity_mappings:
+                # Update the value inside the object
+                value["value"] = entity_mappings[old_id]
+        elif isinstance(value, int):
+            remapped[key] = entity_mappings.get(value, value)
 
     return remapped
 
 
+def prepare_record_for_api(
+    record: dict[str, Any],
+    ref_fields: dict[str, str],
+    id_mappings: dict[str, dict[int, int]],
+) -> dict[str, Any]:
+    """Build the API payload of a record in a single pass.
+
+    Equivalent to clean_record() followed by remap_reference_fields() and
+    convert_record_for_api(), but builds one dict instead of three and leaves
+    the reference objects of the input record untouched.
+
+    Args:
+        record: Record data as loaded from the backup
+        ref_fields: get_reference_fields() of the entity's field definitions
+        id_mappings: Accumulated mappings {entity: {local_id: pipedrive_id}}
+
+    Returns:
+        Record without read-only/None fields, with reference fields as
+        (remapped) integer IDs
+    """
+    prepared = clean_record(record)
+    for key, ref_entity in ref_fields.items():
+        value = prepared.get(key)
+        # Reference object {"value": 431, "name": "..."} or bare integer ID
+        if isinstance(value, dict) and "value" in value:
+            value = value["value"]
+        elif not isinstance(value, int):
+            continue
+        entity_mappings = id_mappings.get(ref_entity)
+        prepared[key] = entity_mappings.get(value, value) if entity_mappings else value
+
+    return prepared
+
+
+def _references_any(record: dict[str, Any], keys: list[str], ids: set[int]) -> bool:
+    """Check whether any of the given reference fields of a record points into ids."""
+    for key in keys:
+        value = record.get(key)
+        # Reference object {"value": 431, "name": "..."} or bare integer ID
+        if isinstance(value, dict):
+            value = value.get("value")
+        if isinstance(value, int) and value in ids:
+            return True
+    return False
+
+
 def normalize_value_for_comparison(value: Any, field_type: str) -> Any:
     """Normalize a field value for comparison.
 
@@ -223,6 +310,7 @@ def get_record_differences(
     local_record: dict[str, Any],
     remote_record: dict[str, Any],
     field_defs: list[dict[str, Any]],
+    field_by_key: dict[str, dict[str, Any]] | None = None,
 ) -> list[dict[str, Any]]:
     """Find all differences between local and remote records.
 
@@ -233,20 +321,26 @@ def get_record_differences(
         local_record: Cleaned local record data (ready for API)
         remote_record: Record data from Pipedrive
         field_defs: Field definitions with field_type info
+        field_by_key: Precomputed {key: field_def} of field_defs (optional)
 
     Returns:
         List of differences, each with field key, local and remote values
     """
-    field_by_key = {f.get("key"): f for f in field_defs}
+    if field_by_key is None:
+        field_by_key = {f.get("key"): f for f in field_defs}
     differences = []
 
     for key, local_value in local_record.items():
-        field_def = field_by_key.get(key, {})
+        remote_value = remote_record.get(key)
+
+        # Fast path: identical values need no normalization
+        if local_value == remote_value and type(local_value) is type(remote_value):
+            continue
+
+        field_def = field_by_key.get(key, _EMPTY_FIELD)
         field_type = field_def.get("field_type", "")
         field_name = field_def.get("name", key)
 
-        remote_value = remote_record.get(key)
-
         # Normalize both values
         local_normalized = normalize_value_for_comparison(local_value, field_type)
         remote_normalized = normalize_value_for_comparison(remote_value, field_type)
@@ -267,21 +361,40 @@ def records_equal(
     local_record: dict[str, Any],
     remote_record: dict[str, Any],
     field_defs: list[dict[str, Any]],
+    field_by_key: dict[str, dict[str, Any]] | None = None,
 ) -> bool:
     """Compare local and remote records for equality.
 
     Only compares fields that exist in the local record (after cleaning).
-    Normalizes reference fields for comparison.
+    Normalizes reference fields for comparison. Stops at the first difference.
 
     Args:
         local_record: Cleaned local record data (ready for API)
         remote_record: Record data from Pipedrive
         field_defs: Field definitions with field_type info
+        field_by_key: Precomputed {key: field_def} of field_defs (optional)
 
     Returns:
         True if records are equal, False otherwise
     """
-    return len(get_record_differences(local_record, remote_record, field_defs)) == 0
+    for key, local_value in local_record.items():
+        remote_value = remote_record.get(key)
+
+        # Fast path: identical values need no normalization
+        if local_value == remote_value and type(local_value) is type(remote_value):
+            continue
+
+        # Slow path: only build the field lookup once a value differs
+        if field_by_key is None:
+            field_by_key = {f.get("key"): f for f in field_defs}
+        field_type = field_by_key.get(key, _EMPTY_FIELD).get("field_type", "")
+
+        if normalize_value_for_comparison(
+            local_value, field_type
+        ) != normalize_value_for_comparison(remote_value, field_type):
+            return False
+
+    return True
 
 
 def load_id_mappings(backup_path: Path) -> dict[str, dict[int, int]]:
@@ -301,21 +414,19 @@ def load_id_mappings(backup_path: Path) -> dict[str, dict[int, int]]:
     if not mapping_file.exists():
         return mappings
 
-    with open(mapping_file, encoding="utf-8") as f:
+    # Read raw bytes: the JSON parser decodes UTF-8 itself
+    with open(mapping_file, "rb") as f:
+        # loads ignores the trailing newline; blank lines fail to parse
+        # and are skipped along with any other malformed line
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
             try:
-                entry = json.loads(line)
+                entry = loads(line)
                 entity = entry.get("entity")
                 local_id = entry.get("local_id")
                 pipedrive_id = entry.get("pipedrive_id")
 
                 if entity and local_id is not None and pipedrive_id is not None:
-                    if entity not in mappings:
-                        mappings[entity] = {}
-                    mappings[entity][local_id] = pipedrive_id
+                    mappings.setdefault(entity, {})[local_id] = pipedrive_id
             except json.JSONDecodeError:
                 continue
 
@@ -341,10 +452,112 @@ def save_id_mapping_entry(
         "local_id": local_id,
         "pipedrive_id": pipedrive_id,
     }
-    mapping_file.write(json.dumps(entry) + "\n")
+    mapping_file.write(dumps_line(entry))
+    mapping_file.flush()
+
+
+def save_id_mapping_entries(
+    mapping_file: TextIO,
+    entity: str,
+    mappings: list[tuple[int, int]],
+) -> None:
+    """Append several ID mapping entries with a single write and flush.
+
+    Args:
+        mapping_file: Open file handle for appending
+        entity: Entity name (e.g., "organizations")
+        mappings: (local_id, pipedrive_id) pairs, in creation order
+    """
+    if not mappings:
+        return
+    mapping_file.writelines(
+        dumps_line({"entity": entity, "local_id": local_id, "pipedrive_id": pipedrive_id})
+        for local_id, pipedrive_id in mappings
+    )
     mapping_file.flush()
 
 
+def record_hash(clean_data: dict[str, Any]) -> str:
+    """Hash a record's API payload, independent of key order.
+
+    Args:
+        clean_data: Record data as sent to Pipedrive
+
+    Returns:
+        16-character hex digest
+    """
+    payload = json.dumps(clean_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def account_fingerprint(api_token: str) -> str:
+    """Identify the Pipedrive account a store writes to, without keeping the token.
+
+    Args:
+        api_token: Pipedrive API token
+
+    Returns:
+        16-character hex digest of the API host and token
+    """
+    return hashlib.sha256(f"{API_BASE_URL}\n{api_token}".encode()).hexdigest()[:16]
+
+
+def _read_hashes_file(backup_path: Path) -> dict[str, Any]:
+    """Read store_hashes.json ({"accounts": {fingerprint: hashes}}), {} if unusable."""
+    hashes_file = backup_path / STORE_HASHES_FILE
+    if not hashes_file.exists():
+        return {}
+
+    try:
+        with open(hashes_file, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    if not isinstance(data, dict) or not isinstance(data.get("accounts"), dict):
+        return {}  # Unknown layout: start over rather than trust it
+    return data
+
+
+def load_record_hashes(backup_path: Path, account: str) -> dict[str, dict[int, str]]:
+    """Load payload hashes of records previously stored to an account.
+
+    Hashes are kept per account (see account_fingerprint), so storing the
+    same backup to another account or with another token never skips records
+    that were not stored there.
+
+    Args:
+        backup_path: Path to backup directory
+        account: Account fingerprint
+
+    Returns:
+        Hashes {entity: {pipedrive_id: hash}} (empty if missing or unreadable)
+    """
+    account_hashes = _read_hashes_file(backup_path).get("accounts", {}).get(account, {})
+    return {
+        entity: {int(record_id): h for record_id, h in entity_hashes.items()}
+        for entity, entity_hashes in account_hashes.items()
+    }
+
+
+def save_record_hashes(
+    backup_path: Path, account: str, hashes: dict[str, dict[int, str]]
+) -> None:
+    """Write payload hashes of records stored to an account to store_hashes.json.
+
+    Hashes of other accounts already in the file are kept.
+
+    Args:
+        backup_path: Path to backup directory
+        account: Account fingerprint
+        hashes: Hashes {entity: {pipedrive_id: hash}}
+    """
+    data = _read_hashes_file(backup_path) or {"accounts": {}}
+    data["accounts"][account] = hashes
+    with open(backup_path / STORE_HASHES_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
 def update_local_ids(
     backup_path: Path,
     id_mappings: dict[str, dict[int, int]],
@@ -356,65 +569,91 @@ def update_local_ids(
     1. Record IDs in each entity's CSV
     2. Reference field values in dependent entities' CSVs
 
+    Entities with no applicable mappings are not loaded at all.
+
     Args:
         backup_path: Path to backup directory
         id_mappings: Accumulated mappings {entity: {local_id: pipedrive_id}}
         field_defs_by_entity: Field definitions for each entity
     """
     for entity_name, field_defs in field_defs_by_entity.items():
-        csv_path = backup_path / f"{entity_name}.csv"
-        if not csv_path.exists():
+        if not (backup_path / f"{entity_name}.csv").exists():
             continue
 
-        # Load records with schema-based type coercion
-        records = load_records(backup_path, entity_name, coerce_types=True)
-        if not records:
-            continue
-
-        modified = False
-        entity_mappings = id_mappings.get(entity_name, {})
-        field_by_key = {f.get("key"): f for f in field_defs}
-
-        for record in records:
-            # Update record's own ID
-            record_id = record.get("id")
-            if record_id is not None and record_id in entity_mappings:
-                record["id"] = entity_mappings[record_id]
-                modified = True
+        # Only the mappings this entity can use (own IDs + referenced entities)
+        ref_fields = get_reference_fields(field_defs)
+        relevant = {entity_name, *ref_fields.values()}
+        entity_id_mappings = {
+            name: mappings for name, mappings in id_mappings.items()
+            if name in relevant and mappings
+        }
+        if entity_id_mappings:
+            _update_entity_ids(backup_path, entity_name, ref_fields, entity_id_mappings)
 
-            # Update reference fields
-            for key, value in list(record.items()):
-                if value is None:
-                    continue
 
-                field_def = field_by_key.get(key, {})
-                field_type = field_def.get("field_type", "")
+def _update_entity_ids(
+    backup_path: Path,
+    entity_name: str,
+    ref_fields: dict[str, str],
+    id_mappings: dict[str, dict[int, int]],
+) -> None:
+    """Rewrite one entity CSV with Pipedrive-assigned IDs (see update_local_ids)."""
+    # Load records with schema-based type coercion, keeping the raw rows so
+    # untouched cells are written back without re-encoding
+    raw_rows: list[dict[str, str]] = []
+    records = load_records(backup_path, entity_name, coerce_types=True, raw_rows=raw_rows)
+    if not records:
+        return
 
-                if field_type in REFERENCE_FIELD_TYPES:
-                    ref_entity = REFERENCE_FIELD_TO_ENTITY.get(field_type)
-                    if ref_entity and ref_entity in id_mappings:
-                        ref_mappings = id_mappings[ref_entity]
+    modified = False
+    entity_mappings = id_mappings.get(entity_name, {})
 
-                        if isinstance(value, dict) and "value" in value:
-                            old_id = value["value"]
-                            if old_id in ref_mappings:
-                                record[key] = {**value, "value": ref_mappings[old_id]}
-                                modified = True
-                        elif isinstance(value, int) and value in ref_mappings:
-                            record[key] = ref_mappings[value]
-                            modified = True
+    for record, raw_row in zip(records, raw_rows):
+        # Update record's own ID
+        record_id = record.get("id")
+        if record_id is not None and record_id in entity_mappings:
+            record["id"] = entity_mappings[record_id]
+            raw_row.pop("id", None)
+            modified = True
+
+        # Update reference fields (iterates ref_fields, not the record, so
+        # assigning record[key] below needs no snapshot of record.items())
+        for key, ref_entity in ref_fields.items():
+            value = record.get(key)
+            if value is None or ref_entity not in id_mappings:
+                continue
+            ref_mappings = id_mappings[ref_entity]
+
+            if isinstance(value, dict) and "value" in value:
+                old_id = value["value"]
+                if old_id in ref_mappings:
+                    # Records are freshly loaded and not shared: update in place
+                    value["value"] = ref_mappings[old_id]
+                    raw_row.pop(key, None)
+                    modified = True
+            elif isinstance(value, int) and value in ref_mappings:
+                record[key] = ref_mappings[value]
+                raw_row.pop(key, None)
+                modified = True
 
-        # Save updated records
-        if modified:
-            save_records_to_csv(csv_path, records)
+    # Save updated records
+    if modified:
+        save_records_to_csv(backup_path / f"{entity_name}.csv", records, raw_rows=raw_rows)
 
 
-def save_records_to_csv(csv_path: Path, records: list[dict[str, Any]]) -> None:
+def save_records_to_csv(
+    csv_path: Path,
+    records: list[dict[str, Any]],
+    raw_rows: list[dict[str, str]] | None = None,
+) -> None:
     """Save records to a CSV file.
 
     Args:
         csv_path: Path to CSV file
         records: List of record dictionaries
+        raw_rows: Original CSV rows parallel to records (see load_records). Cells
+            still present in a raw row are written verbatim instead of re-encoded,
+            so callers must drop the raw cell of every value they modify.
     """
     if not records:
         return
@@ -430,11 +669,15 @@ def save_records_to_csv(csv_path: Path, records: list[dict[str, Any]]) -> None:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-        for record in records:
+        for i, record in enumerate(records):
+            raw_row = raw_rows[i] if raw_rows is not None else {}
             # Convert complex values to JSON strings
             row = {}
             for key, value in record.items():
-                if value is None:
+                raw = raw_row.get(key)
+                if raw is not None:
+                    row[key] = raw
+                elif value is None:
                     row[key] = ""
                 elif isinstance(value, (dict, list)):
                     row[key] = json.dumps(value)
@@ -529,8 +772,15 @@ async def sync_fields(
         f["key"]: f for f in current_fields if is_custom_field(f)
     }
 
-    # Find missing fields (in backup but not in Pipedrive)
-    missing_keys = set(backup_custom.keys()) - set(current_custom.keys())
+    # Partition keys in one pass each: missing (backup only), common, extra (Pipedrive only)
+    missing_keys = [key for key in backup_custom if key not in current_custom]
+    common_keys: list[str] = []
+    extra_keys: list[str] = []
+    for key in current_custom:
+        if key in backup_custom:
+            common_keys.append(key)
+        else:
+            extra_keys.append(key)
 
     # Create missing fields
     for key in missing_keys:
@@ -542,13 +792,13 @@ async def sync_fields(
         if dry_run:
             stats.created += 1
             if log_file:
-                log_file.write(json.dumps({
+                log_file.write(dumps_line({
                     "entity": entity.name,
                     "action": "would_create_field",
                     "field_key": key,
                     "field_name": field_name,
                     "field_type": field_type,
-                }) + "\n")
+                }))
         else:
             try:
                 # Prepare options for enum/set fields
@@ -567,26 +817,25 @@ async def sync_fields(
                     stats.key_mappings[key] = real_key
 
                 if log_file:
-                    log_file.write(json.dumps({
+                    log_file.write(dumps_line({
                         "entity": entity.name,
                         "action": "created_field",
                         "field_key": key,
                         "field_name": field_name,
                         "field_type": field_type,
                         "real_key": real_key,
-                    }) + "\n")
+                    }))
             except Exception as e:
                 stats.skipped += 1
                 if log_file:
-                    log_file.write(json.dumps({
+                    log_file.write(dumps_line({
                         "entity": entity.name,
                         "action": "failed_create_field",
                         "field_key": key,
                         "error": str(e),
-                    }) + "\n")
+                    }))
 
     # Update fields that exist in both but have different names
-    common_keys = set(backup_custom.keys()) & set(current_custom.keys())
     for key in common_keys:
         backup_name = backup_custom[key].get("name", "")
         current_name = current_custom[key].get("name", "")
@@ -597,83 +846,81 @@ async def sync_fields(
             if dry_run:
                 stats.updated += 1
                 if log_file:
-                    log_file.write(json.dumps({
+                    log_file.write(dumps_line({
                         "entity": entity.name,
                         "action": "would_update_field",
                         "field_key": key,
                         "field_id": field_id,
                         "old_name": current_name,
                         "new_name": backup_name,
-                    }) + "\n")
+                    }))
             else:
                 try:
                     await client.update_field(entity, field_id, name=backup_name)
                     stats.updated += 1
                     if log_file:
-                        log_file.write(json.dumps({
+                        log_file.write(dumps_line({
                             "entity": entity.name,
                             "action": "updated_field",
                             "field_key": key,
                             "field_id": field_id,
                             "old_name": current_name,
                             "new_name": backup_name,
-                        }) + "\n")
+                        }))
                 except Exception as e:
                     stats.skipped += 1
                     if log_file:
-                        log_file.write(json.dumps({
+                        log_file.write(dumps_line({
                             "entity": entity.name,
                             "action": "failed_update_field",
                             "field_key": key,
                             "error": str(e),
-                        }) + "\n")
+                        }))
 
     # Handle extra fields (in Pipedrive but not in backup)
-    if delete_extra:
-        extra_keys = set(current_custom.keys()) - set(backup_custom.keys())
-        if extra_keys:
-            extra_fields = [current_custom[k] for k in extra_keys]
-
-            should_delete = True
-            if not dry_run:
-                should_delete = prompt_delete_fields(entity.name, extra_fields)
-                if should_delete is None:
-                    raise click.Abort()
-
-            if should_delete:
-                for key in extra_keys:
-                    field_def = current_custom[key]
-                    field_id = field_def.get("id")
-
-                    if dry_run:
+    if delete_extra and extra_keys:
+        extra_fields = [current_custom[k] for k in extra_keys]
+
+        should_delete = True
+        if not dry_run:
+            should_delete = prompt_delete_fields(entity.name, extra_fields)
+            if should_delete is None:
+                raise click.Abort()
+
+        if should_delete:
+            for key in extra_keys:
+                field_def = current_custom[key]
+                field_id = field_def.get("id")
+
+                if dry_run:
+                    stats.deleted += 1
+                    if log_file:
+                        log_file.write(dumps_line({
+                            "entity": entity.name,
+                            "action": "would_delete_field",
+                            "field_key": key,
+                            "field_id": field_id,
+                        }))
+                else:
+                    try:
+                        await client.delete_field(entity, field_id)
                         stats.deleted += 1
                         if log_file:
-                            log_file.write(json.dumps({
+                            log_file.write(dumps_line({
                                 "entity": entity.name,
-                                "action": "would_delete_field",
+                                "action": "deleted_field",
                                 "field_key": key,
                                 "field_id": field_id,
-                            }) + "\n")
-                    else:
-                        try:
-                            await client.delete_field(entity, field_id)
-                            stats.deleted += 1
-                            if log_file:
-                                log_file.write(json.dumps({
-                                    "entity": entity.name,
-                                    "action": "deleted_field",
-                                    "field_key": key,
-                                    "field_id": field_id,
-                                }) + "\n")
-                        except Exception as e:
-                            stats.skipped += 1
-                            if log_file:
-                                log_file.write(json.dumps({
-                                    "entity": entity.name,
-                                    "action": "failed_delete_field",
-                                    "field_key": key,
-                                    "error": str(e),
-                                }) + "\n")
+                            }))
+                    except Exception as e:
+                        stats.skipped += 1
+                        if log_file:
+                            log_file.write(dumps_line({
+                                "entity": entity.name,
+                                "action": "failed_delete_field",
+                                "field_key": key,
+                                "error": str(e),
+                            }))
 
     return stats
 
@@ -723,29 +970,29 @@ async def delete_extra_records(
         if dry_run:
             deleted_count += 1
             if log_file:
-                log_file.write(json.dumps({
+                log_file.write(dumps_line({
                     "entity": entity.name,
                     "action": "would_delete_record",
                     "record_id": record_id,
-                }) + "\n")
+                }))
         else:
             try:
                 await client.delete(entity, record_id)
                 deleted_count += 1
                 if log_file:
-                    log_file.write(json.dumps({
+                    log_file.write(dumps_line({
                         "entity": entity.name,
                         "action": "deleted_record",
                         "record_id": record_id,
-                    }) + "\n")
+                    }))
             except Exception as e:
                 if log_file:
-                    log_file.write(json.dumps({
+                    log_file.write(dumps_line({
                         "entity": entity.name,
                         "action": "failed_delete_record",
                         "record_id": record_id,
                         "error": str(e),
-                    }) + "\n")
+                    }))
 
     return deleted_count
 
@@ -765,19 +1012,16 @@ async def restore_entity(
 
     stats = RestoreStats()
 
-    for i, record in enumerate(records):
-        record_id = record.get("id")
-        if record_id is None:
-            stats.skipped += 1
-            continue
-
-        # Clean record for API
-        clean_data = clean_record(record)
-
-        if not clean_data:
-            stats.skipped += 1
-            continue
+    # Clean all records for API up front; skip those without ID or writable data
+    pending = [
+        (record_id, clean_data)
+        for record in records
+        if (record_id := record.get("id")) is not None
+        and (clean_data := clean_record(record))
+    ]
+    stats.skipped += len(records) - len(pending)
 
+    for i, (record_id, clean_data) in enumerate(pending):
         result: RestoreResult
 
         if dry_run:
@@ -831,18 +1075,193 @@ async def restore_entity(
                 )
                 stats.failed += 1
 
-        # Write to log file
+        # Write to log file (flushed once at the end)
         if log_file:
-            log_file.write(json.dumps(result.to_dict()) + "\n")
-            log_file.flush()
+            log_file.write(dumps_line(result.to_dict()))
 
         # Update progress
         if progress_callback:
-            progress_callback(i + 1, len(records))
+            progress_callback(i + 1, len(pending))
+
+    if log_file:
+        log_file.flush()
 
     return stats
 
 
+async def _store_record(
+    client: PipedriveClient,
+    entity: EntityConfig,
+    record_id: int,
+    clean_data: dict[str, Any],
+    stats: RestoreStats,
+    field_defs: list[dict[str, Any]],
+    field_by_key: dict[str, dict[str, Any]],
+    existing_ids: set[int] | None,
+    dry_run: bool,
+    skip_unchanged: bool,
+    record_hashes: dict[int, str] | None = None,
+) -> tuple[RestoreResult, list[dict[str, Any]] | None]:
+    """Create, update or skip one prepared record (see restore_backup).
+
+    Updates stats in place. Returns the result and, when skip_unchanged compared
+    the record with Pipedrive, the differences found.
+
+    record_hashes maps Pipedrive IDs to the payload hash last stored for them.
+    With skip_unchanged, a record whose payload hash is unchanged is skipped
+    without fetching it; successful stores update the map.
+    """
+    differences = None
+    payload_hash = record_hash(clean_data) if record_hashes is not None else None
+    hash_unchanged = (
+        payload_hash is not None and record_hashes.get(record_id) == payload_hash
+    )
+
+    if dry_run:
+        # Dry run - use pre-fetched IDs for fast lookup
+        exists = existing_ids is not None and record_id in existing_ids
+
+        if exists and skip_unchanged and hash_unchanged:
+            action = "would_skip"
+            stats.skipped += 1
+        elif exists and skip_unchanged:
+            # Check if record has changed
+            remote_record = await client.get_record(entity, record_id)
+            if remote_record:
+                differences = get_record_differences(
+                    clean_data, remote_record, field_defs, field_by_key
+                )
+            if not differences:
+                action = "would_skip"
+                stats.skipped += 1
+            else:
+                action = "would_update"
+                stats.updated += 1
+        elif exists:
+            action = "would_update"
+            stats.updated += 1
+        else:
+            action = "would_create"
+            stats.created += 1
+
+        result = RestoreResult(
+            entity=entity.name,
+            record_id=record_id,
+            action=action,
+            status="dry-run",
+        )
+        return result, differences
+
+    exists = False
+    try:
+        # Check if record exists (use pre-fetched IDs if available)
+        if existing_ids is not None:
+            exists = record_id in existing_ids
+        else:
+            exists = await client.exists(entity, record_id)
+
+        if exists:
+            # Check if record has changed when skip_unchanged is enabled
+            if skip_unchanged and not hash_unchanged:
+                remote_record = await client.get_record(entity, record_id)
+                if remote_record:
+                    differences = get_record_differences(
+                        clean_data, remote_record, field_defs, field_by_key
+                    )
+            if skip_unchanged and not differences:
+                # Skip unchanged record
+                if payload_hash is not None:
+                    record_hashes[record_id] = payload_hash
+                stats.skipped += 1
+                return RestoreResult(
+                    entity=entity.name,
+                    record_id=record_id,
+                    action="skipped",
+                    status="unchanged",
+                ), None
+
+            # Update existing (changed, or not compared) record
+            await client.update(entity, record_id, clean_data)
+            if payload_hash is not None:
+                record_hashes[record_id] = payload_hash
+            stats.updated += 1
+            return RestoreResult(
+                entity=entity.name,
+                record_id=record_id,
+                action="updated",
+                status="success",
+            ), differences
+
+        # Create new record
+        new_record = await client.create(entity, clean_data)
+        if payload_hash is not None and new_record.get("id") is not None:
+            record_hashes[new_record["id"]] = payload_hash
+        stats.created += 1
+        return RestoreResult(
+            entity=entity.name,
+            record_id=record_id,
+            action="created",
+            status="success",
+            new_id=new_record.get("id"),
+        ), None
+
+    except Exception as e:
+        stats.failed += 1
+        return RestoreResult(
+            entity=entity.name,
+            record_id=record_id,
+            action="update" if exists else "create",
+            status="failed",
+            error=str(e),
+        ), None
+
+
+def _extract_backup_fields(resource: Any) -> list[dict[str, Any]]:
+    """Get pipedrive_fields from a datapackage resource schema.
+
+    Frictionless keeps unknown schema properties in schema.custom, so an empty
+    custom dict means there are no pipedrive_fields; to_dict() (which
+    re-serializes the whole schema) is only needed for schemas without it.
+    """
+    custom = getattr(resource.schema, "custom", None)
+    if custom is not None:
+        return custom.get("pipedrive_fields", [])
+    if hasattr(resource.schema, "to_dict"):
+        return resource.schema.to_dict().get("pipedrive_fields", [])
+    return []
+
+
+def get_restore_layers(
+    entity_names: list[str],
+    dependencies: dict[str, set[str]],
+) -> list[list[str]]:
+    """Group entities into layers that can be restored concurrently.
+
+    Each entity goes in the layer after the last entity it depends on that
+    comes before it in entity_names. Dependencies listed later (or not
+    restored at all) are ignored, as in a sequential restore.
+
+    Args:
+        entity_names: Entities to restore, in dependency-respecting order
+        dependencies: {entity: entities whose ID mappings it needs}
+
+    Returns:
+        Layers of entity names, each keeping the order of entity_names
+    """
+    layer_of: dict[str, int] = {}
+    layers: list[list[str]] = []
+    for name in entity_names:
+        layer = max(
+            (layer_of[dep] + 1 for dep in dependencies.get(name, ()) if dep in layer_of),
+            default=0,
+        )
+        layer_of[name] = layer
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(name)
+    return layers
+
+
 @dataclass
 class RestoreReport:
     """Complete restore operation report."""
@@ -865,6 +1284,7 @@ async def restore_backup(
     resume: bool = False,
     skip_unchanged: bool = False,
     max_records: int | None = None,
+    concurrency: int = STORE_CONCURRENCY,
 ) -> RestoreReport:
     """Restore a backup to Pipedrive.
 
@@ -879,8 +1299,12 @@ async def restore_backup(
         log_file: File to write JSON log lines
         progress_callback: Callback for progress updates
         resume: Resume from previous partial sync using existing ID mappings
-        skip_unchanged: Skip records that haven't changed (compare with Pipedrive)
+        skip_unchanged: Skip records that haven't changed (compare with Pipedrive, or
+            with the payload hash recorded when the record was last stored to the
+            same account; such records are not fetched, so edits made in
+            Pipedrive since then are not detected)
         max_records: Maximum number of records per entity (None = all)
+        concurrency: Maximum number of records sent to Pipedrive at once
 
     Returns:
         RestoreReport with record and field statistics and ID mappings
@@ -898,9 +1322,19 @@ async def restore_backup(
     # Determine which entities to restore
     entity_names = entities or RESTORE_ORDER
     available_resources = set(resources_by_name.keys())
+    restorable = [
+        name for name in entity_names
+        if name in available_resources
+        and name in ENTITIES
+        # Skip files - require special handling
+        and name != "files"
+        # Skip readonly entities (can be backed up but not restored)
+        and name not in READONLY_ENTITIES
+    ]
 
     all_record_stats: dict[str, RestoreStats] = {}
     all_field_stats: dict[str, FieldSyncStats] = {}
+    field_defs_by_entity: dict[str, list[dict[str, Any]]] = {}
 
     # ID mappings: {entity: {local_id: pipedrive_id}}
     all_id_mappings: dict[str, dict[int, int]] = {}
@@ -912,6 +1346,19 @@ async def restore_backup(
             total_mapped = sum(len(m) for m in all_id_mappings.values())
             progress_callback(f"Loaded {total_mapped} existing ID mappings for resume")
 
+    # Payload hashes of records previously stored to this account, only used
+    # by skip_unchanged: {entity: {pipedrive_id: hash}}
+    account = account_fingerprint(api_token)
+    all_record_hashes = load_record_hashes(backup_path, account) if skip_unchanged else {}
+
+    # Get pipedrive_fields from datapackage schemas, once per entity. Selected
+    # entities that are not restored (e.g. files) are included so that
+    # update_local_ids can still remap their references.
+    for entity_name in entity_names:
+        if entity_name in resources_by_name:
+            resource = resources_by_name[entity_name]
+            field_defs_by_entity[entity_name] = _extract_backup_fields(resource)
+
     # Open mapping file for writing (append mode for resume)
     mapping_file_path = backup_path / "id_mapping.jsonl"
     mapping_file_mode = "a" if resume else "w"
@@ -921,36 +1368,24 @@ async def restore_backup(
         else None
     )
 
-    async with PipedriveClient(api_token) as client:
-        for entity_name in entity_names:
-            if entity_name not in available_resources:
-                continue
-
-            if entity_name not in ENTITIES:
-                continue
+    async def restore_entity_backup(client: PipedriveClient, entity_name: str) -> None:
+        """Sync fields and store records of one entity (results go to the shared dicts)."""
+        entity = ENTITIES[entity_name]
 
-            # Skip files - require special handling
-            if entity_name == "files":
-                continue
-
-            # Skip readonly entities (can be backed up but not restored)
-            if entity_name in READONLY_ENTITIES:
-                continue
+        if progress_callback:
+            progress_callback(f"Restoring {entity_name}...")
 
-            entity = ENTITIES[entity_name]
-            resource = resources_by_name[entity_name]
+        backup_fields = field_defs_by_entity[entity_name]
 
-            if progress_callback:
-                progress_callback(f"Restoring {entity_name}...")
+        csv_path = backup_path / f"{entity_name}.csv"
 
-            # Get pipedrive_fields from datapackage schema
-            backup_fields = []
-            if hasattr(resource.schema, "custom") and resource.schema.custom:
-                backup_fields = resource.schema.custom.get("pipedrive_fields", [])
-            elif hasattr(resource.schema, "to_dict"):
-                schema_dict = resource.schema.to_dict()
-                backup_fields = schema_dict.get("pipedrive_fields", [])
+        # Fetch existing IDs once (for dry-run checks and delete-extra-records),
+        # in the background so the download overlaps with field sync
+        ids_task: asyncio.Task[set[int]] | None = None
+        if csv_path.exists() and (dry_run or delete_extra_records):
+            ids_task = asyncio.create_task(client.fetch_all_ids(entity))
 
+        try:
             # Sync fields (create missing, optionally delete extra)
             if backup_fields:
                 if progress_callback:
@@ -969,7 +1404,7 @@ async def restore_backup(
                 if progress_callback and (
                     field_stats.created or field_stats.updated or field_stats.deleted
                 ):
-                    msg = f"  Fields: {field_stats.created} created"
+                    msg = f"  {entity_name}: Fields: {field_stats.created} created"
                     if field_stats.updated:
                         msg += f", {field_stats.updated} updated"
                     if field_stats.deleted:
@@ -984,249 +1419,233 @@ async def restore_backup(
                         rename_csv_column(backup_path, entity_name, old_key, new_key)
                     save_package(base_package, backup_path)
                     if progress_callback:
+                        count = len(field_stats.key_mappings)
                         progress_callback(
-                            f"  Updated {len(field_stats.key_mappings)} field key(s) in local data"
+                            f"  {entity_name}: Updated {count} field key(s) in local data"
                         )
+        except BaseException:
+            if ids_task:
+                ids_task.cancel()
+            raise
 
-            # Load records from CSV with schema-based type coercion
-            csv_path = backup_path / f"{entity_name}.csv"
-            if not csv_path.exists():
-                continue
-
-            records = load_records(backup_path, entity_name, coerce_types=True)
-            # Apply limit if specified
-            if max_records is not None:
-                records = records[:max_records]
-            total_records = len(records)
-
-            # Fetch existing IDs once (for dry-run checks and delete-extra-records)
-            existing_ids: set[int] | None = None
-            if dry_run or delete_extra_records:
-                if progress_callback:
-                    progress_callback(f"  Fetching existing {entity_name} IDs...")
-                existing_ids = await client.fetch_all_ids(entity)
-
-            # Delete extra records if requested
-            if delete_extra_records:
-                backup_ids = {r.get("id") for r in records if r.get("id") is not None}
-
-                if progress_callback:
-                    progress_callback(f"  Checking for extra records in {entity_name}...")
-
-                deleted = await delete_extra_records_func(
-                    client,
-                    entity,
-                    backup_ids,
-                    dry_run=dry_run,
-                    log_file=log_file,
-                    current_ids=existing_ids,
-                )
-
-                if deleted and progress_callback:
-                    action = "would delete" if dry_run else "deleted"
-                    progress_callback(f"  {deleted} extra records {action}")
+        if not csv_path.exists():
+            return
+
+        # Stream records from CSV (schema-based type coercion) so memory
+        # stays bounded by the concurrency window, not the file size
+        total_records = count_records(backup_path, entity_name)
+        records: Iterator[dict[str, Any]] = iter_records(
+            backup_path, entity_name, coerce_types=True
+        )
+        # Apply limit if specified
+        if max_records is not None:
+            total_records = min(total_records, max_records)
+            records = islice(records, max_records)
+
+        existing_ids: set[int] | None = None
+        if ids_task:
+            if progress_callback:
+                progress_callback(f"  Fetching existing {entity_name} IDs...")
+            existing_ids = await ids_task
 
-            # Restore records with progress
-            stats = RestoreStats()
+        # Delete extra records if requested
+        if delete_extra_records:
+            # Separate pass that only parses the id column
+            backup_ids = load_record_ids(backup_path, entity_name, max_records)
 
-            # Initialize entity mapping if not present
-            if entity_name not in all_id_mappings:
-                all_id_mappings[entity_name] = {}
+            if progress_callback:
+                progress_callback(f"  Checking for extra records in {entity_name}...")
+
+            deleted = await delete_extra_records_func(
+                client,
+                entity,
+                backup_ids,
+                dry_run=dry_run,
+                log_file=log_file,
+                current_ids=existing_ids,
+            )
 
-            for i, record in enumerate(records):
+            if deleted and progress_callback:
+                action = "would delete" if dry_run else "deleted"
+                progress_callback(f"  {entity_name}: {deleted} extra records {action}")
+
+        # Restore records with progress
+        stats = RestoreStats()
+        ref_fields = get_reference_fields(backup_fields)
+        backup_fields_by_key = {f.get("key"): f for f in backup_fields}
+
+        # Initialize entity mapping if not present
+        if entity_name not in all_id_mappings:
+            all_id_mappings[entity_name] = {}
+
+        # Reference fields pointing to this same entity (e.g. an org field on
+        # organizations): their targets may be created within the same window
+        self_ref_keys = [key for key, ref in ref_fields.items() if ref == entity_name]
+
+        processed = 0
+        last_progress = time.monotonic()
+        deferred: list[dict[str, Any]] = []
+        while True:
+            chunk = deferred + list(islice(records, concurrency - len(deferred)))
+            deferred = []
+            if not chunk:
+                break
+
+            # Prepare API payloads; the window is then sent concurrently
+            window: list[tuple[int, dict[str, Any]]] = []
+            window_ids: set[int] = set()
+            for position, record in enumerate(chunk):
                 record_id = record.get("id")
                 if record_id is None:
                     stats.skipped += 1
+                    processed += 1
                     continue
 
                 # Skip if already synced (for resume)
                 if resume and record_id in all_id_mappings[entity_name]:
                     stats.skipped += 1
+                    processed += 1
                     continue
 
-                # Clean record for API
-                clean_data = clean_record(record)
-
-                # Remap reference fields using accumulated ID mappings
-                clean_data = remap_reference_fields(clean_data, backup_fields, all_id_mappings)
+                # A record pointing to one sent in this window needs that
+                # record's Pipedrive ID: end the window here, as a serial
+                # store would have mapped it by now
+                if window_ids and _references_any(record, self_ref_keys, window_ids):
+                    deferred = chunk[position:]
+                    break
 
-                # Convert reference fields (org_id, owner_id, person_id) to integer IDs
-                clean_data = convert_record_for_api(clean_data, backup_fields)
+                # Clean record for API, remapping reference fields with the
+                # accumulated ID mappings and converting them to integer IDs
+                clean_data = prepare_record_for_api(record, ref_fields, all_id_mappings)
 
                 if not clean_data:
                     stats.skipped += 1
+                    processed += 1
                     continue
 
-                result: RestoreResult
+                window.append((record_id, clean_data))
+                window_ids.add(record_id)
 
-                if dry_run:
-                    # Dry run - use pre-fetched IDs for fast lookup
-                    exists = existing_ids is not None and record_id in existing_ids
-                    differences = None
-
-                    if exists and skip_unchanged:
-                        # Check if record has changed
-                        remote_record = await client.get_record(entity, record_id)
-                        if remote_record:
-                            differences = get_record_differences(
-                                clean_data, remote_record, backup_fields
-                            )
-                        if not differences:
-                            action = "would_skip"
-                            stats.skipped += 1
-                        else:
-                            action = "would_update"
-                            stats.updated += 1
-                    elif exists:
-                        action = "would_update"
-                        stats.updated += 1
-                    else:
-                        action = "would_create"
-                        stats.created += 1
+            outcomes = await asyncio.gather(*(
+                _store_record(
+                    client,
+                    entity,
+                    record_id,
+                    clean_data,
+                    stats,
+                    backup_fields,
+                    backup_fields_by_key,
+                    existing_ids=existing_ids,
+                    dry_run=dry_run,
+                    skip_unchanged=skip_unchanged,
+                    record_hashes=(
+                        all_record_hashes.setdefault(entity_name, {})
+                        if skip_unchanged
+                        else None
+                    ),
+                )
+                for record_id, clean_data in window
+            ))
+
+            # Commit ID mappings and log lines in submission order
+            created: list[tuple[int, int]] = []
+            log_lines: list[str] = []
+            for (record_id, _), (result, differences) in zip(window, outcomes):
+                # Track ID mapping for dependent entities
+                if result.action == "created" and result.new_id is not None:
+                    all_id_mappings[entity_name][record_id] = result.new_id
+                    created.append((record_id, result.new_id))
 
-                    result = RestoreResult(
-                        entity=entity_name,
-                        record_id=record_id,
-                        action=action,
-                        status="dry-run",
-                    )
-                    # Add differences to log if available
-                    if log_file and differences:
-                        log_entry = result.to_dict()
+                if log_file:
+                    log_entry = result.to_dict()
+                    if differences:
                         log_entry["differences"] = differences
-                        log_file.write(json.dumps(log_entry, default=str) + "\n")
-                        result = None  # Don't log again below
-                else:
-                    try:
-                        # Check if record exists (use pre-fetched IDs if available)
-                        if existing_ids is not None:
-                            exists = record_id in existing_ids
-                        else:
-                            exists = await client.exists(entity, record_id)
-
-                        differences = None
-                        if exists:
-                            # Check if record has changed when skip_unchanged is enabled
-                            if skip_unchanged:
-                                remote_record = await client.get_record(entity, record_id)
-                                if remote_record:
-                                    differences = get_record_differences(
-                                        clean_data, remote_record, backup_fields
-                                    )
-                                if not differences:
-                                    # Skip unchanged record
-                                    result = RestoreResult(
-                                        entity=entity_name,
-                                        record_id=record_id,
-                                        action="skipped",
-                                        status="unchanged",
-                                    )
-                                    stats.skipped += 1
-                                else:
-                                    # Update changed record
-                                    await client.update(entity, record_id, clean_data)
-                                    result = RestoreResult(
-                                        entity=entity_name,
-                                        record_id=record_id,
-                                        action="updated",
-                                        status="success",
-                                    )
-                                    stats.updated += 1
-                                    # Log differences
-                                    if log_file and differences:
-                                        log_entry = result.to_dict()
-                                        log_entry["differences"] = differences
-                                        log_file.write(
-                                            json.dumps(log_entry, default=str) + "\n"
-                                        )
-                                        log_file.flush()
-                                        result = None  # Don't log again below
-                            else:
-                                # Update existing record (no comparison)
-                                await client.update(entity, record_id, clean_data)
-                                result = RestoreResult(
-                                    entity=entity_name,
-                                    record_id=record_id,
-                                    action="updated",
-                                    status="success",
-                                )
-                                stats.updated += 1
-                        else:
-                            # Create new record
-                            new_record = await client.create(entity, clean_data)
-                            new_id = new_record.get("id")
-                            result = RestoreResult(
-                                entity=entity_name,
-                                record_id=record_id,
-                                action="created",
-                                status="success",
-                                new_id=new_id,
-                            )
-                            stats.created += 1
-
-                            # Track ID mapping for dependent entities
-                            if new_id is not None:
-                                all_id_mappings[entity_name][record_id] = new_id
-                                # Persist mapping for resume capability
-                                if mapping_file:
-                                    save_id_mapping_entry(
-                                        mapping_file, entity_name, record_id, new_id
-                                    )
+                    log_lines.append(dumps_line(log_entry))
 
-                    except Exception as e:
-                        result = RestoreResult(
-                            entity=entity_name,
-                            record_id=record_id,
-                            action="update" if exists else "create",
-                            status="failed",
-                            error=str(e),
-                        )
-                        stats.failed += 1
+                processed += 1
 
-                # Write to log file (unless already written with differences)
-                if log_file and result is not None:
-                    log_file.write(json.dumps(result.to_dict()) + "\n")
-                    log_file.flush()
+            # Persist the window's mappings for resume capability
+            if mapping_file:
+                save_id_mapping_entries(mapping_file, entity_name, created)
 
-                # Update progress with percentage
-                if progress_callback and (i + 1) % 10 == 0:
-                    pct = (i + 1) * 100 // total_records
-                    progress_callback(f"  Records: {i + 1}/{total_records} ({pct}%)")
+            # One write and flush per window instead of per record
+            if log_lines:
+                log_file.writelines(log_lines)
+                log_file.flush()
 
-            # Final progress update
-            if progress_callback and total_records > 0:
-                progress_callback(f"  Records: {total_records}/{total_records} (100%)")
+            # Update progress with percentage, at most every PROGRESS_INTERVAL
+            if progress_callback:
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    pct = processed * 100 // total_records
+                    progress_callback(
+                        f"  {entity_name}: Records: {processed}/{total_records} ({pct}%)"
+                    )
 
-            all_record_stats[entity_name] = stats
+        # Final progress update
+        if progress_callback and total_records > 0:
+            progress_callback(
+                f"  {entity_name}: Records: {total_records}/{total_records} (100%)"
+            )
 
-    # Close mapping file
-    if mapping_file:
-        mapping_file.close()
+        all_record_stats[entity_name] = stats
+
+    # Entities in the same layer don't reference each other and are restored
+    # concurrently, unless deletions may prompt for confirmation
+    interactive = not dry_run and (delete_extra_fields or delete_extra_records)
+    layers = get_restore_layers(restorable, {
+        name: RESTORE_DEPENDENCIES.get(name, set(restorable[:i]))
+        | set(get_reference_fields(field_defs_by_entity[name]).values())
+        for i, name in enumerate(restorable)
+    })
+
+    try:
+        async with PipedriveClient(api_token) as client:
+            for layer in layers:
+                if interactive or len(layer) == 1:
+                    for entity_name in layer:
+                        await restore_entity_backup(client, entity_name)
+                    continue
+
+                tasks = [
+                    asyncio.create_task(restore_entity_backup(client, entity_name))
+                    for entity_name in layer
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    # Stop the other entities before the mapping file is closed
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+    finally:
+        # Mappings are flushed per window; closing also covers interrupted runs
+        if mapping_file:
+            mapping_file.close()
+
+        # Persist payload hashes so unchanged records are skipped without a fetch
+        # next time (including records stored before an interruption)
+        if skip_unchanged and not dry_run:
+            save_record_hashes(backup_path, account, all_record_hashes)
 
     # Update local CSV files with Pipedrive-assigned IDs
     if update_base and not dry_run and all_id_mappings:
-        # Collect field definitions for all entities
-        field_defs_by_entity = {}
-        for entity_name in entity_names:
-            if entity_name in resources_by_name:
-                resource = resources_by_name[entity_name]
-                backup_fields = []
-                if hasattr(resource.schema, "custom") and resource.schema.custom:
-                    backup_fields = resource.schema.custom.get("pipedrive_fields", [])
-                elif hasattr(resource.schema, "to_dict"):
-                    schema_dict = resource.schema.to_dict()
-                    backup_fields = schema_dict.get("pipedrive_fields", [])
-                field_defs_by_entity[entity_name] = backup_fields
-
         update_local_ids(backup_path, all_id_mappings, field_defs_by_entity)
 
         if progress_callback:
             total_mapped = sum(len(m) for m in all_id_mappings.values())
             progress_callback(f"Updated {total_mapped} record ID(s) in local data")
 
+    # Entities of a layer finish in any order; report them in restore order
     return RestoreReport(
-        record_stats=all_record_stats,
-        field_stats=all_field_stats,
+        record_stats={
+            name: all_record_stats[name] for name in restorable if name in all_record_stats
+        },
+        field_stats={
+            name: all_field_stats[name] for name in restorable if name in all_field_stats
+        },
         id_mappings=all_id_mappings,
     )
 
@@ -9,25 +9,36 @@ Provides functionality to:
 import csv
 import io
 import json
-import re
-from typing import Any
+from collections.abc import Callable, Collection, Mapping
+from functools import partial
+from operator import itemgetter
+from typing import Any, TextIO
 
 from rich.console import Console
 from rich.table import Table
 
 from .expressions import (
+    EXPRESSION_KEYWORDS,
     FIELD_FUNC_PATTERN,
     FILTER_FUNCTIONS,
+    IDENTIFIER_PATTERN,
     AmbiguousCallback,
     EnumValue,
     FilterError,
+    _has_identifier_chars,
     _isfloat,
     _isint,
     _isnumeric,
+    _string_literal_checker,
     format_resolved_expression,
+    referenced_option_lookup,
     resolve_expression,
     resolve_field_identifier,
     resolve_field_name,
+    wrap_enum_values,
+)
+from .expressions import (
+    compile_filter as _compile_filter,
 )
 from .expressions import (
     filter_record as _filter_record,
@@ -36,7 +47,8 @@ from .expressions import (
     validate_expression as _validate_expression,
 )
 from .field import build_option_lookup, format_option_value
-from .matching import AmbiguousMatchError, find_field_matches
+from .matching import AmbiguousMatchError, FieldIndex, build_field_index, find_field_matches
+from .serialize import dumps_pretty
 
 # Re-export for backwards compatibility
 __all__ = [
@@ -47,23 +59,31 @@ __all__ = [
     "extract_filter_keys",
     "validate_expression",
     "filter_record",
+    "compile_filter",
+    "filter_records",
     "preprocess_record_for_filter",
     "resolve_field_prefixes",
     "select_fields",
+    "make_field_selector",
     "format_table",
     "format_json",
     "format_csv",
+    "write_records_csv",
     "_isint",
     "_isfloat",
     "_isnumeric",
 ]
 
+# Function names and keywords that are never field keys in filter expressions
+_KNOWN_FILTER_NAMES = frozenset(FILTER_FUNCTIONS) | EXPRESSION_KEYWORDS
+
 
 def resolve_filter_expression(
     fields: list[dict[str, Any]],
     expression: str,
     *,
     on_ambiguous: AmbiguousCallback | None = None,
+    index: FieldIndex | None = None,
 ) -> tuple[str, dict[str, tuple[str, str]]]:
     """Resolve all field identifiers in a filter expression.
 
@@ -76,6 +96,7 @@ def resolve_filter_expression(
         on_ambiguous: Callback called when multiple matches found.
                       Receives (identifier, matches), returns selected key.
                       If None, raises AmbiguousMatchError.
+        index: Prebuilt build_field_index(fields), shared across resolutions
 
     Returns:
         Tuple of (resolved_expression, resolutions_dict)
@@ -84,7 +105,9 @@ def resolve_filter_expression(
     Raises:
         AmbiguousMatchError: If any identifier matches multiple fields and no callback
     """
-    return resolve_expression(fields, expression, FILTER_FUNCTIONS, on_ambiguous=on_ambiguous)
+    return resolve_expression(
+        fields, expression, FILTER_FUNCTIONS, on_ambiguous=on_ambiguous, index=index
+    )
 
 
 def validate_expression(expression: str, field_keys: set[str]) -> None:
@@ -122,10 +145,25 @@ def filter_record(record: dict[str, Any], expression: str) -> bool:
     return _filter_record(record, expression, FILTER_FUNCTIONS)
 
 
+def compile_filter(expression: str) -> Callable[[dict[str, Any]], bool]:
+    """Prepare a filter expression for evaluation against many records.
+
+    The expression is parsed once and the evaluator reused across records.
+
+    Args:
+        expression: The filter expression (already resolved)
+
+    Returns:
+        Function taking a record and returning True if it matches the filter.
+        It raises FilterError if the expression cannot be evaluated.
+    """
+    return _compile_filter(expression, FILTER_FUNCTIONS)
+
+
 def preprocess_record_for_filter(
     record: dict[str, Any],
     option_lookup: dict[str, dict[str, str]],
-) -> dict[str, Any]:
+) -> Mapping[str, Any]:
     """Wrap enum/set values for filter comparison.
 
     Transforms raw option IDs into EnumValue objects that support
@@ -136,23 +174,40 @@ def preprocess_record_for_filter(
         option_lookup: {field_key: {id: label}} from build_option_lookup()
 
     Returns:
-        Record with EnumValue wrappers for enum/set fields
+        Read-only view of the record with EnumValue wrappers for enum/set fields
     """
-    if not option_lookup:
-        return record
+    return wrap_enum_values(record, option_lookup)
 
-    processed = dict(record)
-    for field_key, opts in option_lookup.items():
-        if field_key not in processed:
-            continue
-        raw_value = processed[field_key]
-        if raw_value is None or raw_value == "":
-            continue
 
-        str_val = str(raw_value)
-        processed[field_key] = EnumValue(str_val, opts.get(str_val))
+def filter_records(
+    records: list[dict[str, Any]],
+    expression: str,
+    option_lookup: dict[str, dict[str, str]] | None = None,
+) -> list[dict[str, Any]]:
+    """Select the records matching a filter expression.
+
+    The expression is compiled once and its evaluator reused for every record.
+    Enum/set values are wrapped for comparison when option_lookup is given.
 
-    return processed
+    Args:
+        records: Records to filter
+        expression: The filter expression (already resolved)
+        option_lookup: {field_key: {id: label}} from build_option_lookup()
+
+    Returns:
+        Matching records (original, unwrapped dicts), in input order
+
+    Raises:
+        FilterError: If the expression cannot be evaluated
+    """
+    if not expression:
+        return list(records)
+    matches = compile_filter(expression)
+    option_lookup = referenced_option_lookup(option_lookup or {}, [expression])
+    if not option_lookup:
+        return [r for r in records if matches(r)]
+    enum_cache: dict[tuple[str, str], EnumValue] = {}
+    return [r for r in records if matches(wrap_enum_values(r, option_lookup, enum_cache))]
 
 
 def extract_filter_keys(
@@ -168,49 +223,40 @@ def extract_filter_keys(
     Returns:
         List of field keys found in the expression
     """
-    if not resolved_expr:
+    if not resolved_expr or not _has_identifier_chars(resolved_expr):
         return []
 
     # Build set of known field keys
     field_keys = {f.get("key", "") for f in fields}
 
-    # Build set of known function names to exclude
-    known_functions = set(FILTER_FUNCTIONS.keys()) | {
-        "and", "or", "not", "True", "False", "None", "in", "null",
-    }
+    # Identifiers inside string literals are not field references
+    in_literal = _string_literal_checker(resolved_expr)
 
-    # Find string literal positions to exclude them
-    string_positions: set[int] = set()
-    for match in re.finditer(r"'[^']*'|\"[^\"]*\"", resolved_expr):
-        for i in range(match.start(), match.end()):
-            string_positions.add(i)
-
-    # Pattern to match identifiers
-    identifier_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
-
-    found_keys: list[str] = []
-    for match in re.finditer(identifier_pattern, resolved_expr):
-        if match.start() in string_positions:
+    # Ordered dict used as an insertion-ordered set for O(1) dedup
+    found_keys: dict[str, None] = {}
+    for match in IDENTIFIER_PATTERN.finditer(resolved_expr):
+        if in_literal(match.start()):
             continue
         identifier = match.group(1)
-        if identifier in known_functions:
+        if identifier in _KNOWN_FILTER_NAMES:
             continue
 
         # Check for escaped digit-starting keys: _25da... → 25da...
         if identifier.startswith("_") and len(identifier) > 1 and identifier[1].isdigit():
             unescaped = identifier[1:]
-            if unescaped in field_keys and unescaped not in found_keys:
-                found_keys.append(unescaped)
-        elif identifier in field_keys and identifier not in found_keys:
-            found_keys.append(identifier)
+            if unescaped in field_keys:
+                found_keys[unescaped] = None
+        elif identifier in field_keys:
+            found_keys[identifier] = None
 
-    return found_keys
+    return list(found_keys)
 
 
 def resolve_field_prefixes(
     fields: list[dict[str, Any]],
     prefixes: list[str],
     fail_on_ambiguous: bool = False,
+    index: FieldIndex | None = None,
 ) -> tuple[list[str], list[str]]:
     """Resolve field prefixes to full field keys.
 
@@ -224,23 +270,31 @@ def resolve_field_prefixes(
         fields: List of field definitions
         prefixes: List of user-provided prefixes or field("name") expressions
         fail_on_ambiguous: If True, raise error on ambiguous matches
+        index: Prebuilt build_field_index(fields), shared across resolutions
 
     Returns:
         Tuple of (resolved field keys, unmatched prefixes)
     """
     resolved: list[str] = []
     unmatched: list[str] = []
+    if index is None:
+        index = build_field_index(fields)
 
     for prefix in prefixes:
         prefix = prefix.strip()
         if not prefix:
             continue
 
-        # Check for field("name") syntax first
+        # Exact keys (the usual --include/--exclude input) need no matching
+        if prefix in index.by_key:
+            resolved.append(prefix)
+            continue
+
+        # Check for field("name") syntax
         field_match = FIELD_FUNC_PATTERN.match(prefix)
         if field_match:
             field_name = field_match.group(2)
-            key = resolve_field_name(fields, field_name)
+            key = resolve_field_name(fields, field_name, index)
             if key:
                 resolved.append(key)
             else:
@@ -248,7 +302,7 @@ def resolve_field_prefixes(
             continue
 
         # Fall back to prefix matching
-        matches = find_field_matches(fields, prefix)
+        matches = find_field_matches(fields, prefix, index)
 
         if not matches:
             unmatched.append(prefix)
@@ -266,23 +320,19 @@ def resolve_field_prefixes(
         resolved.extend(f["key"] for f in matches)
 
     # Deduplicate while preserving order
-    seen: set[str] = set()
-    unique: list[str] = []
-    for key in resolved:
-        if key not in seen:
-            seen.add(key)
-            unique.append(key)
-
-    return unique, unmatched
+    return list(dict.fromkeys(resolved)), unmatched
 
 
 def select_fields(
     record: dict[str, Any],
-    include_keys: list[str] | None,
-    exclude_keys: list[str] | None,
+    include_keys: Collection[str] | None,
+    exclude_keys: Collection[str] | None,
 ) -> dict[str, Any]:
     """Select fields from a record based on include/exclude lists.
 
+    When selecting fields for many records, pass sets so that membership
+    checks are O(1) instead of scanning a list for every column.
+
     Args:
         record: The full record
         include_keys: If provided, only include these fields
@@ -299,9 +349,122 @@ def select_fields(
         return record
 
 
+def make_field_selector(
+    include_keys: Collection[str] | None,
+    exclude_keys: Collection[str] | None,
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Build a select_fields function for many records sharing one selection.
+
+    The include/exclude keys are converted to sets once, instead of at every
+    call site. Selected fields keep the record's key order.
+
+    Args:
+        include_keys: If provided, only include these fields
+        exclude_keys: If provided, exclude these fields
+
+    Returns:
+        Function mapping a record to its selected fields
+    """
+    if include_keys:
+        include_set = frozenset(include_keys)
+        return lambda record: {k: v for k, v in record.items() if k in include_set}
+    if exclude_keys:
+        exclude_set = frozenset(exclude_keys)
+        return lambda record: {k: v for k, v in record.items() if k not in exclude_set}
+    return lambda record: record
+
+
 # Default columns to show when no --include is specified
 DEFAULT_DISPLAY_COLUMNS = ["id", "name", "first_name", "last_name", "email", "title", "value"]
 MAX_AUTO_COLUMNS = 8
+MAX_CELL_WIDTH = 40  # Longer cell values are truncated with "..."
+
+
+def _row_getter(columns: list[str], default: Any) -> Callable[[dict[str, Any]], tuple]:
+    """Build a function returning a record's values for columns, in order.
+
+    Uses a C-level operator.itemgetter when the record has every column, and
+    fills missing columns with default otherwise.
+
+    Args:
+        columns: Keys to extract
+        default: Value for keys missing from a record
+
+    Returns:
+        Function mapping a record to a tuple of len(columns) values
+    """
+    if not columns:
+        return lambda record: ()
+
+    getter = itemgetter(*columns)
+    defaults = dict.fromkeys(columns, default)
+    single = len(columns) == 1
+
+    def get_row(record: dict[str, Any]) -> tuple:
+        try:
+            values = getter(record)
+        except KeyError:
+            values = getter(defaults | record)
+        # itemgetter with a single key returns the bare value
+        return (values,) if single else values
+
+    return get_row
+
+
+def _format_dict_cell(value: dict) -> str:
+    """Show a dict's name (or value); None is checked explicitly, not truthiness."""
+    if "name" in value and value["name"] is not None:
+        return str(value["name"])
+    if "value" in value and value["value"] is not None:
+        return str(value["value"])
+    return str(value)
+
+
+def _format_list_cell(value: list) -> str:
+    """Show a list's first item (its value or name for dicts)."""
+    if value and isinstance(value[0], dict):
+        item = value[0]
+        if "value" in item and item["value"] is not None:
+            return str(item["value"])
+        if "name" in item and item["name"] is not None:
+            return str(item["name"])
+        return str(item)
+    return str(value[0]) if value else ""
+
+
+# Cell formatters by exact value type: one dict lookup per cell instead of an
+# isinstance chain. Subclasses fall back to the isinstance checks.
+_CELL_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    str: str,
+    int: str,
+    float: str,
+    bool: str,
+    type(None): lambda value: "",
+    dict: _format_dict_cell,
+    list: _format_list_cell,
+}
+
+
+def _format_cell_value(value: Any) -> str:
+    """Format a non-enum value for a table cell.
+
+    Dicts show their name (or value), lists their first item.
+    """
+    formatter = _CELL_FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+    if isinstance(value, dict):
+        return _format_dict_cell(value)
+    if isinstance(value, list):
+        return _format_list_cell(value)
+    return str(value)
+
+
+def _truncate_cell(text: str) -> str:
+    """Truncate a cell value to MAX_CELL_WIDTH characters for table display."""
+    if len(text) > MAX_CELL_WIDTH:
+        return text[:MAX_CELL_WIDTH - 3] + "..."
+    return text
 
 
 def format_table(
@@ -311,6 +474,7 @@ def format_table(
     title: str = "Search Results",
     show_all_columns: bool = False,
     filter_keys: list[str] | None = None,
+    option_lookup: dict[str, dict[str, str]] | None = None,
 ) -> None:
     """Format records as a Rich table.
 
@@ -321,6 +485,8 @@ def format_table(
         title: Table title
         show_all_columns: If False, limit columns when there are many
         filter_keys: Field keys used in filter expression (added to display if truncated)
+        option_lookup: Pre-built lookup from build_option_lookup() (built from
+                       fields if not provided)
     """
     if not records:
         console.print("[dim]No matching records found.[/dim]")
@@ -350,14 +516,18 @@ def format_table(
         columns = all_columns
         truncated = False
 
-    # Build field name lookup for display
+    # Build field name lookup for the displayed columns only
     field_names: dict[str, str] = {}
     if fields:
+        wanted = set(columns)
         for f in fields:
-            field_names[f.get("key", "")] = f.get("name", f.get("key", ""))
+            key = f.get("key", "")
+            if key in wanted:
+                field_names[key] = f.get("name", key)
 
-    # Build option lookup for enum/set fields
-    option_lookup = build_option_lookup(fields) if fields else {}
+    # Build option lookup for enum/set fields (reuse the caller's if provided)
+    if option_lookup is None:
+        option_lookup = build_option_lookup(fields) if fields else {}
 
     table = Table(title=f"{title} ({len(records)} records)")
 
@@ -366,41 +536,19 @@ def format_table(
         style = "cyan" if col == "id" else None
         table.add_column(display_name, style=style, overflow="fold")
 
+    # Pick each column's formatter once instead of dispatching per cell
+    handlers: list[Callable[[Any], str]] = [
+        partial(format_option_value, field_key=col, option_lookup=option_lookup)
+        if col in option_lookup
+        else _format_cell_value
+        for col in columns
+    ]
+    get_row = _row_getter(columns, "")
+
     for record in records:
-        row: list[str] = []
-        for col in columns:
-            value = record.get(col, "")
-            # Format enum/set values with labels
-            if col in option_lookup:
-                str_val = format_option_value(value, col, option_lookup)
-            # Handle complex values (dicts, lists)
-            elif isinstance(value, dict):
-                # Try to extract a meaningful value (check None explicitly, not truthiness)
-                if "name" in value and value["name"] is not None:
-                    str_val = str(value["name"])
-                elif "value" in value and value["value"] is not None:
-                    str_val = str(value["value"])
-                else:
-                    str_val = str(value)
-            elif isinstance(value, list):
-                # Show first item
-                if value and isinstance(value[0], dict):
-                    item = value[0]
-                    if "value" in item and item["value"] is not None:
-                        str_val = str(item["value"])
-                    elif "name" in item and item["name"] is not None:
-                        str_val = str(item["name"])
-                    else:
-                        str_val = str(item)
-                else:
-                    str_val = str(value[0]) if value else ""
-            else:
-                str_val = str(value) if value is not None else ""
-            # Truncate long values for table display
-            if len(str_val) > 40:
-                str_val = str_val[:37] + "..."
-            row.append(str_val)
-        table.add_row(*row)
+        table.add_row(
+            *[_truncate_cell(handler(value)) for handler, value in zip(handlers, get_row(record))]
+        )
 
     console.print(table)
 
@@ -420,7 +568,7 @@ def format_json(records: list[dict[str, Any]]) -> str:
     Returns:
         JSON string with indentation
     """
-    return json.dumps(records, indent=2, ensure_ascii=False, default=str)
+    return dumps_pretty(records)
 
 
 def format_csv(records: list[dict[str, Any]]) -> str:
@@ -432,23 +580,41 @@ def format_csv(records: list[dict[str, Any]]) -> str:
     Returns:
         CSV string with header row
     """
-    if not records:
-        return ""
-
     output = io.StringIO()
-    columns = list(records[0].keys())
+    write_records_csv(records, output)
+    return output.getvalue()
 
-    writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
-    writer.writeheader()
 
-    for record in records:
-        # Flatten complex values to JSON strings
-        flat: dict[str, Any] = {}
-        for k, v in record.items():
-            if isinstance(v, (dict, list)):
-                flat[k] = json.dumps(v, ensure_ascii=False)
-            else:
-                flat[k] = v
-        writer.writerow(flat)
+# json.dumps() with non-default options builds a new encoder per call; CSV cells
+# holding dicts/lists share this one
+_encode_cell = json.JSONEncoder(ensure_ascii=False).encode
 
-    return output.getvalue()
+
+def write_records_csv(records: list[dict[str, Any]], file: TextIO) -> None:
+    """Write records as CSV to a text stream, row by row.
+
+    Columns are taken from the first record. Nothing is written when there are
+    no records.
+
+    Args:
+        records: List of records to format
+        file: Text stream to write to (e.g. sys.stdout)
+    """
+    if not records:
+        return
+
+    columns = list(records[0].keys())
+
+    writer = csv.writer(file)
+    writer.writerow(columns)
+
+    # Flatten complex values to JSON strings, streaming rows into one writerows call.
+    # Keys missing from a record are written empty; keys not in columns are ignored.
+    get_row = _row_getter(columns, "")
+    writer.writerows(
+        [
+            _encode_cell(v) if isinstance(v, (dict, list)) else v
+            for v in get_row(record)
+        ]
+        for record in records
+    )
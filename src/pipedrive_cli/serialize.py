@@ -0,0 +1,75 @@
+"""JSON (de)serialization for logs, ID mappings and JSON output.
+
+Uses orjson when installed (pip install pipedrive-cli[fast]), otherwise the
+standard library json module. Both produce equivalent JSON documents.
+"""
+
+import json
+from typing import Any
+
+# Optional dependency: orjson for faster JSON serialization
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_line(obj: Any) -> str:
+    """Serialize an object as one JSON line (with trailing newline).
+
+    Non-serializable values are converted with str().
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        Single-line JSON text ending with a newline
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits: let json handle them
+    return json.dumps(obj, default=str) + "\n"
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize an object as indented JSON, keeping non-ASCII characters.
+
+    Non-serializable values are converted with str().
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text indented by 2 spaces
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from text or UTF-8 bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error is a subclass)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
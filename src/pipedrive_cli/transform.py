@@ -6,7 +6,7 @@ Provides functionality to:
 - Apply updates to records
 """
 
-import re
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -15,13 +15,19 @@ from .expressions import (
     AmbiguousCallback,
     EnumValue,
     _escape_digit_key,
+    _field_display_name,
+    _replace_tokens,
+    compile_expression,
     evaluate_expression,
+    referenced_option_lookup,
     resolve_expression,
     resolve_field_identifier,
+    wrap_enum_values,
 )
 from .expressions import (
     validate_expression as _validate_expression,
 )
+from .matching import FieldIndex, build_field_index
 
 
 def validate_assignment(expression: str, field_keys: set[str]) -> None:
@@ -63,9 +69,9 @@ def parse_assignment(assignment: str) -> tuple[str, str]:
     Raises:
         ValueError: If assignment format is invalid
     """
-    if "=" not in assignment:
+    field, sep, expr = assignment.partition("=")
+    if not sep:
         raise ValueError(f"Invalid assignment: {assignment} (expected 'field=expr')")
-    field, expr = assignment.split("=", 1)
     return field.strip(), expr.strip()
 
 
@@ -74,6 +80,7 @@ def resolve_assignment(
     assignment: str,
     *,
     on_ambiguous: AmbiguousCallback | None = None,
+    index: FieldIndex | None = None,
 ) -> tuple[str, str, str, dict[str, tuple[str, str]]]:
     """Resolve field identifiers in an assignment expression.
 
@@ -87,6 +94,7 @@ def resolve_assignment(
         on_ambiguous: Callback called when multiple matches found.
                       Receives (identifier, matches), returns selected key.
                       If None, raises AmbiguousMatchError.
+        index: Prebuilt build_field_index(fields), shared across assignments
 
     Returns:
         Tuple of (escaped_target_key, original_expr, resolved_expr, resolutions)
@@ -99,22 +107,25 @@ def resolve_assignment(
     """
     field_id, expr = parse_assignment(assignment)
 
+    # Index fields once for the target and every identifier in the expression
+    if index is None:
+        index = build_field_index(fields)
+
     # Resolve the target field
-    target_key = resolve_field_identifier(fields, field_id, on_ambiguous=on_ambiguous)
+    target_key = resolve_field_identifier(
+        fields, field_id, on_ambiguous=on_ambiguous, index=index
+    )
     escaped_target = _escape_digit_key(target_key)
 
     # Use shared expression resolution (includes hex-pattern detection + escaping)
     resolved_expr, expr_resolutions = resolve_expression(
-        fields, expr, TRANSFORM_FUNCTIONS, on_ambiguous=on_ambiguous
+        fields, expr, TRANSFORM_FUNCTIONS, on_ambiguous=on_ambiguous, index=index
     )
 
     # Merge target field resolution with expression resolutions
     resolutions = dict(expr_resolutions)
     if target_key != field_id:
-        field_by_key: dict[str, dict] = {f.get("key", ""): f for f in fields}
-        field_def = field_by_key.get(target_key, {})
-        field_name = field_def.get("name", target_key)
-        resolutions[field_id] = (target_key, field_name)
+        resolutions[field_id] = (target_key, _field_display_name(index, target_key))
 
     return escaped_target, expr, resolved_expr, resolutions
 
@@ -146,16 +157,13 @@ def format_resolved_assignment(
         # No resolution happened
         return f"{original_field} = {original_expr}", ""
 
-    # Build expression with names
-    name_expr = original_expr
-    name_field = original_field
-
-    for identifier, (key, name) in sorted(resolutions.items(), key=lambda x: -len(x[0])):
-        # Quote names with spaces
-        display_name = f'"{name}"' if " " in name else name
-        name_expr = re.sub(rf"\b{re.escape(identifier)}\b", display_name, name_expr)
-        if identifier == original_field:
-            name_field = display_name
+    # Build expression with names (quoted when they contain spaces)
+    display_names = {
+        identifier: f'"{name}"' if " " in name else name
+        for identifier, (_, name) in resolutions.items()
+    }
+    name_expr = _replace_tokens(original_expr, display_names)
+    name_field = display_names.get(original_field, original_field)
 
     # Build key expression (already resolved)
     key_field = target_key
@@ -186,34 +194,18 @@ def evaluate_assignment(
     return evaluate_expression(record, expression, TRANSFORM_FUNCTIONS)
 
 
-def _preprocess_record_for_eval(
-    record: dict[str, Any],
-    option_lookup: dict[str, dict[str, str]],
-) -> dict[str, Any]:
-    """Wrap enum/set values for expression evaluation.
+def compile_assignment(expression: str) -> Callable[[dict[str, Any]], Any]:
+    """Prepare an assignment expression for evaluation against many records.
+
+    The expression is parsed once and the evaluator reused across records.
 
     Args:
-        record: Original record
-        option_lookup: {field_key: {id: label}} for enum/set fields
+        expression: The expression to evaluate (already resolved)
 
     Returns:
-        Record with EnumValue wrappers for enum/set fields
+        Function taking a record and returning the evaluated result
     """
-    if not option_lookup:
-        return record
-
-    processed = dict(record)
-    for field_key, opts in option_lookup.items():
-        if field_key not in processed:
-            continue
-        raw_value = processed[field_key]
-        if raw_value is None or raw_value == "":
-            continue
-
-        str_val = str(raw_value)
-        processed[field_key] = EnumValue(str_val, opts.get(str_val))
-
-    return processed
+    return compile_expression(expression, TRANSFORM_FUNCTIONS)
 
 
 def apply_update_local(
@@ -224,6 +216,12 @@ def apply_update_local(
 ) -> tuple[UpdateStats, list[dict[str, Any]]]:
     """Apply assignments to records in memory.
 
+    Every expression reads the record as it was before any assignment ran
+    (snapshot rule, as in API mode), whether or not option_lookup holds enum
+    fields: with a=a+1 then b=a, b gets the original a. New values are written
+    once the record's assignments are evaluated. A repeated target is compared
+    with the value its previous assignment produced.
+
     Args:
         records: List of records to update
         assignments: List of (target_key, resolved_expr) tuples
@@ -236,21 +234,36 @@ def apply_update_local(
     """
     stats = UpdateStats(total=len(records))
     changes: list[dict[str, Any]] = []
+    compiled = [
+        (target_key, compile_assignment(resolved_expr))
+        for target_key, resolved_expr in assignments
+    ]
+    # Only enum/set fields some assignment reads need wrapping; often none do
+    option_lookup = referenced_option_lookup(
+        option_lookup or {}, [resolved_expr for _, resolved_expr in assignments]
+    )
+
+    enum_cache: dict[tuple[str, str], EnumValue] = {}
 
     for record in records:
         record_id = record.get("id", "?")
-        record_changed = False
+        # New values, held back so every expression reads the unmodified record
+        updates: dict[str, Any] = {}
 
         # Preprocess record for enum/set comparison in expressions
-        eval_record = _preprocess_record_for_eval(record, option_lookup or {})
-
-        for target_key, resolved_expr in assignments:
-            old_value = record.get(target_key)
+        eval_record = (
+            wrap_enum_values(record, option_lookup, enum_cache) if option_lookup else record
+        )
 
+        for target_key, evaluate in compiled:
             try:
-                new_value = evaluate_assignment(eval_record, resolved_expr)
+                new_value = evaluate(eval_record)
 
-                # Only count as updated if value actually changed
+                # Only count as updated if value actually changed (old value is
+                # read only once evaluation succeeded)
+                old_value = (
+                    updates[target_key] if target_key in updates else record.get(target_key)
+                )
                 if new_value != old_value:
                     changes.append({
                         "id": record_id,
@@ -258,16 +271,17 @@ def apply_update_local(
                         "old": old_value,
                         "new": new_value,
                     })
-                    if not dry_run:
-                        record[target_key] = new_value
-                    record_changed = True
+                    updates[target_key] = new_value
 
             except Exception as e:
                 stats.failed += 1
                 stats.errors.append(f"Record {record_id}, field {target_key}: {e}")
                 continue
 
-        if record_changed:
+        if updates and not dry_run:
+            record.update(updates)
+
+        if updates:
             stats.updated += 1
         else:
             stats.skipped += 1
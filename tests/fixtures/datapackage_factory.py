@@ -1,34 +1,37 @@
 """Factory for creating test datapackages with consistent structure."""
 
 import csv
+import io
 import json
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 # Default field definitions for testing
-DEFAULT_SYSTEM_FIELDS = {
-    "persons": [
+DEFAULT_SYSTEM_FIELDS: dict[str, tuple[dict[str, Any], ...]] = {
+    "persons": (
         {"key": "id", "name": "ID", "field_type": "int", "edit_flag": False},
         {"key": "name", "name": "Name", "field_type": "varchar", "edit_flag": True},
         {"key": "email", "name": "Email", "field_type": "varchar", "edit_flag": True},
         {"key": "phone", "name": "Phone", "field_type": "varchar", "edit_flag": True},
-    ],
-    "organizations": [
+    ),
+    "organizations": (
         {"key": "id", "name": "ID", "field_type": "int", "edit_flag": False},
         {"key": "name", "name": "Name", "field_type": "varchar", "edit_flag": True},
         {"key": "address", "name": "Address", "field_type": "varchar", "edit_flag": True},
-    ],
-    "deals": [
+    ),
+    "deals": (
         {"key": "id", "name": "ID", "field_type": "int", "edit_flag": False},
         {"key": "title", "name": "Title", "field_type": "varchar", "edit_flag": True},
         {"key": "value", "name": "Value", "field_type": "double", "edit_flag": True},
         {"key": "status", "name": "Status", "field_type": "varchar", "edit_flag": True},
-    ],
+    ),
 }
 
 # Custom fields for testing field operations
-DEFAULT_CUSTOM_FIELDS = {
-    "persons": [
+DEFAULT_CUSTOM_FIELDS: dict[str, tuple[dict[str, Any], ...]] = {
+    "persons": (
         {
             "key": "abc123_custom_text",
             "name": "Custom Text",
@@ -47,28 +50,28 @@ DEFAULT_CUSTOM_FIELDS = {
             "field_type": "varchar",
             "edit_flag": True,
         },
-    ],
-    "organizations": [
+    ),
+    "organizations": (
         {
             "key": "org_custom_field",
             "name": "Org Custom",
             "field_type": "varchar",
             "edit_flag": True,
         },
-    ],
-    "deals": [
+    ),
+    "deals": (
         {
             "key": "deal_custom_field",
             "name": "Deal Custom",
             "field_type": "varchar",
             "edit_flag": True,
         },
-    ],
+    ),
 }
 
 # Sample data generators
-SAMPLE_DATA = {
-    "persons": [
+SAMPLE_DATA: dict[str, tuple[dict[str, Any], ...]] = {
+    "persons": (
         {
             "id": "1",
             "name": "Alice Smith",
@@ -96,8 +99,8 @@ SAMPLE_DATA = {
             "def456_custom_number": "0",
             "25da23b938af0807ec37": "",
         },
-    ],
-    "organizations": [
+    ),
+    "organizations": (
         {
             "id": "1",
             "name": "Acme Corp",
@@ -110,8 +113,8 @@ SAMPLE_DATA = {
             "address": "456 Oak Ave",
             "org_custom_field": "Org value 2",
         },
-    ],
-    "deals": [
+    ),
+    "deals": (
         {
             "id": "1",
             "title": "Big Deal",
@@ -126,7 +129,7 @@ SAMPLE_DATA = {
             "status": "won",
             "deal_custom_field": "Deal value 2",
         },
-    ],
+    ),
 }
 
 
@@ -136,6 +139,7 @@ def create_test_datapackage(
     include_custom_fields: bool = True,
     extra_fields: dict[str, list[dict[str, Any]]] | None = None,
     extra_data: dict[str, list[dict[str, Any]]] | None = None,
+    include_custom_metadata: bool = True,
 ) -> Path:
     """Create a test datapackage with consistent structure.
 
@@ -145,6 +149,9 @@ def create_test_datapackage(
         include_custom_fields: Whether to include custom fields
         extra_fields: Additional fields to add per entity
         extra_data: Additional data rows per entity
+        include_custom_metadata: If False, custom and extra fields keep their
+            CSV columns and schema.fields entries but are left out of
+            pipedrive_fields (simulates lost field metadata)
 
     Returns:
         Path to the created datapackage directory
@@ -154,27 +161,58 @@ def create_test_datapackage(
 
     base_path.mkdir(parents=True, exist_ok=True)
 
+    if extra_fields is None and extra_data is None:
+        # Common fixture path: reuse the files rendered for the same entities
+        files = _render_default_datapackage(
+            tuple(entities), include_custom_fields, include_custom_metadata
+        )
+    else:
+        files = _render_datapackage(
+            entities, include_custom_fields, include_custom_metadata, extra_fields, extra_data
+        )
+
+    for filename, content in files.items():
+        (base_path / filename).write_bytes(content)
+
+    return base_path
+
+
+def _render_datapackage(
+    entities: Iterable[str],
+    include_custom_fields: bool,
+    include_custom_metadata: bool,
+    extra_fields: dict[str, list[dict[str, Any]]] | None = None,
+    extra_data: dict[str, list[dict[str, Any]]] | None = None,
+) -> dict[str, bytes]:
+    """Render the CSV files and datapackage.json, keyed by file name."""
+    files: dict[str, bytes] = {}
     resources = []
 
     for entity in entities:
         # Build field list
-        fields = list(DEFAULT_SYSTEM_FIELDS.get(entity, []))
+        system_fields = DEFAULT_SYSTEM_FIELDS.get(entity, ())
+        fields = system_fields
         if include_custom_fields:
-            fields.extend(DEFAULT_CUSTOM_FIELDS.get(entity, []))
+            fields += DEFAULT_CUSTOM_FIELDS.get(entity, ())
         if extra_fields and entity in extra_fields:
-            fields.extend(extra_fields[entity])
+            fields += tuple(extra_fields[entity])
 
         # Build data
-        data = list(SAMPLE_DATA.get(entity, []))
+        data = SAMPLE_DATA.get(entity, ())
         if extra_data and entity in extra_data:
-            data.extend(extra_data[entity])
+            data += tuple(extra_data[entity])
+
+        # CSV header and Frictionless schema fields, built in one pass
+        fieldnames, schema_fields = _split_fields(fields)
 
         # Create CSV
-        csv_path = base_path / f"{entity}.csv"
-        _write_csv(csv_path, fields, data)
+        files[f"{entity}.csv"] = _render_csv(fieldnames, data)
 
         # Create resource definition
-        resource = _create_resource(entity, fields)
+        pipedrive_fields = (
+            fields if include_custom_metadata else system_fields
+        )
+        resource = _create_resource(entity, pipedrive_fields, schema_fields)
         resources.append(resource)
 
     # Create datapackage.json
@@ -182,42 +220,60 @@ def create_test_datapackage(
         "name": "test-datapackage",
         "resources": resources,
     }
-    datapackage_path = base_path / "datapackage.json"
-    with open(datapackage_path, "w", encoding="utf-8") as f:
-        json.dump(datapackage, f, indent=2, ensure_ascii=False)
+    # Compact separators let json use its C encoder (indent forces the Python one)
+    files["datapackage.json"] = json.dumps(
+        datapackage, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return files
 
-    return base_path
 
+@lru_cache(maxsize=None)
+def _render_default_datapackage(
+    entities: tuple[str, ...], include_custom_fields: bool, include_custom_metadata: bool
+) -> dict[str, bytes]:
+    """Render a datapackage without extras once per entity selection."""
+    return _render_datapackage(entities, include_custom_fields, include_custom_metadata)
 
-def _write_csv(
-    path: Path,
-    fields: list[dict[str, Any]],
-    data: list[dict[str, Any]],
-) -> None:
-    """Write CSV file with given fields and data."""
-    fieldnames = [f["key"] for f in fields]
 
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        for row in data:
-            # Ensure all fields are present
-            complete_row = {key: row.get(key, "") for key in fieldnames}
-            writer.writerow(complete_row)
+# Pipedrive field types with a non-string Frictionless type
+_FRICTIONLESS_TYPES = {"int": "integer", "double": "number"}
 
 
-def _create_resource(entity: str, fields: list[dict[str, Any]]) -> dict[str, Any]:
-    """Create a Frictionless resource definition."""
-    # Schema fields (Frictionless format)
+def _split_fields(
+    fields: Sequence[dict[str, Any]],
+) -> tuple[list[str], list[dict[str, str]]]:
+    """Return the CSV field names and Frictionless schema fields for fields."""
+    fieldnames = []
     schema_fields = []
     for field in fields:
-        field_type = "string"
-        if field.get("field_type") == "int":
-            field_type = "integer"
-        elif field.get("field_type") == "double":
-            field_type = "number"
-        schema_fields.append({"name": field["key"], "type": field_type})
+        key = field["key"]
+        fieldnames.append(key)
+        schema_fields.append({
+            "name": key,
+            "type": _FRICTIONLESS_TYPES.get(field.get("field_type"), "string"),
+        })
+    return fieldnames, schema_fields
+
 
+def _render_csv(
+    fieldnames: list[str],
+    data: Sequence[dict[str, Any]],
+) -> bytes:
+    """Render CSV content with given field names and data."""
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    # Missing fields become empty cells, extra keys are ignored
+    writer.writerows([row.get(key, "") for key in fieldnames] for row in data)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _create_resource(
+    entity: str,
+    fields: Sequence[dict[str, Any]],
+    schema_fields: list[dict[str, str]],
+) -> dict[str, Any]:
+    """Create a Frictionless resource definition."""
     return {
         "name": entity,
         "path": f"{entity}.csv",
@@ -1,5 +1,10 @@
-"""Pytest fixtures for integrity tests."""
+"""Pytest fixtures for integrity tests.
 
+Each datapackage is built once per session and copied into the test's
+tmp_path, so tests can freely modify their copy.
+"""
+
+import shutil
 from pathlib import Path
 
 import pytest
@@ -11,35 +16,67 @@ from tests.fixtures.datapackage_factory import (
 )
 
 
+@pytest.fixture(scope="session")
+def _canonical_datapackages(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the canonical datapackages once for the whole session."""
+    root = tmp_path_factory.mktemp("canonical")
+
+    create_test_datapackage(root / "datapackage")
+    create_minimal_datapackage(root / "minimal")
+    create_multi_entity_datapackage(root / "multi")
+
+    # SOURCE: complete datapackage with all fields and metadata
+    create_test_datapackage(
+        root / "source",
+        entities=["persons"],
+        include_custom_fields=True,
+    )
+
+    # TARGET: same CSV data but stripped pipedrive_fields metadata (simulate the bug)
+    create_test_datapackage(
+        root / "target",
+        entities=["persons"],
+        include_custom_fields=True,  # CSV has the columns
+        include_custom_metadata=False,
+    )
+
+    return root
+
+
+def _copy_canonical(canonical_root: Path, name: str, tmp_path: Path) -> Path:
+    """Copy a canonical datapackage into the test's tmp_path."""
+    return Path(shutil.copytree(canonical_root / name, tmp_path / name))
+
+
 @pytest.fixture
-def test_datapackage(tmp_path: Path) -> Path:
+def test_datapackage(tmp_path: Path, _canonical_datapackages: Path) -> Path:
     """Create a standard test datapackage with persons entity.
 
     Includes system fields and custom fields.
     """
-    return create_test_datapackage(tmp_path / "datapackage")
+    return _copy_canonical(_canonical_datapackages, "datapackage", tmp_path)
 
 
 @pytest.fixture
-def minimal_datapackage(tmp_path: Path) -> Path:
+def minimal_datapackage(tmp_path: Path, _canonical_datapackages: Path) -> Path:
     """Create a minimal datapackage with only system fields.
 
     Useful for testing error cases.
     """
-    return create_minimal_datapackage(tmp_path / "minimal")
+    return _copy_canonical(_canonical_datapackages, "minimal", tmp_path)
 
 
 @pytest.fixture
-def multi_entity_datapackage(tmp_path: Path) -> Path:
+def multi_entity_datapackage(tmp_path: Path, _canonical_datapackages: Path) -> Path:
     """Create a datapackage with multiple entities.
 
     Includes persons, organizations, and deals.
     """
-    return create_multi_entity_datapackage(tmp_path / "multi")
+    return _copy_canonical(_canonical_datapackages, "multi", tmp_path)
 
 
 @pytest.fixture
-def two_datapackages(tmp_path: Path) -> tuple[Path, Path]:
+def two_datapackages(tmp_path: Path, _canonical_datapackages: Path) -> tuple[Path, Path]:
     """Create two datapackages for diff/merge testing.
 
     Returns (target_path, source_path) where:
@@ -48,38 +85,6 @@ def two_datapackages(tmp_path: Path) -> tuple[Path, Path]:
 
     This simulates the real scenario where CSV data exists but metadata was lost.
     """
-    import json
-
-    # SOURCE: complete datapackage with all fields and metadata
-    source_path = tmp_path / "source"
-    create_test_datapackage(
-        source_path,
-        entities=["persons"],
-        include_custom_fields=True,
-    )
-
-    # TARGET: same CSV data but stripped pipedrive_fields metadata
-    target_path = tmp_path / "target"
-    create_test_datapackage(
-        target_path,
-        entities=["persons"],
-        include_custom_fields=True,  # CSV has the columns
-    )
-
-    # Now strip custom field metadata from TARGET (simulate the bug)
-    datapackage_path = target_path / "datapackage.json"
-    with open(datapackage_path, encoding="utf-8") as f:
-        pkg = json.load(f)
-
-    for resource in pkg["resources"]:
-        if resource["name"] == "persons":
-            # Keep only system fields in pipedrive_fields
-            resource["schema"]["pipedrive_fields"] = [
-                f for f in resource["schema"]["pipedrive_fields"]
-                if f["key"] in ("id", "name", "email", "phone")
-            ]
-
-    with open(datapackage_path, "w", encoding="utf-8") as f:
-        json.dump(pkg, f, indent=2)
-
+    target_path = _copy_canonical(_canonical_datapackages, "target", tmp_path)
+    source_path = _copy_canonical(_canonical_datapackages, "source", tmp_path)
     return target_path, source_path
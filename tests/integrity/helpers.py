@@ -2,11 +2,15 @@
 
 import csv
 import hashlib
-import json
+import io
+import operator
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from pipedrive_cli.serialize import loads as json_loads
+
 
 @dataclass
 class DatapackageState:
@@ -18,14 +22,33 @@ class DatapackageState:
     - Frictionless schema fields per entity
     - Pipedrive field metadata per entity
     - CSV content checksums per entity
+    - CSV rows per entity (eagerly with capture_state(..., load_data=True),
+      otherwise on demand through csv_data_for())
     """
 
-    csv_columns: dict[str, set[str]] = field(default_factory=dict)
+    csv_columns: dict[str, frozenset[str]] = field(default_factory=dict)
     csv_row_counts: dict[str, int] = field(default_factory=dict)
     schema_fields: dict[str, list[str]] = field(default_factory=dict)
     pipedrive_fields: dict[str, list[str]] = field(default_factory=dict)
     csv_checksums: dict[str, str] = field(default_factory=dict)
     csv_data: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    # Raw CSV content as captured, so rows can be parsed later without
+    # re-reading files that the operation under test may have changed
+    _csv_contents: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def csv_data_for(self, entity: str) -> list[dict[str, Any]]:
+        """Get CSV rows for an entity, parsing the captured content on first use.
+
+        Args:
+            entity: Entity name
+
+        Returns:
+            Rows as dicts (empty if the entity has no captured CSV)
+        """
+        if entity not in self.csv_data and entity in self._csv_contents:
+            rows = _snapshot_csv(self._csv_contents[entity])[3]
+            self.csv_data[entity] = [dict(row) for row in rows]
+        return self.csv_data.get(entity, [])
 
     def __eq__(self, other: object) -> bool:
         """Compare states excluding csv_data (too verbose for comparison)."""
@@ -40,11 +63,16 @@ class DatapackageState:
         )
 
 
-def capture_state(base_path: Path) -> DatapackageState:
+def capture_state(base_path: Path, load_data: bool = False) -> DatapackageState:
     """Capture the complete state of a datapackage.
 
+    Parsing is memoized on file content, so capturing an unchanged
+    datapackage again only reads the files.
+
     Args:
         base_path: Path to the datapackage directory
+        load_data: Populate csv_data right away (for tests that read it
+            directly; the assert_csv_values_* helpers load rows on demand)
 
     Returns:
         DatapackageState with all captured information
@@ -56,62 +84,84 @@ def capture_state(base_path: Path) -> DatapackageState:
     if not datapackage_path.exists():
         return state
 
-    with open(datapackage_path, encoding="utf-8") as f:
-        pkg = json.load(f)
-
     # Process each resource
-    for resource in pkg.get("resources", []):
-        entity = resource["name"]
-        schema = resource.get("schema", {})
-
+    for entity, schema_fields, pipedrive_fields in _parse_resources(
+        datapackage_path.read_bytes()
+    ):
         # Capture schema.fields (Frictionless)
-        state.schema_fields[entity] = [
-            f["name"] for f in schema.get("fields", [])
-        ]
+        state.schema_fields[entity] = list(schema_fields)
 
         # Capture pipedrive_fields
-        state.pipedrive_fields[entity] = [
-            f["key"] for f in schema.get("pipedrive_fields", [])
-        ]
+        state.pipedrive_fields[entity] = list(pipedrive_fields)
 
         # Capture CSV state
         csv_path = base_path / f"{entity}.csv"
         if csv_path.exists():
-            state.csv_columns[entity] = _get_csv_columns(csv_path)
-            state.csv_row_counts[entity] = _count_csv_rows(csv_path)
-            state.csv_checksums[entity] = _compute_csv_checksum(csv_path)
-            state.csv_data[entity] = _load_csv_data(csv_path)
+            content = csv_path.read_bytes()
+            columns, row_count, checksum, _ = _snapshot_csv(content)
+            state.csv_columns[entity] = columns
+            state.csv_row_counts[entity] = row_count
+            state.csv_checksums[entity] = checksum
+            state._csv_contents[entity] = content
+            if load_data:
+                state.csv_data_for(entity)
 
     return state
 
 
-def _get_csv_columns(csv_path: Path) -> set[str]:
-    """Get column names from CSV file."""
-    with open(csv_path, encoding="utf-8") as f:
-        reader = csv.reader(f)
-        header = next(reader, None)
-        return set(header) if header else set()
-
-
-def _count_csv_rows(csv_path: Path) -> int:
-    """Count data rows in CSV file (excluding header)."""
-    with open(csv_path, encoding="utf-8") as f:
-        reader = csv.reader(f)
-        next(reader, None)  # Skip header
-        return sum(1 for _ in reader)
-
+@lru_cache(maxsize=256)
+def _parse_resources(
+    content: bytes,
+) -> tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...]:
+    """Parse datapackage.json into (entity, schema fields, pipedrive field keys)."""
+    pkg = json_loads(content)
+    resources = []
+    for resource in pkg.get("resources", []):
+        schema = resource.get("schema", {})
+        resources.append((
+            resource["name"],
+            tuple(f["name"] for f in schema.get("fields", [])),
+            tuple(f["key"] for f in schema.get("pipedrive_fields", [])),
+        ))
+    return tuple(resources)
 
-def _compute_csv_checksum(csv_path: Path) -> str:
-    """Compute MD5 checksum of CSV file content."""
-    with open(csv_path, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()
 
+@lru_cache(maxsize=256)
+def _snapshot_csv(
+    content: bytes,
+) -> tuple[frozenset[str], int, str, tuple[dict[str, Any], ...]]:
+    """Compute (columns, row count, checksum, rows) for CSV file content.
 
-def _load_csv_data(csv_path: Path) -> list[dict[str, Any]]:
-    """Load all CSV data as list of dicts."""
-    with open(csv_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+    The content is parsed in a single csv.reader pass.
+    """
+    checksum = hashlib.sha256(content).hexdigest()
+    reader = csv.reader(io.StringIO(content.decode("utf-8"), newline=None))
+    header = next(reader, None)
+    if not header:
+        return frozenset(), sum(1 for _ in reader), checksum, ()
+
+    rows = list(reader)
+    return frozenset(header), len(rows), checksum, tuple(_rows_as_dicts(header, rows))
+
+
+def _rows_as_dicts(header: list[str], rows: list[list[str]]) -> list[dict[str, Any]]:
+    """Convert raw rows to dicts the way csv.DictReader does."""
+    width = len(header)
+    if all(len(row) == width for row in rows):
+        return [dict(zip(header, row)) for row in rows]
+
+    data = []
+    for row in rows:
+        if not row:
+            continue  # DictReader skips blank lines
+        record: dict[str | None, Any] = dict(zip(header, row))
+        if len(row) > width:
+            record[None] = row[width:]
+        elif len(row) < width:
+            for key in header[len(row):]:
+                record[key] = None
+        data.append(record)
+    return data
 
 
 # =============================================================================
@@ -169,10 +219,10 @@ def assert_field_removed(
         field_key: Field key that should be removed
     """
     # Check CSV columns
-    assert field_key in before.csv_columns.get(entity, set()), (
+    assert field_key in before.csv_columns.get(entity, frozenset()), (
         f"Field '{field_key}' was not in CSV columns before"
     )
-    assert field_key not in after.csv_columns.get(entity, set()), (
+    assert field_key not in after.csv_columns.get(entity, frozenset()), (
         f"Field '{field_key}' still in CSV columns after delete"
     )
 
@@ -208,10 +258,10 @@ def assert_field_added(
         field_key: Field key that should be added
     """
     # Check CSV columns
-    assert field_key not in before.csv_columns.get(entity, set()), (
+    assert field_key not in before.csv_columns.get(entity, frozenset()), (
         f"Field '{field_key}' already existed in CSV columns"
     )
-    assert field_key in after.csv_columns.get(entity, set()), (
+    assert field_key in after.csv_columns.get(entity, frozenset()), (
         f"Field '{field_key}' not in CSV columns after add"
     )
 
@@ -284,6 +334,20 @@ def assert_other_entities_unchanged(
         )
 
 
+def _require_csv_data(
+    before: DatapackageState,
+    after: DatapackageState,
+    entity: str,
+) -> None:
+    """Fail clearly instead of comparing no rows when a state lacks CSV rows."""
+    for state in (before, after):
+        assert (
+            entity in state.csv_data
+            or entity in state._csv_contents
+            or entity not in state.csv_row_counts
+        ), f"CSV rows for {entity} not available in captured state"
+
+
 def assert_csv_values_changed(
     before: DatapackageState,
     after: DatapackageState,
@@ -303,15 +367,19 @@ def assert_csv_values_changed(
     Returns:
         Number of rows where the value changed
     """
-    before_data = before.csv_data.get(entity, [])
-    after_data = after.csv_data.get(entity, [])
+    _require_csv_data(before, after, entity)
+    before_data = before.csv_data_for(entity)
+    after_data = after.csv_data_for(entity)
 
     assert len(before_data) == len(after_data), "Row count changed unexpectedly"
 
-    changes = 0
-    for before_row, after_row in zip(before_data, after_data):
-        if before_row.get(field_key) != after_row.get(field_key):
-            changes += 1
+    changes = sum(
+        map(
+            operator.ne,
+            [row.get(field_key) for row in before_data],
+            [row.get(field_key) for row in after_data],
+        )
+    )
 
     assert changes > 0, f"No values changed for field '{field_key}'"
 
@@ -337,8 +405,9 @@ def assert_csv_values_unchanged(
         entity: Entity name
         field_key: Field key to check
     """
-    before_data = before.csv_data.get(entity, [])
-    after_data = after.csv_data.get(entity, [])
+    _require_csv_data(before, after, entity)
+    before_data = before.csv_data_for(entity)
+    after_data = after.csv_data_for(entity)
 
     for i, (before_row, after_row) in enumerate(zip(before_data, after_data)):
         assert before_row.get(field_key) == after_row.get(field_key), (
@@ -363,8 +432,7 @@ def get_pipedrive_field_metadata(
         Field metadata dict or None if not found
     """
     datapackage_path = base_path / "datapackage.json"
-    with open(datapackage_path, encoding="utf-8") as f:
-        pkg = json.load(f)
+    pkg = json_loads(datapackage_path.read_bytes())
 
     for resource in pkg.get("resources", []):
         if resource["name"] == entity:
@@ -210,7 +210,7 @@ class TestFieldCopyIntegrity:
 
     def test_copy_preserves_source_field(self, test_datapackage: Path):
         """field copy does not modify the source field."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
         source_values = [row.get("email") for row in before.csv_data["persons"]]
 
         runner = CliRunner()
@@ -225,13 +225,13 @@ class TestFieldCopyIntegrity:
             ],
         )
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
         after_values = [row.get("email") for row in after.csv_data["persons"]]
         assert source_values == after_values
 
     def test_copy_copies_values(self, test_datapackage: Path):
         """field copy copies values from source to target."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
         source_values = [row.get("email") for row in before.csv_data["persons"]]
 
         runner = CliRunner()
@@ -246,7 +246,7 @@ class TestFieldCopyIntegrity:
             ],
         )
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # Find new field key
         new_keys = set(after.csv_columns["persons"]) - set(before.csv_columns["persons"])
@@ -348,7 +348,7 @@ class TestFieldRenameIntegrity:
 
     def test_rename_preserves_csv(self, test_datapackage: Path):
         """field rename does not modify CSV content."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
 
         runner = CliRunner()
         runner.invoke(
@@ -362,7 +362,7 @@ class TestFieldRenameIntegrity:
             ],
         )
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # CSV should be identical
         assert before.csv_columns == after.csv_columns
@@ -64,17 +64,25 @@ class TestCaptureState:
         state = capture_state(tmp_path)
 
         assert "persons" in state.csv_checksums
-        assert len(state.csv_checksums["persons"]) == 32  # MD5 hex length
+        assert len(state.csv_checksums["persons"]) == 64  # SHA-256 hex length
 
     def test_captures_csv_data(self, tmp_path: Path):
         """capture_state loads CSV data."""
         create_test_datapackage(tmp_path, entities=["persons"])
-        state = capture_state(tmp_path)
+        state = capture_state(tmp_path, load_data=True)
 
         assert "persons" in state.csv_data
         assert len(state.csv_data["persons"]) == 3
         assert state.csv_data["persons"][0]["name"] == "Alice Smith"
 
+    def test_csv_data_not_loaded_by_default(self, tmp_path: Path):
+        """capture_state skips CSV rows unless load_data is set."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        state = capture_state(tmp_path)
+
+        assert state.csv_data == {}
+        assert state.csv_row_counts["persons"] == 3
+
     def test_handles_nonexistent_path(self, tmp_path: Path):
         """capture_state handles nonexistent datapackage."""
         state = capture_state(tmp_path / "nonexistent")
@@ -93,6 +101,35 @@ class TestCaptureState:
         assert "organizations" in state.csv_columns
         assert "deals" in state.csv_columns
 
+    def test_recapture_sees_same_size_change(self, tmp_path: Path):
+        """A repeated capture reflects edits even when file size is unchanged."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        before = capture_state(tmp_path, load_data=True)
+
+        csv_path = tmp_path / "persons.csv"
+        csv_path.write_text(csv_path.read_text().replace("Alice", "Alica"))
+        after = capture_state(tmp_path, load_data=True)
+
+        assert before != after
+        assert after.csv_data["persons"][0]["name"] == "Alica Smith"
+
+    def test_recaptured_states_do_not_share_rows(self, tmp_path: Path):
+        """Mutating one captured state does not affect later captures."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        first = capture_state(tmp_path, load_data=True)
+        first.csv_data["persons"][0]["name"] = "changed"
+
+        second = capture_state(tmp_path, load_data=True)
+        assert second.csv_data["persons"][0]["name"] == "Alice Smith"
+
+    def test_csv_columns_are_frozensets(self, tmp_path: Path):
+        """Captured column sets are immutable, so they can be shared between states."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        state = capture_state(tmp_path)
+
+        assert isinstance(state.csv_columns["persons"], frozenset)
+        assert state.csv_columns["persons"] == capture_state(tmp_path).csv_columns["persons"]
+
 
 class TestDatapackageStateEquality:
     """Tests for DatapackageState equality."""
@@ -288,7 +325,7 @@ class TestAssertCsvValuesChanged:
     def test_detects_value_changes(self, tmp_path: Path):
         """Detects when values have changed."""
         create_test_datapackage(tmp_path, entities=["persons"])
-        before = capture_state(tmp_path)
+        before = capture_state(tmp_path, load_data=True)
 
         # Modify CSV data
         after = DatapackageState()
@@ -306,8 +343,8 @@ class TestAssertCsvValuesChanged:
     def test_fails_when_no_changes(self, tmp_path: Path):
         """Fails when values are unchanged."""
         create_test_datapackage(tmp_path, entities=["persons"])
-        before = capture_state(tmp_path)
-        after = capture_state(tmp_path)
+        before = capture_state(tmp_path, load_data=True)
+        after = capture_state(tmp_path, load_data=True)
 
         with pytest.raises(AssertionError, match="No values changed"):
             assert_csv_values_changed(before, after, "persons", "name")
@@ -319,8 +356,8 @@ class TestAssertCsvValuesUnchanged:
     def test_passes_when_unchanged(self, tmp_path: Path):
         """Passes when values are unchanged."""
         create_test_datapackage(tmp_path, entities=["persons"])
-        before = capture_state(tmp_path)
-        after = capture_state(tmp_path)
+        before = capture_state(tmp_path, load_data=True)
+        after = capture_state(tmp_path, load_data=True)
 
         # Should not raise
         assert_csv_values_unchanged(before, after, "persons", "name")
@@ -328,7 +365,7 @@ class TestAssertCsvValuesUnchanged:
     def test_fails_when_changed(self, tmp_path: Path):
         """Fails when values have changed."""
         create_test_datapackage(tmp_path, entities=["persons"])
-        before = capture_state(tmp_path)
+        before = capture_state(tmp_path, load_data=True)
 
         after = DatapackageState()
         after.csv_data = {
@@ -341,6 +378,31 @@ class TestAssertCsvValuesUnchanged:
         with pytest.raises(AssertionError, match="Value changed"):
             assert_csv_values_unchanged(before, after, "persons", "name")
 
+    def test_loads_rows_on_demand(self, tmp_path: Path):
+        """Rows come from the captured content, not the file at assertion time."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        before = capture_state(tmp_path)
+
+        csv_path = tmp_path / "persons.csv"
+        csv_path.write_text(csv_path.read_text().replace("Alice", "Alica"))
+        after = capture_state(tmp_path)
+
+        assert before.csv_data == {}
+        with pytest.raises(AssertionError, match="Value changed"):
+            assert_csv_values_unchanged(before, after, "persons", "name")
+        assert before.csv_data_for("persons")[0]["name"] == "Alice Smith"
+
+    def test_fails_without_rows(self, tmp_path: Path):
+        """Fails instead of passing vacuously when a state has no rows."""
+        create_test_datapackage(tmp_path, entities=["persons"])
+        before = capture_state(tmp_path)
+
+        after = DatapackageState()
+        after.csv_row_counts = dict(before.csv_row_counts)
+
+        with pytest.raises(AssertionError, match="not available"):
+            assert_csv_values_unchanged(before, after, "persons", "name")
+
 
 class TestGetPipedriveFieldMetadata:
     """Tests for get_pipedrive_field_metadata function."""
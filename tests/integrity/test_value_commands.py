@@ -19,7 +19,7 @@ class TestValueUpdateIntegrity:
 
     def test_update_changes_csv_values(self, test_datapackage: Path):
         """value update modifies CSV values according to expression."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
 
         runner = CliRunner()
         result = runner.invoke(
@@ -33,7 +33,7 @@ class TestValueUpdateIntegrity:
         )
         assert result.exit_code == 0
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # Values should have changed
         assert_csv_values_changed(before, after, "persons", "name")
@@ -101,7 +101,7 @@ class TestValueUpdateIntegrity:
 
     def test_update_preserves_other_fields(self, test_datapackage: Path):
         """value update does not modify unrelated fields."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
 
         runner = CliRunner()
         runner.invoke(
@@ -114,7 +114,7 @@ class TestValueUpdateIntegrity:
             ],
         )
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # Other fields should be unchanged
         assert_csv_values_unchanged(before, after, "persons", "email")
@@ -124,7 +124,7 @@ class TestValueUpdateIntegrity:
         self, test_datapackage: Path
     ):
         """value update with filter only modifies matching rows."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
 
         # Find rows with non-empty phone
         rows_with_phone = [
@@ -145,7 +145,7 @@ class TestValueUpdateIntegrity:
         )
         assert result.exit_code == 0
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # Only rows with phone should be modified
         for i, (before_row, after_row) in enumerate(
@@ -180,7 +180,7 @@ class TestValueUpdateIntegrity:
 
     def test_update_multiple_assignments(self, test_datapackage: Path):
         """value update with multiple -s options updates all fields."""
-        before = capture_state(test_datapackage)
+        before = capture_state(test_datapackage, load_data=True)
 
         runner = CliRunner()
         result = runner.invoke(
@@ -195,7 +195,7 @@ class TestValueUpdateIntegrity:
         )
         assert result.exit_code == 0
 
-        after = capture_state(test_datapackage)
+        after = capture_state(test_datapackage, load_data=True)
 
         # Both fields should be changed
         assert_csv_values_changed(before, after, "persons", "name")
@@ -138,6 +138,20 @@ class TestPipedriveClient:
         assert records[0]["name"] == "John Doe"
         assert records[1]["name"] == "Jane Doe"
 
+    async def test_fetch_all_ids_uses_max_page_size(
+        self, mock_api, fake_api_token, sample_person
+    ):
+        """fetch_all_ids requests the largest page size the entity allows."""
+        route = mock_api.get("/v1/persons").mock(
+            return_value=make_paginated_response([sample_person], more_items=False)
+        )
+
+        async with PipedriveClient(fake_api_token) as client:
+            ids = await client.fetch_all_ids(ENTITIES["persons"])
+
+        assert ids == {1}
+        assert route.calls.last.request.url.params["limit"] == "500"
+
     async def test_exists_true(self, mock_api, fake_api_token, sample_person):
         """exists returns True when record exists."""
         mock_api.get("/v1/persons/1").mock(
@@ -9,13 +9,16 @@ from pipedrive_cli.base import (
     FRICTIONLESS_TYPE_COERCERS,
     add_schema_field,
     coerce_value,
+    count_records,
     diff_field_metadata,
     generate_local_field_key,
     get_csv_columns,
     get_entity_fields,
     get_schema_field_types,
     is_local_field,
+    iter_records,
     load_package,
+    load_record_ids,
     load_records,
     merge_field_metadata,
     remove_field_from_records,
@@ -628,6 +631,33 @@ class TestCoerceValue:
         """Datetime is kept as ISO string."""
         assert coerce_value("2024-01-15T10:30:00", "datetime") == "2024-01-15T10:30:00"
 
+    def test_repeated_values_same_result(self):
+        """Repeated numeric values (memoized) coerce like the first time."""
+        for _ in range(2):
+            assert coerce_value("7", "integer") == 7
+            assert coerce_value("7", "number") == 7.0
+            assert isinstance(coerce_value("7", "number"), float)
+            assert coerce_value("x7", "integer") == "x7"
+            assert coerce_value("1", "boolean") is True
+
+    def test_non_numeric_strings_kept(self):
+        """Strings without digits are returned unchanged for numeric types."""
+        assert coerce_value("n/a", "integer") == "n/a"
+        assert coerce_value("unknown", "number") == "unknown"
+        assert coerce_value("-", "number") == "-"
+
+    def test_float_special_values(self):
+        """inf/nan spellings still coerce for number, not for integer."""
+        assert coerce_value("inf", "number") == float("inf")
+        assert coerce_value(" -Infinity ", "number") == float("-inf")
+        assert coerce_value("inf", "integer") == "inf"
+
+    def test_array_values_not_shared(self):
+        """Array/object values are parsed fresh, never shared between records."""
+        first = coerce_value("[1]", "array")
+        assert coerce_value("[1]", "array") == first
+        assert coerce_value("[1]", "array") is not first
+
 
 class TestGetSchemaFieldTypes:
     """Tests for get_schema_field_types function."""
@@ -793,6 +823,64 @@ class TestLoadRecordsTypeCoercion:
         assert len(high_value) == 1
         assert high_value[0]["id"] == 1
 
+    def test_iter_records_matches_load_records(self, typed_datapackage):
+        """iter_records yields the same coerced records lazily."""
+        records = iter_records(typed_datapackage, "deals")
+        assert next(records) == load_records(typed_datapackage, "deals")[0]
+        assert list(records) == load_records(typed_datapackage, "deals")[1:]
+
+
+class TestLoadRecordIds:
+    """Tests for collecting record IDs from the id column only."""
+
+    def test_ids_match_loaded_records(self, tmp_path):
+        """IDs are coerced by schema type, like load_records; empty IDs are skipped."""
+        datapackage = {
+            "name": "test-package",
+            "resources": [{
+                "name": "deals",
+                "path": "deals.csv",
+                "schema": {"fields": [
+                    {"name": "title", "type": "string"},
+                    {"name": "id", "type": "integer"},
+                ]},
+            }],
+        }
+        (tmp_path / "datapackage.json").write_text(json.dumps(datapackage))
+        (tmp_path / "deals.csv").write_text("title,id\nA,1\nB,\n\nC,3\n")
+
+        assert load_record_ids(tmp_path, "deals") == {1, 3}
+        assert load_record_ids(tmp_path, "deals") == {
+            r["id"] for r in load_records(tmp_path, "deals") if r["id"] is not None
+        }
+
+    def test_max_records(self, tmp_path):
+        """Only the first max_records rows are considered."""
+        (tmp_path / "deals.csv").write_text("id\n1\n2\n3\n")
+        assert load_record_ids(tmp_path, "deals", max_records=2) == {"1", "2"}
+
+    def test_missing_csv_or_id_column(self, tmp_path):
+        """Missing CSV or id column yields no IDs."""
+        assert load_record_ids(tmp_path, "deals") == set()
+        (tmp_path / "deals.csv").write_text("title\nA\n")
+        assert load_record_ids(tmp_path, "deals") == set()
+
+
+class TestCountRecords:
+    """Tests for counting CSV records without loading them."""
+
+    def test_counts_data_rows(self, tmp_path):
+        """Header and blank lines are not counted; multi-line values count once."""
+        (tmp_path / "deals.csv").write_text(
+            'id,title\n1,"line one\nline two"\n\n2,Other\n', encoding="utf-8"
+        )
+        assert count_records(tmp_path, "deals") == 2
+        assert count_records(tmp_path, "deals") == len(load_records(tmp_path, "deals"))
+
+    def test_missing_csv(self, tmp_path):
+        """Missing CSV counts as zero records."""
+        assert count_records(tmp_path, "deals") == 0
+
 
 class TestFrictionlessTypeCoercers:
     """Tests for FRICTIONLESS_TYPE_COERCERS mapping."""
@@ -5,6 +5,7 @@ import pytest
 from pipedrive_cli.matching import (
     AmbiguousMatchError,
     NoMatchError,
+    build_field_index,
     find_field_by_key,
     find_field_matches,
     match_entities,
@@ -328,6 +329,85 @@ class TestFindFieldMatches:
         assert matches == []
 
 
+class TestBuildFieldIndex:
+    """Tests for matching against a prebuilt field index."""
+
+    @pytest.fixture
+    def fields(self) -> list[dict]:
+        return [
+            {"key": "zeta", "name": "Tel s"},
+            {"key": "tel_pro", "name": "Phone"},
+            {"key": "alpha", "name": "Tel Home"},
+            {"key": "tel_home", "name": "Home"},
+            {"key": "tel_home", "name": "Duplicate key"},
+        ]
+
+    @pytest.mark.parametrize(
+        "identifier", ["tel", "tel_home", "TEL_P", "tel_s", "tel ", "Home", "x", "_2"]
+    )
+    def test_same_as_linear_scan(self, fields, identifier):
+        """Indexed and unindexed matching agree, including result order."""
+        index = build_field_index(fields)
+        assert find_field_matches(fields, identifier, index) == find_field_matches(
+            fields, identifier
+        )
+
+    def test_matches_memoized_per_index(self, fields, monkeypatch):
+        """Repeated identifiers reuse the index's earlier result."""
+        index = build_field_index(fields)
+        first = find_field_matches(fields, "tel", index)
+        monkeypatch.setattr(index, "key_prefix", None)  # any new lookup would fail
+        assert find_field_matches(fields, "tel", index) == first
+        assert find_field_matches(fields, "tel", index) is not first
+
+    def test_get_by_key(self, fields):
+        """get() returns the first field with the exact key."""
+        index = build_field_index(fields)
+        assert index.get("tel_home") is fields[3]
+        assert index.get("tel") is None
+
+    def test_prefix_run_bounds(self):
+        """Prefix runs end before the next character, including at the end."""
+        fields = [
+            {"key": "ab", "name": "x"},
+            {"key": "abz", "name": "y"},
+            {"key": "ac", "name": "z"},
+            {"key": "ab\U0010ffff", "name": "w"},
+        ]
+        index = build_field_index(fields)
+        assert sorted(index.key_prefix("ab")) == [0, 1, 3]
+        assert index.key_prefix("ab\U0010ffff") == [3]
+        assert index.key_prefix("ad") == []
+
+    def test_prefix_matches_in_field_order(self, fields):
+        """Prefix matches keep the original field order, not sorted order."""
+        matches = find_field_matches(fields, "tel", build_field_index(fields))
+        assert [f["key"] for f in matches] == ["tel_pro", "tel_home", "tel_home"]
+
+    def test_first_exact_key_wins(self, fields):
+        """Exact key match returns the first field with that key."""
+        matches = find_field_matches(fields, "tel_home", build_field_index(fields))
+        assert matches == [fields[3]]
+
+    def test_normalized_name_prefix(self):
+        """Underscored identifiers match names with spaces or underscores."""
+        fields = [
+            {"key": "c", "name": "Tel_x"},
+            {"key": "a", "name": "Tel s"},
+            {"key": "b", "name": "Tel Home"},
+        ]
+        matches = find_field_matches(fields, "Tel_", build_field_index(fields))
+        assert [f["key"] for f in matches] == ["c", "a", "b"]
+
+    def test_name_equals(self, fields):
+        """All fields with a given lowercase name are found, in field order."""
+        fields = fields + [{"key": "other", "name": "home"}]
+        index = build_field_index(fields)
+        assert index.name_equals("home") == [3, 5]
+        assert index.name_equals("tel s") == [0]
+        assert index.name_equals("tel") == []
+
+
 class TestMatchFieldWithDigitKeys:
     """Tests for match_field() with digit-starting keys."""
 
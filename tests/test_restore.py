@@ -1,5 +1,6 @@
 """Tests for restore functionality."""
 
+import asyncio
 import io
 import json
 import tempfile
@@ -9,17 +10,27 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from pipedrive_cli.api import PipedriveClient
-from pipedrive_cli.config import ENTITIES
+from pipedrive_cli.config import ENTITIES, RESTORE_DEPENDENCIES, RESTORE_ORDER
 from pipedrive_cli.restore import (
+    _extract_backup_fields,
+    account_fingerprint,
     clean_record,
     convert_record_for_api,
     extract_reference_id,
+    get_reference_fields,
+    get_restore_layers,
     load_id_mappings,
+    load_record_hashes,
     normalize_value_for_comparison,
+    prepare_record_for_api,
+    record_hash,
     records_equal,
     remap_reference_fields,
     restore_backup,
+    restore_entity,
+    save_id_mapping_entries,
     save_id_mapping_entry,
+    save_record_hashes,
     save_records_to_csv,
     sync_fields,
     update_local_ids,
@@ -55,6 +66,77 @@ def _load_csv_for_test(csv_path: Path) -> list[dict]:
     return records
 
 
+def _write_backup(
+    tmp_path: Path,
+    entity: str,
+    rows: list[dict],
+    pipedrive_fields: list[dict] | None = None,
+) -> Path:
+    """Write an entity CSV and its resource into the backup at tmp_path / "backup".
+
+    Columns holding int values get an integer schema type, others string.
+    Calling it again for the same entity replaces that entity's CSV and resource.
+
+    Returns:
+        Path to the backup directory
+    """
+    import csv as csv_module
+
+    backup_dir = tmp_path / "backup"
+    backup_dir.mkdir(exist_ok=True)
+    package_path = backup_dir / "datapackage.json"
+    package = (
+        json.loads(package_path.read_text())
+        if package_path.exists()
+        else {"name": "test-backup", "resources": []}
+    )
+
+    columns = list(rows[0])
+    package["resources"] = [r for r in package["resources"] if r["name"] != entity]
+    package["resources"].append({
+        "name": entity,
+        "path": f"{entity}.csv",
+        "schema": {
+            "fields": [
+                {
+                    "name": column,
+                    "type": "integer"
+                    if any(isinstance(row.get(column), int) for row in rows)
+                    else "string",
+                }
+                for column in columns
+            ],
+            "pipedrive_fields": pipedrive_fields
+            if pipedrive_fields is not None
+            else [{"key": "name", "name": "Name", "field_type": "varchar"}],
+        },
+    })
+    package_path.write_text(json.dumps(package))
+
+    with open(backup_dir / f"{entity}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv_module.DictWriter(f, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return backup_dir
+
+
+@pytest.fixture
+def restore_client():
+    """Patch PipedriveClient in restore and return the client restore_backup gets.
+
+    Defaults: no existing records, no remote fields, no remote IDs.
+    """
+    with patch("pipedrive_cli.restore.PipedriveClient") as mock_client_cls:
+        client = AsyncMock()
+        client.exists = AsyncMock(return_value=False)
+        client.fetch_fields = AsyncMock(return_value=[])
+        client.fetch_all_ids = AsyncMock(return_value=set())
+        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=client)
+        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        yield client
+
+
 class TestCleanRecord:
     """Tests for clean_record function."""
 
@@ -143,6 +225,32 @@ class TestExtractReferenceId:
         assert result == 22713797
 
 
+class TestGetReferenceFields:
+    """Tests for get_reference_fields function."""
+
+    def test_maps_reference_keys_to_entities(self):
+        """Only reference fields are returned, mapped to their target entity."""
+        field_defs = [
+            {"key": "name", "field_type": "varchar"},
+            {"key": "org_id", "field_type": "org"},
+            {"key": "person_id", "field_type": "people"},
+            {"key": "owner_id", "field_type": "user"},
+        ]
+        assert get_reference_fields(field_defs) == {
+            "org_id": "organizations",
+            "person_id": "persons",
+            "owner_id": "users",
+        }
+
+    def test_last_definition_wins_for_duplicate_keys(self):
+        """Duplicate keys resolve like a key lookup (last definition wins)."""
+        field_defs = [
+            {"key": "org_id", "field_type": "org"},
+            {"key": "org_id", "field_type": "varchar"},
+        ]
+        assert get_reference_fields(field_defs) == {}
+
+
 class TestConvertRecordForApi:
     """Tests for convert_record_for_api function."""
 
@@ -319,6 +427,58 @@ class TestRemapReferenceFields:
         assert result["org_id"] == 11
 
 
+class TestPrepareRecordForApi:
+    """Tests for the single-pass clean/remap/convert of prepare_record_for_api."""
+
+    field_defs = [
+        {"key": "name", "field_type": "varchar"},
+        {"key": "org_id", "field_type": "org"},
+        {"key": "owner_id", "field_type": "user"},
+    ]
+
+    def test_matches_three_step_chain(self):
+        """Result equals clean_record -> remap_reference_fields -> convert_record_for_api."""
+        id_mappings = {"organizations": {11: 999}}
+
+        def make_record():
+            return {
+                "id": 1,
+                "name": "John",
+                "add_time": "2024-01-01",
+                "notes": None,
+                "org_id": {"value": 11, "name": "ACME"},
+                "owner_id": {"value": 5, "name": "Admin"},
+            }
+
+        expected = convert_record_for_api(
+            remap_reference_fields(clean_record(make_record()), self.field_defs, id_mappings),
+            self.field_defs,
+        )
+        ref_fields = get_reference_fields(self.field_defs)
+        assert prepare_record_for_api(make_record(), ref_fields, id_mappings) == expected
+        assert expected == {"name": "John", "org_id": 999, "owner_id": 5}
+
+    def test_does_not_mutate_reference_objects(self):
+        """Reference objects of the input record keep their local IDs."""
+        org = {"value": 11, "name": "ACME"}
+        record = {"name": "John", "org_id": org}
+        ref_fields = get_reference_fields(self.field_defs)
+
+        result = prepare_record_for_api(record, ref_fields, {"organizations": {11: 999}})
+
+        assert result["org_id"] == 999
+        assert org == {"value": 11, "name": "ACME"}
+
+    def test_unmapped_and_non_id_values_kept(self):
+        """Integer IDs without mapping and non-ID values are passed through."""
+        record = {"org_id": 12, "owner_id": "n/a"}
+        ref_fields = get_reference_fields(self.field_defs)
+
+        result = prepare_record_for_api(record, ref_fields, {"organizations": {11: 999}})
+
+        assert result == {"org_id": 12, "owner_id": "n/a"}
+
+
 class TestLoadIdMappings:
     """Tests for load_id_mappings function."""
 
@@ -370,6 +530,22 @@ class TestLoadIdMappings:
             assert result["organizations"][11] == 999
             assert result["persons"][1] == 50
 
+    def test_skips_blank_lines(self):
+        """load_id_mappings skips empty and whitespace-only lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backup_path = Path(tmpdir)
+            mapping_file = backup_path / "id_mapping.jsonl"
+
+            with open(mapping_file, "w") as f:
+                entry = {"entity": "persons", "local_id": 1, "pipedrive_id": 50}
+                f.write("\n")
+                f.write("  " + json.dumps(entry) + "  \n")
+                f.write("   \n")
+
+            result = load_id_mappings(backup_path)
+
+            assert result == {"persons": {1: 50}}
+
 
 class TestSaveIdMappingEntry:
     """Tests for save_id_mapping_entry function."""
@@ -390,6 +566,22 @@ class TestSaveIdMappingEntry:
         assert entry1["local_id"] == 11
         assert entry1["pipedrive_id"] == 999
 
+    def test_appends_batch_readable_by_load(self, tmp_path):
+        """save_id_mapping_entries writes entries that load_id_mappings reads back."""
+        with open(tmp_path / "id_mapping.jsonl", "w", encoding="utf-8") as f:
+            save_id_mapping_entries(f, "organizations", [(11, 999), (12, 1000)])
+            save_id_mapping_entries(f, "persons", [])
+
+        assert load_id_mappings(tmp_path) == {"organizations": {11: 999, 12: 1000}}
+
+    def test_single_and_batch_writers_match(self):
+        """Single and batched mapping writers produce identical lines."""
+        single, batch = io.StringIO(), io.StringIO()
+        save_id_mapping_entry(single, "organizations", 11, 999)
+        save_id_mapping_entries(batch, "organizations", [(11, 999)])
+
+        assert single.getvalue() == batch.getvalue()
+
 
 class TestSaveRecordsToCsv:
     """Tests for save_records_to_csv function."""
@@ -560,6 +752,121 @@ class TestUpdateLocalIds:
             assert loaded[0]["org_id"]["value"] == 999
             assert loaded[0]["org_id"]["name"] == "ACME"  # Preserved
 
+    def test_updates_multiple_entities(self):
+        """update_local_ids rewrites every entity with applicable mappings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backup_path = Path(tmpdir)
+
+            datapackage = {
+                "resources": [
+                    {
+                        "name": name,
+                        "path": f"{name}.csv",
+                        "schema": {
+                            "fields": [
+                                {"name": "id", "type": "integer"},
+                                {"name": "org_id", "type": "integer"},
+                            ]
+                        },
+                    }
+                    for name in ("organizations", "persons", "deals")
+                ]
+            }
+            (backup_path / "datapackage.json").write_text(json.dumps(datapackage))
+
+            save_records_to_csv(backup_path / "organizations.csv", [{"id": 11, "org_id": None}])
+            save_records_to_csv(backup_path / "persons.csv", [{"id": 1, "org_id": 11}])
+            # Deals reference nothing that was mapped: file must be left alone
+            deals_csv = backup_path / "deals.csv"
+            deals_csv.write_text("id,org_id\n7,\n", encoding="utf-8")
+
+            id_mappings = {"organizations": {11: 999}, "persons": {1: 50}}
+            field_defs_by_entity = {
+                "organizations": [],
+                "persons": [{"key": "org_id", "field_type": "org"}],
+                "deals": [],
+            }
+
+            update_local_ids(backup_path, id_mappings, field_defs_by_entity)
+
+            orgs = _load_csv_for_test(backup_path / "organizations.csv")
+            persons = _load_csv_for_test(backup_path / "persons.csv")
+            assert orgs[0]["id"] == 999
+            assert persons[0]["id"] == 50
+            assert persons[0]["org_id"] == 999
+            assert deals_csv.read_text(encoding="utf-8") == "id,org_id\n7,\n"
+
+    def test_untouched_cells_written_verbatim(self):
+        """update_local_ids keeps the original text of cells it does not modify."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backup_path = Path(tmpdir)
+            csv_path = backup_path / "persons.csv"
+
+            datapackage = {
+                "resources": [{
+                    "name": "persons",
+                    "path": "persons.csv",
+                    "schema": {
+                        "fields": [
+                            {"name": "id", "type": "integer"},
+                            {"name": "email", "type": "array"},
+                            {"name": "org_id", "type": "object"},
+                        ]
+                    }
+                }]
+            }
+            (backup_path / "datapackage.json").write_text(json.dumps(datapackage))
+
+            # Non-ASCII JSON as written by base.save_records (ensure_ascii=False)
+            email = '[{"value": "rené@example.com", "primary": true}]'
+            org = '{"value": 11, "name": "Société"}'
+            csv_path.write_text(
+                "id,email,org_id\n"
+                f'1,"{email.replace(chr(34), chr(34) * 2)}",'
+                f'"{org.replace(chr(34), chr(34) * 2)}"\n',
+                encoding="utf-8",
+            )
+
+            id_mappings = {"organizations": {11: 999}}
+            field_defs_by_entity = {
+                "persons": [{"key": "org_id", "field_type": "org"}]
+            }
+
+            update_local_ids(backup_path, id_mappings, field_defs_by_entity)
+
+            content = csv_path.read_text(encoding="utf-8")
+            assert "rené@example.com" in content  # Untouched cell kept as-is
+            loaded = _load_csv_for_test(csv_path)
+            assert loaded[0]["id"] == 1
+            assert loaded[0]["org_id"]["value"] == 999
+
+
+class TestRestoreEntity:
+    """Tests for restore_entity function."""
+
+    @pytest.mark.asyncio
+    async def test_skips_records_without_id_or_writable_data(self):
+        """Records without ID or with only read-only fields are skipped."""
+        records = [
+            {"id": 1, "name": "ACME"},
+            {"name": "No ID"},
+            {"id": 2, "add_time": "2024-01-01", "name": None},
+            {"id": 3, "name": "Beta"},
+        ]
+        mock_client = MagicMock()
+        mock_client.exists = AsyncMock(side_effect=[True, False])
+        progress = MagicMock()
+
+        stats = await restore_entity(
+            mock_client, "organizations", records, dry_run=True, progress_callback=progress
+        )
+
+        assert stats.updated == 1
+        assert stats.created == 1
+        assert stats.skipped == 2
+        assert mock_client.exists.await_count == 2
+        progress.assert_called_with(2, 2)
+
 
 class TestSyncFields:
     """Tests for sync_fields function."""
@@ -841,6 +1148,22 @@ class TestRecordsEqual:
         ]
         assert records_equal(local, remote, field_defs) is True
 
+    def test_equal_values_of_different_types_are_normalized(self):
+        """Equal-comparing values of different types still go through normalization."""
+        field_defs = [{"key": "flag", "field_type": "varchar"}]
+        # 1 == True in Python, but normalization compares "1" with True
+        assert records_equal({"flag": 1}, {"flag": True}, field_defs) is False
+        assert records_equal({"flag": True}, {"flag": True}, field_defs) is True
+
+    def test_precomputed_field_lookup(self):
+        """A precomputed field_by_key is used for field types."""
+        field_defs = [{"key": "org_id", "field_type": "org"}]
+        field_by_key = {f["key"]: f for f in field_defs}
+        local = {"org_id": 123}
+        remote = {"org_id": {"value": 123, "name": "ACME"}}
+        assert records_equal(local, remote, field_defs, field_by_key) is True
+        assert records_equal(local, {"org_id": 124}, field_defs, field_by_key) is False
+
     def test_different_simple_records(self):
         """Records with different values should not be equal."""
         local = {"name": "John"}
@@ -1254,3 +1577,452 @@ class TestRestoreAPIPayload:
         record_id = update_call[1]
         assert isinstance(record_id, int)
         assert record_id == 42
+
+
+class TestRestoreConcurrency:
+    """Tests for concurrent record sending in restore_backup."""
+
+    @pytest.mark.asyncio
+    async def test_mappings_and_log_follow_record_order(self, tmp_path, restore_client):
+        """Out-of-order API completions still commit mappings and logs in CSV order."""
+        backup_dir = _write_backup(
+            tmp_path,
+            "persons",
+            [{"id": i, "name": f"P{i}"} for i in range(1, 26)],
+            [
+                {"key": "id", "name": "ID", "field_type": "int"},
+                {"key": "name", "name": "Name", "field_type": "varchar"},
+            ],
+        )
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_create(entity, data):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            index = int(data["name"][1:])
+            # Later records finish first within each window
+            await asyncio.sleep((30 - index) / 10000)
+            in_flight -= 1
+            return {"id": 1000 + index}
+
+        restore_client.create = AsyncMock(side_effect=fake_create)
+
+        log = io.StringIO()
+        report = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["persons"],
+            update_base=False,
+            log_file=log,
+            concurrency=4,
+        )
+
+        assert 1 < max_in_flight <= 4
+        assert report.record_stats["persons"].created == 25
+        assert list(report.id_mappings["persons"].items()) == [
+            (i, 1000 + i) for i in range(1, 26)
+        ]
+        logged_ids = [json.loads(line)["id"] for line in log.getvalue().splitlines()]
+        assert logged_ids == list(range(1, 26))
+        mapping_lines = (backup_dir / "id_mapping.jsonl").read_text().splitlines()
+        assert [json.loads(line)["local_id"] for line in mapping_lines] == list(range(1, 26))
+
+    @pytest.mark.asyncio
+    async def test_self_reference_waits_for_target(self, tmp_path, restore_client):
+        """A record pointing to one created earlier in its window gets the new ID."""
+        backup_dir = _write_backup(
+            tmp_path,
+            "organizations",
+            [
+                {"id": 1, "name": "Parent", "parent_org": None},
+                {"id": 2, "name": "Child", "parent_org": 1},
+                {"id": 3, "name": "Grandchild", "parent_org": 2},
+                {"id": 4, "name": "Other", "parent_org": None},
+            ],
+            [
+                {"key": "name", "name": "Name", "field_type": "varchar"},
+                {"key": "parent_org", "name": "Parent", "field_type": "org"},
+            ],
+        )
+        restore_client.create = AsyncMock(
+            side_effect=lambda entity, data: {"id": 100 + len(restore_client.create.mock_calls)}
+        )
+
+        report = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            update_base=False,
+            concurrency=4,
+        )
+
+        payloads = {
+            call.args[1]["name"]: call.args[1] for call in restore_client.create.await_args_list
+        }
+        mappings = report.id_mappings["organizations"]
+        assert payloads["Child"]["parent_org"] == mappings[1]
+        assert payloads["Grandchild"]["parent_org"] == mappings[2]
+        assert report.record_stats["organizations"].created == 4
+
+    @pytest.mark.asyncio
+    async def test_progress_throttled_by_time(self, tmp_path, restore_client):
+        """Record progress is reported at most once per interval, plus the final 100%."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": i, "name": f"Org{i}"} for i in range(1, 26)]
+        )
+        messages: list[str] = []
+
+        with patch("pipedrive_cli.restore.PROGRESS_INTERVAL", 3600):
+            await restore_backup(
+                api_token="fake-token",
+                backup_path=backup_dir,
+                entities=["organizations"],
+                dry_run=True,
+                progress_callback=messages.append,
+                concurrency=4,
+            )
+
+        assert [m for m in messages if "Records:" in m] == [
+            "  organizations: Records: 25/25 (100%)"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_uses_prefetched_ids(self, tmp_path, restore_client):
+        """Dry-run classifies records with the background-fetched ID set."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": 1, "name": "ACME"}, {"id": 2, "name": "Beta"}]
+        )
+        restore_client.fetch_all_ids = AsyncMock(return_value={1})
+
+        report = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            dry_run=True,
+        )
+
+        restore_client.fetch_all_ids.assert_awaited_once()
+        restore_client.exists.assert_not_called()
+        assert report.record_stats["organizations"].updated == 1
+        assert report.record_stats["organizations"].created == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_extra_records_uses_backup_ids(self, tmp_path, restore_client):
+        """Only Pipedrive records missing from the backup CSV are marked for deletion."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": 1, "name": "ACME"}, {"id": 2, "name": "Beta"}]
+        )
+        restore_client.fetch_all_ids = AsyncMock(return_value={1, 2, 7})
+
+        log = io.StringIO()
+        await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            dry_run=True,
+            delete_extra_records=True,
+            log_file=log,
+        )
+
+        deletions = [
+            entry["record_id"]
+            for entry in map(json.loads, log.getvalue().splitlines())
+            if entry["action"] == "would_delete_record"
+        ]
+        assert deletions == [7]
+
+    @pytest.mark.asyncio
+    async def test_log_flushed_once_per_window(self, tmp_path, restore_client):
+        """Log lines are written in one batch per concurrency window."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": i, "name": f"Org{i}"} for i in range(1, 11)]
+        )
+        log = MagicMock(wraps=io.StringIO())
+
+        await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            dry_run=True,
+            log_file=log,
+            concurrency=4,
+        )
+
+        # 10 records in windows of 4 -> 3 batched writes
+        assert log.writelines.call_count == 3
+        assert log.flush.call_count == 3
+        assert len(log.getvalue().splitlines()) == 10
+
+
+class TestRecordHashes:
+    """Tests for payload hashes used to skip unchanged records without a fetch."""
+
+    def test_hash_ignores_key_order(self):
+        """Hash depends on content, not on key order."""
+        assert record_hash({"a": 1, "b": [1, 2]}) == record_hash({"b": [1, 2], "a": 1})
+        assert record_hash({"a": 1}) != record_hash({"a": 2})
+
+    def test_load_missing_or_corrupt(self, tmp_path):
+        """Missing or unreadable hash file yields no hashes."""
+        account = account_fingerprint("fake-token")
+        assert load_record_hashes(tmp_path, account) == {}
+        (tmp_path / "store_hashes.json").write_text("{not json")
+        assert load_record_hashes(tmp_path, account) == {}
+        # Layout without per-account sections is not trusted
+        (tmp_path / "store_hashes.json").write_text('{"organizations": {"1": "ab"}}')
+        assert load_record_hashes(tmp_path, account) == {}
+
+    def test_hashes_kept_per_account(self, tmp_path):
+        """Saving for one account keeps the hashes of other accounts."""
+        first = account_fingerprint("token-a")
+        second = account_fingerprint("token-b")
+        assert first != second
+
+        save_record_hashes(tmp_path, first, {"organizations": {1: "aa"}})
+        save_record_hashes(tmp_path, second, {"organizations": {2: "bb"}})
+
+        assert load_record_hashes(tmp_path, first) == {"organizations": {1: "aa"}}
+        assert load_record_hashes(tmp_path, second) == {"organizations": {2: "bb"}}
+
+    @pytest.mark.asyncio
+    async def test_second_store_skips_without_fetch(self, tmp_path, restore_client):
+        """Records stored unchanged since the last run are skipped without get_record."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": 1, "name": "ACME"}, {"id": 2, "name": "Beta"}]
+        )
+        restore_client.exists = AsyncMock(return_value=True)
+        restore_client.get_record = AsyncMock(return_value={"id": 1, "name": "Old"})
+        restore_client.update = AsyncMock(return_value={})
+
+        first = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            skip_unchanged=True,
+        )
+        assert first.record_stats["organizations"].updated == 2
+        assert restore_client.get_record.await_count == 2
+
+        # Change one record locally; only that one is fetched again
+        _write_backup(
+            tmp_path, "organizations", [{"id": 1, "name": "ACME"}, {"id": 2, "name": "Gamma"}]
+        )
+        second = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations"],
+            skip_unchanged=True,
+        )
+
+        assert restore_client.get_record.await_count == 3
+        assert second.record_stats["organizations"].skipped == 1
+        assert second.record_stats["organizations"].updated == 1
+        hashes = load_record_hashes(backup_dir, account_fingerprint("fake-token"))
+        assert set(hashes["organizations"]) == {1, 2}
+
+    @pytest.mark.asyncio
+    async def test_other_token_does_not_reuse_hashes(self, tmp_path, restore_client):
+        """Hashes recorded for one account never skip records for another."""
+        backup_dir = _write_backup(tmp_path, "organizations", [{"id": 1, "name": "ACME"}])
+        restore_client.exists = AsyncMock(return_value=True)
+        restore_client.get_record = AsyncMock(return_value={"id": 1, "name": "Old"})
+        restore_client.update = AsyncMock(return_value={})
+
+        for token in ("token-a", "token-b"):
+            report = await restore_backup(
+                api_token=token,
+                backup_path=backup_dir,
+                entities=["organizations"],
+                skip_unchanged=True,
+            )
+            assert report.record_stats["organizations"].updated == 1
+
+        assert restore_client.get_record.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_hashes_without_skip_unchanged(self, tmp_path, restore_client):
+        """Hashes are neither computed nor written unless skip_unchanged is set."""
+        backup_dir = _write_backup(tmp_path, "organizations", [{"id": 1, "name": "ACME"}])
+        restore_client.create = AsyncMock(return_value={"id": 101})
+
+        with patch("pipedrive_cli.restore.record_hash") as hash_mock:
+            await restore_backup(
+                api_token="fake-token",
+                backup_path=backup_dir,
+                entities=["organizations"],
+            )
+
+        hash_mock.assert_not_called()
+        assert not (backup_dir / "store_hashes.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_hashes_and_mappings_saved_when_interrupted(self, tmp_path, restore_client):
+        """Records stored before an interruption keep their hashes and ID mappings."""
+        backup_dir = _write_backup(
+            tmp_path, "organizations", [{"id": i, "name": f"Org{i}"} for i in range(1, 16)]
+        )
+        restore_client.create = AsyncMock(
+            side_effect=lambda entity, data: {"id": 100 + int(data["name"][3:])}
+        )
+
+        def interrupt_at_progress(message):
+            if "Records: 10/" in message:
+                raise KeyboardInterrupt
+
+        with (
+            patch("pipedrive_cli.restore.PROGRESS_INTERVAL", 0),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            await restore_backup(
+                api_token="fake-token",
+                backup_path=backup_dir,
+                entities=["organizations"],
+                progress_callback=interrupt_at_progress,
+                skip_unchanged=True,
+                concurrency=5,
+            )
+
+        hashes = load_record_hashes(backup_dir, account_fingerprint("fake-token"))
+        assert set(hashes["organizations"]) == {
+            100 + i for i in range(1, 11)
+        }
+        # Progress is reported after each window's mappings are written
+        assert load_id_mappings(backup_dir)["organizations"] == {
+            i: 100 + i for i in range(1, 11)
+        }
+
+
+class TestExtractBackupFields:
+    """Tests for reading pipedrive_fields from a resource schema."""
+
+    def test_reads_custom(self):
+        """pipedrive_fields are read from schema.custom."""
+        resource = MagicMock()
+        resource.schema.custom = {"pipedrive_fields": [{"key": "name"}]}
+        assert _extract_backup_fields(resource) == [{"key": "name"}]
+        resource.schema.to_dict.assert_not_called()
+
+    def test_empty_custom_skips_to_dict(self):
+        """An empty custom dict means no fields, without re-serializing the schema."""
+        resource = MagicMock()
+        resource.schema.custom = {}
+        assert _extract_backup_fields(resource) == []
+        resource.schema.to_dict.assert_not_called()
+
+    def test_falls_back_to_to_dict(self):
+        """Schemas without a custom attribute are read via to_dict()."""
+        resource = MagicMock()
+        resource.schema = MagicMock(spec=["to_dict"])
+        resource.schema.to_dict.return_value = {"pipedrive_fields": [{"key": "id"}]}
+        assert _extract_backup_fields(resource) == [{"key": "id"}]
+
+    @pytest.mark.asyncio
+    async def test_extracted_once_per_entity(self, tmp_path, restore_client):
+        """restore_backup reads each schema once, including unrestored entities it remaps."""
+        _write_backup(tmp_path, "persons", [{"id": 1, "name": "Alice"}])
+        backup_dir = _write_backup(
+            tmp_path,
+            "files",
+            [{"id": 7, "person_id": 1}],
+            [{"key": "person_id", "name": "Person", "field_type": "people"}],
+        )
+        restore_client.create = AsyncMock(return_value={"id": 500})
+
+        with patch(
+            "pipedrive_cli.restore._extract_backup_fields",
+            wraps=_extract_backup_fields,
+        ) as mock_extract:
+            await restore_backup(
+                api_token="fake-token",
+                backup_path=backup_dir,
+                entities=["persons", "files"],
+            )
+
+        assert mock_extract.call_count == 2
+        assert (backup_dir / "files.csv").read_text().splitlines() == ["id,person_id", "7,500"]
+
+
+class TestGetRestoreLayers:
+    """Tests for grouping entities into concurrently restorable layers."""
+
+    def test_default_order(self):
+        """Independent entities share a layer; dependents follow their references."""
+        assert get_restore_layers(RESTORE_ORDER, RESTORE_DEPENDENCIES) == [
+            ["organizations", "products"],
+            ["persons"],
+            ["deals"],
+            ["activities", "notes"],
+        ]
+
+    def test_dependencies_outside_selection_ignored(self):
+        """Dependencies that are not restored don't add layers."""
+        assert get_restore_layers(["deals", "products"], RESTORE_DEPENDENCIES) == [
+            ["deals", "products"]
+        ]
+
+    def test_later_dependency_ignored(self):
+        """A dependency listed after the entity is ignored, as in a sequential restore."""
+        assert get_restore_layers(["persons", "organizations"], RESTORE_DEPENDENCIES) == [
+            ["persons", "organizations"]
+        ]
+
+
+class TestRestoreEntitiesConcurrently:
+    """Tests for restoring independent entities concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_independent_entities_overlap(self, tmp_path, restore_client):
+        """Organizations and products are stored at the same time, persons after both."""
+        for name in ("organizations", "persons", "products"):
+            backup_dir = _write_backup(tmp_path, name, [{"id": 1, "name": name}])
+
+        events: list[tuple[str, str]] = []
+
+        async def fake_create(entity, data):
+            events.append(("start", entity.name))
+            await asyncio.sleep(0.01)
+            events.append(("end", entity.name))
+            return {"id": 100}
+
+        restore_client.create = AsyncMock(side_effect=fake_create)
+
+        report = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            update_base=False,
+        )
+
+        assert events[:2] == [("start", "organizations"), ("start", "products")]
+        assert events[-2:] == [("start", "persons"), ("end", "persons")]
+        assert set(report.record_stats) == {"organizations", "persons", "products"}
+
+    @pytest.mark.asyncio
+    async def test_report_and_progress_follow_restore_order(self, tmp_path, restore_client):
+        """Stats keep restore order and progress names the entity when a layer interleaves."""
+        for name in ("organizations", "products"):
+            backup_dir = _write_backup(tmp_path, name, [{"id": 1, "name": name}])
+
+        async def fake_create(entity, data):
+            # Organizations finish last although they are restored first
+            await asyncio.sleep(0.02 if entity.name == "organizations" else 0)
+            return {"id": 100}
+
+        restore_client.create = AsyncMock(side_effect=fake_create)
+        messages: list[str] = []
+
+        report = await restore_backup(
+            api_token="fake-token",
+            backup_path=backup_dir,
+            entities=["organizations", "products"],
+            update_base=False,
+            progress_callback=messages.append,
+        )
+
+        assert list(report.record_stats) == ["organizations", "products"]
+        assert [m for m in messages if "Records:" in m] == [
+            "  products: Records: 1/1 (100%)",
+            "  organizations: Records: 1/1 (100%)",
+        ]
@@ -1,26 +1,44 @@
 """Tests for search module and search command."""
 
+import csv
+import io
 import json
+from collections import OrderedDict
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
+from rich.console import Console
+from simpleeval import EvalWithCompoundTypes
 
+from pipedrive_cli import expressions, search
 from pipedrive_cli.cli import main
-from pipedrive_cli.expressions import FILTER_FUNCTIONS, EnumValue, resolve_field_name
+from pipedrive_cli.expressions import (
+    FILTER_FUNCTIONS,
+    EnumValue,
+    referenced_option_lookup,
+    resolve_field_name,
+    wrap_enum_values,
+)
 from pipedrive_cli.matching import AmbiguousMatchError
 from pipedrive_cli.search import (
     FilterError,
+    compile_filter,
     extract_filter_keys,
     filter_record,
+    filter_records,
     format_csv,
     format_json,
+    format_resolved_expression,
+    format_table,
+    make_field_selector,
     preprocess_record_for_filter,
     resolve_field_identifier,
     resolve_field_prefixes,
     resolve_filter_expression,
     select_fields,
     validate_expression,
+    write_records_csv,
 )
 
 
@@ -142,6 +160,17 @@ class TestStringFunctions:
     def test_isfloat_scientific_notation(self):
         assert FILTER_FUNCTIONS["isfloat"]("1e10") is True
 
+    def test_isfloat_special_values(self):
+        # Digit-free spellings accepted by float() are still numeric
+        assert FILTER_FUNCTIONS["isfloat"]("inf") is True
+        assert FILTER_FUNCTIONS["isfloat"]("-NaN") is True
+        assert FILTER_FUNCTIONS["isfloat"]("e") is False
+
+    def test_isint_underscore_separator(self):
+        # Non-plain forms still go through int()
+        assert FILTER_FUNCTIONS["isint"]("1_000") is True
+        assert FILTER_FUNCTIONS["isint"]("1e3") is False
+
     # Tests for isnumeric function
     def test_isnumeric_integer(self):
         assert FILTER_FUNCTIONS["isnumeric"](42) is True
@@ -291,6 +320,49 @@ class TestResolveFilterExpression:
         assert result == expr
         assert resolutions == {}
 
+    def test_replacement_not_applied_inside_strings(self, sample_fields):
+        """Identifiers are replaced in one pass, leaving string literals alone."""
+        expr = "ag > 30 and first == 'ag first' and ag < 60"
+        result, _ = resolve_filter_expression(sample_fields, expr)
+        assert result == "age > 30 and first_name == 'ag first' and age < 60"
+
+    def test_exact_keys_skip_resolution(self, sample_fields, monkeypatch):
+        """Expressions using only exact keys and functions are not resolved."""
+        def fail(*args, **kwargs):
+            raise AssertionError("resolve_field_identifier should not be called")
+
+        monkeypatch.setattr(expressions, "resolve_field_identifier", fail)
+        expr = "age > 30 and contains(first_name, 'age') and not isnull(id)"
+        assert resolve_filter_expression(sample_fields, expr) == (expr, {})
+
+    def test_repeated_identifier_resolved_once(self, sample_fields, monkeypatch):
+        """Each distinct identifier is looked up once, matched or not."""
+        calls = []
+        original = expressions.resolve_field_identifier
+
+        def counting(fields, identifier, **kwargs):
+            calls.append(identifier)
+            return original(fields, identifier, **kwargs)
+
+        monkeypatch.setattr(expressions, "resolve_field_identifier", counting)
+        expr = "ag > 1 and zz == 2 and ag < 9 and zz != 3"
+        result, resolutions = resolve_filter_expression(sample_fields, expr)
+        assert result == "age > 1 and zz == 2 and age < 9 and zz != 3"
+        assert sorted(calls) == ["ag", "zz"]
+        assert resolutions["ag"][0] == "age"
+
+    def test_numeric_expression_unchanged(self, sample_fields):
+        """Expression without letters has nothing to resolve."""
+        result, resolutions = resolve_filter_expression(sample_fields, "1 + 2 > 2")
+        assert result == "1 + 2 > 2"
+        assert resolutions == {}
+
+    def test_unquoted_expression_resolved(self, sample_fields):
+        """Identifiers are resolved in expressions without string literals."""
+        result, resolutions = resolve_filter_expression(sample_fields, "ag > 30")
+        assert result == "age > 30"
+        assert resolutions == {"ag": ("age", "Age")}
+
     def test_resolve_key_prefix(self, sample_fields):
         """Key prefix in expression is resolved."""
         expr = "contains(first, 'John')"
@@ -492,6 +564,10 @@ class TestExtractFilterKeys:
         result = extract_filter_keys(sample_fields, "notnull(name)")
         assert result == ["name"]
 
+    def test_numeric_expression(self, sample_fields):
+        """Expression without letters references no keys."""
+        assert extract_filter_keys(sample_fields, "1 > 0") == []
+
     def test_multiple_keys(self, sample_fields):
         """Multiple keys are extracted."""
         result = extract_filter_keys(sample_fields, "name == 'test' and id > 0")
@@ -517,6 +593,13 @@ class TestExtractFilterKeys:
         result = extract_filter_keys(sample_fields, "name == 'first_name'")
         assert result == ["name"]
 
+    def test_keys_between_multiple_string_literals(self, sample_fields):
+        """Keys between several literals are found; keys inside any literal are not."""
+        result = extract_filter_keys(
+            sample_fields, "\"id\" == first_name or 'name' == id or abc123_custom == \"x\""
+        )
+        assert result == ["first_name", "id", "abc123_custom"]
+
     def test_empty_expression(self, sample_fields):
         """Empty expression returns empty list."""
         result = extract_filter_keys(sample_fields, "")
@@ -622,6 +705,145 @@ class TestFilterRecord:
             filter_record(record, "age > 30")
 
 
+class TestCompileFilter:
+    """Tests for filters compiled once and evaluated per record."""
+
+    def test_reused_across_records(self):
+        """One compiled filter sees each record's own values."""
+        matches = compile_filter("age > 25 and contains(name, 'o')")
+        records = [
+            {"name": "John", "age": 30},
+            {"name": "Jane", "age": 40},
+            {"name": "Bob", "age": 20},
+        ]
+        assert [r["name"] for r in records if matches(r)] == ["John"]
+
+    def test_parsed_once(self, monkeypatch):
+        """The expression is parsed on the first record only."""
+        calls = []
+        original = EvalWithCompoundTypes.parse
+
+        def counting_parse(expr):
+            calls.append(expr)
+            return original(expr)
+
+        monkeypatch.setattr(EvalWithCompoundTypes, "parse", staticmethod(counting_parse))
+        expressions._parse_expression.cache_clear()
+        matches = compile_filter("age > 25")
+        assert [matches({"age": n}) for n in (10, 30, 50)] == [False, True, True]
+        assert calls == ["age > 25"]
+
+    def test_parse_shared_across_compilations(self, monkeypatch):
+        """Compiling or evaluating the same expression again reuses its parse."""
+        calls = []
+        original = EvalWithCompoundTypes.parse
+
+        def counting_parse(expr):
+            calls.append(expr)
+            return original(expr)
+
+        monkeypatch.setattr(EvalWithCompoundTypes, "parse", staticmethod(counting_parse))
+        expressions._parse_expression.cache_clear()
+        assert compile_filter("age > 25")({"age": 30})
+        assert not compile_filter("age > 25")({"age": 20})
+        assert expressions.evaluate_expression({"age": 30}, "age > 25", {})
+        assert calls == ["age > 25"]
+
+    def test_digit_key_alias(self):
+        """Digit-starting keys are available via their '_' alias."""
+        matches = compile_filter("_25da == 'x'")
+        assert matches({"25da": "x"}) is True
+        assert matches({"25da": "y"}) is False
+
+    def test_name_precedence(self):
+        """Constants override fields, and digit-key aliases override '_' fields."""
+        record = {"null": "x", "25da": 1, "_25da": 2, "phone": None}
+        assert compile_filter("phone == null and _25da == 1")(record) is True
+
+    def test_comprehension_variables(self):
+        """Comprehension variables shadow fields of the same name."""
+        matches = compile_filter("[t for t in tags if t == 'vip'] == ['vip']")
+        assert matches({"tags": ["vip", "new"], "t": "other"}) is True
+
+    def test_empty_expression_matches_all(self):
+        """Empty expression matches all records."""
+        assert compile_filter("")({"name": "John"}) is True
+
+    def test_errors_raised_per_record(self):
+        """Missing fields and syntax errors raise FilterError when evaluated."""
+        matches = compile_filter("age > 30")
+        with pytest.raises(FilterError):
+            matches({"name": "John"})
+        assert matches({"age": 40}) is True
+
+        invalid = compile_filter("syntax error here")
+        with pytest.raises(FilterError):
+            invalid({"name": "John"})
+
+
+class TestFormatResolvedExpression:
+    """Tests for displaying a resolved filter expression."""
+
+    def test_identifiers_replaced_by_names(self):
+        """Resolved identifiers and hex key prefixes are shown by name."""
+        resolutions = {
+            "first": ("first_name", "First Name"),
+            "25da": ("25da23b938af", "Code"),
+        }
+        name_line, key_line = format_resolved_expression(
+            "first == 'x' and 25da > 1 and firstly",
+            "first_name == 'x' and _25da23b938af > 1 and firstly",
+            resolutions,
+        )
+        assert name_line == "\"First Name\" == 'x' and Code > 1 and firstly"
+        assert key_line == "first_name == 'x' and _25da23b938af > 1 and firstly"
+
+    def test_no_resolution(self):
+        """Without resolutions only the expression is returned."""
+        assert format_resolved_expression("age > 1", "age > 1", {}) == ("age > 1", "")
+
+
+class TestFilterRecords:
+    """Tests for filtering a record list with one compiled expression."""
+
+    def test_returns_matching_records_in_order(self):
+        """Matching records are returned unchanged and in input order."""
+        records = [{"id": 1, "age": 30}, {"id": 2, "age": 20}, {"id": 3, "age": 40}]
+        assert filter_records(records, "age > 25") == [records[0], records[2]]
+
+    def test_enum_labels_with_option_lookup(self):
+        """Enum values compare by label but the original records are returned."""
+        records = [{"id": 1, "civ": "37"}, {"id": 2, "civ": "38"}]
+        option_lookup = {"civ": {"37": "Monsieur", "38": "Madame"}}
+        assert filter_records(records, "civ == 'madame'", option_lookup) == [records[1]]
+
+    def test_empty_expression_keeps_all(self):
+        """Empty expression keeps every record."""
+        records = [{"id": 1}, {"id": 2}]
+        assert filter_records(records, "") == records
+
+    def test_digit_key_alias_wrapped(self):
+        """Enum fields referenced through their '_' alias are still wrapped."""
+        records = [{"id": 1, "25da": "37"}, {"id": 2, "25da": "38"}]
+        option_lookup = {"25da": {"37": "Monsieur", "38": "Madame"}, "civ": {}}
+        assert filter_records(records, "_25da == 'monsieur'", option_lookup) == [records[0]]
+
+
+class TestReferencedOptionLookup:
+    """Tests for restricting option lookups to referenced fields."""
+
+    def test_keeps_referenced_fields_only(self):
+        option_lookup = {"civ": {"1": "M"}, "25da": {"2": "X"}, "status": {"3": "On"}}
+        assert referenced_option_lookup(option_lookup, ["civ == 'm'", "_25da"]) == {
+            "civ": {"1": "M"},
+            "25da": {"2": "X"},
+        }
+
+    def test_unparsable_expression_keeps_all(self):
+        option_lookup = {"civ": {"1": "M"}}
+        assert referenced_option_lookup(option_lookup, ["civ ==="]) == option_lookup
+
+
 class TestResolveFieldName:
     """Tests for resolve_field_name function."""
 
@@ -698,6 +920,16 @@ class TestResolveFieldPrefixes:
         assert resolved == ["name", "email"]
         assert unmatched == []
 
+    def test_exact_keys_skip_matching(self, sample_fields, monkeypatch):
+        """Exact keys resolve without running prefix matching."""
+        def fail(*args, **kwargs):
+            raise AssertionError("find_field_matches should not be called")
+
+        monkeypatch.setattr(search, "find_field_matches", fail)
+        resolved, unmatched = resolve_field_prefixes(sample_fields, ["email", "id", "email"])
+        assert resolved == ["email", "id"]
+        assert unmatched == []
+
     def test_key_prefix(self, sample_fields):
         """Key prefixes are resolved."""
         resolved, unmatched = resolve_field_prefixes(sample_fields, ["abc123"])
@@ -869,6 +1101,91 @@ class TestSelectFields:
         result = select_fields(record, include_keys=None, exclude_keys=None)
         assert result == record
 
+    def test_set_keys(self):
+        """Sets are accepted for include/exclude keys."""
+        record = {"id": 1, "name": "John", "email": "john@test.com"}
+        assert select_fields(record, {"id", "email"}, None) == {
+            "id": 1, "email": "john@test.com"
+        }
+        assert select_fields(record, None, {"email"}) == {"id": 1, "name": "John"}
+
+
+class TestMakeFieldSelector:
+    """Tests for the reusable field selector."""
+
+    def test_matches_select_fields(self):
+        """Selector gives the same result as select_fields, in record order."""
+        record = {"id": 1, "name": "John", "email": "john@test.com"}
+        for include, exclude in [(["email", "id"], None), (None, ["email"]), (None, None)]:
+            selector = make_field_selector(include, exclude)
+            assert selector(record) == select_fields(record, include, exclude)
+        assert list(make_field_selector(["email", "id"], None)(record)) == ["id", "email"]
+
+    def test_keys_copied(self):
+        """Later changes to the key list do not affect the selector."""
+        include = ["id"]
+        selector = make_field_selector(include, None)
+        include.append("name")
+        assert selector({"id": 1, "name": "John"}) == {"id": 1}
+class TestFormatTable:
+    """Tests for Rich table output formatting."""
+
+    def test_uses_provided_option_lookup(self):
+        """A pre-built option lookup is used instead of rebuilding from fields."""
+        console = Console(record=True, width=120)
+        fields = [
+            {"key": "id", "name": "ID"},
+            {"key": "status", "name": "Status", "field_type": "enum", "options": []},
+        ]
+        format_table(
+            [{"id": 1, "status": "7"}],
+            fields,
+            console,
+            option_lookup={"status": {"7": "Active"}},
+        )
+        output = console.export_text()
+        assert "Status" in output
+        assert "Active" in output
+
+    def test_complex_and_long_values(self):
+        """Dicts show their name, lists their first value, long text is truncated."""
+        console = Console(record=True, width=200)
+        format_table(
+            [{
+                "id": 1,
+                "org_id": {"value": 5, "name": "ACME"},
+                "email": [{"value": "a@b.c", "primary": True}],
+                "notes": "x" * 50,
+                "age": None,
+            }],
+            None,
+            console,
+        )
+        output = console.export_text()
+        assert "ACME" in output
+        assert "a@b.c" in output
+        assert "x" * 37 + "..." in output
+        assert "None" not in output
+
+    def test_mixed_types_in_one_column(self):
+        """Each cell is formatted by its own type, not the first row's."""
+        console = Console(record=True, width=120)
+        format_table(
+            [
+                {"id": 1, "org_id": None},
+                {"id": 2, "org_id": OrderedDict(name="Initech")},
+                {"id": 3, "org_id": ["first", "second"]},
+                {"id": 4, "org_id": 42},
+            ],
+            None,
+            console,
+        )
+        output = console.export_text()
+        assert "Initech" in output
+        assert "first" in output
+        assert "second" not in output
+        assert "42" in output
+
 
 class TestFormatJson:
     """Tests for JSON output formatting."""
@@ -899,6 +1216,23 @@ class TestFormatCsv:
         assert "id" in lines[0]
         assert "name" in lines[0]
 
+    def test_write_records_csv_to_stream(self):
+        """Rows are written to the given stream, matching format_csv."""
+        records = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": None}]
+        stream = io.StringIO()
+        write_records_csv(records, stream)
+        assert stream.getvalue() == format_csv(records)
+        assert stream.getvalue().splitlines() == ["id,tags", '1,"[""a""]"', "2,"]
+
+    def test_complex_values_match_json_dumps(self):
+        """Nested values are encoded exactly as json.dumps(ensure_ascii=False)."""
+        value = {"name": "Zoë", "ids": [1, 2], "ok": True, "none": None}
+        stream = io.StringIO()
+        write_records_csv([{"data": value}], stream)
+        stream.seek(0)
+        rows = list(csv.reader(stream))
+        assert rows[1] == [json.dumps(value, ensure_ascii=False)]
+
     def test_format_csv_empty(self):
         """Empty list returns empty string."""
         result = format_csv([])
@@ -912,6 +1246,26 @@ class TestFormatCsv:
         assert "nested" in result
         assert "value" in result
 
+    def test_format_csv_rows_follow_first_record_columns(self):
+        """Rows are written in header order; missing keys are blank, extra keys dropped."""
+        records = [
+            {"id": 1, "name": "John", "tags": ["a", "b"]},
+            {"name": "Jane", "id": 2, "extra": "x"},
+        ]
+        result = format_csv(records)
+        assert result.splitlines() == [
+            "id,name,tags",
+            '1,John,"[""a"", ""b""]"',
+            "2,Jane,",
+        ]
+
+    def test_format_csv_single_column(self):
+        """A single column is written as one value per row."""
+        # csv quotes a lone empty field so the row is not read as a blank line
+        assert format_csv([{"id": 1}, {"id": None}, {}]).splitlines() == [
+            "id", "1", '""', '""'
+        ]
+
 
 @pytest.fixture
 def search_backup_dir(tmp_path: Path) -> Path:
@@ -1477,6 +1831,29 @@ class TestPreprocessRecordForFilter:
         assert record["status"] == "37"  # Original unchanged
         assert isinstance(processed["status"], EnumValue)
 
+    def test_no_copy_without_enum_value(self):
+        """Records without a value to wrap are returned as-is."""
+        record = {"id": 1, "status": ""}
+        assert preprocess_record_for_filter(record, {"status": {"37": "Active"}}) is record
+
+    def test_overlay_reads_through_record(self):
+        """Only enum values are stored; other fields come from the record."""
+        record = {"id": 1, "status": "37", "name": "Test"}
+        processed = preprocess_record_for_filter(record, {"status": {"37": "Active"}})
+        assert processed.maps[1] is record
+        assert sorted(processed) == ["id", "name", "status"]
+        assert processed["name"] == "Test"
+        assert processed["status"] == "Active"
+
+    def test_shared_cache_interns_wrappers(self):
+        """Records sharing an option value get the same EnumValue from a cache."""
+        option_lookup = {"status": {"37": "Active"}}
+        cache: dict = {}
+        first = wrap_enum_values({"status": "37"}, option_lookup, cache)
+        second = wrap_enum_values({"status": 37}, option_lookup, cache)
+        assert first["status"] is second["status"]
+        assert second["status"] == "Active"
+
     def test_filter_with_enum_value(self):
         """Filter evaluation works with preprocessed record."""
         record = {"id": 1, "status": "37"}
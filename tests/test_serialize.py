@@ -0,0 +1,62 @@
+"""Tests for JSON serialization helpers."""
+
+import json
+from datetime import date
+
+import pytest
+
+from pipedrive_cli import serialize
+from pipedrive_cli.serialize import dumps_line, dumps_pretty, loads
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test with and without orjson."""
+    if request.param and not serialize.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialize, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+class TestDumpsLine:
+    """Tests for single-line JSON serialization."""
+
+    def test_round_trip(self, backend):
+        """Output is one JSON line ending with a newline."""
+        obj = {"entity": "persons", "local_id": 1, "name": "Élodie", "tags": [1, None]}
+        line = dumps_line(obj)
+        assert line.endswith("\n")
+        assert line.count("\n") == 1
+        assert json.loads(line) == obj
+
+    def test_non_serializable_uses_str(self, backend):
+        """Values JSON cannot represent are converted with str()."""
+        assert json.loads(dumps_line({"day": date(2024, 1, 2)})) == {"day": "2024-01-02"}
+
+    def test_big_integer(self, backend):
+        """Integers beyond 64 bits are still serialized."""
+        assert json.loads(dumps_line({"n": 2**70})) == {"n": 2**70}
+
+
+class TestDumpsPretty:
+    """Tests for indented JSON serialization."""
+
+    def test_indented_unicode(self, backend):
+        """Output is indented and keeps non-ASCII characters."""
+        text = dumps_pretty([{"id": 1, "name": "Zoë"}])
+        assert '\n    "name": "Zoë"' in text
+        assert json.loads(text) == [{"id": 1, "name": "Zoë"}]
+
+
+class TestLoads:
+    """Tests for JSON parsing."""
+
+    def test_text_and_bytes(self, backend):
+        """Text and UTF-8 bytes (with trailing newline) parse the same."""
+        line = dumps_line({"entity": "persons", "name": "Zoë"})
+        assert loads(line) == loads(line.encode("utf-8")) == {"entity": "persons", "name": "Zoë"}
+
+    def test_invalid_raises_json_error(self, backend):
+        """Invalid documents raise json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            loads(b'{"entity": "pers')
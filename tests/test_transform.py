@@ -5,12 +5,15 @@ from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
+from simpleeval import IterableTooLong, NameNotDefined
 
+from pipedrive_cli import transform
 from pipedrive_cli.cli import main
-from pipedrive_cli.matching import AmbiguousMatchError
+from pipedrive_cli.matching import AmbiguousMatchError, build_field_index
 from pipedrive_cli.transform import (
     TRANSFORM_FUNCTIONS,
     apply_update_local,
+    compile_assignment,
     evaluate_assignment,
     format_resolved_assignment,
     parse_assignment,
@@ -86,6 +89,20 @@ class TestTransformFunctions:
         assert TRANSFORM_FUNCTIONS["substr"]("hello", 2, None) == "llo"
         assert TRANSFORM_FUNCTIONS["substr"](None, 0, 5) is None
 
+    def test_string_functions_keep_empty_string(self):
+        assert TRANSFORM_FUNCTIONS["upper"]("") == ""
+        assert TRANSFORM_FUNCTIONS["replace"]("", "", "x") == ""
+        assert TRANSFORM_FUNCTIONS["lpad"]("", 3, "0") == ""
+        assert TRANSFORM_FUNCTIONS["substr"]("", 0, 2) == ""
+
+    def test_string_functions_stringify_falsy_numbers(self):
+        """0 and 0.0 are values, not missing: they are converted like other numbers."""
+        assert TRANSFORM_FUNCTIONS["upper"](0) == "0"
+        assert TRANSFORM_FUNCTIONS["lpad"](0, 3, "0") == "000"
+        assert TRANSFORM_FUNCTIONS["substr"](0.0, 0, 1) == "0"
+        assert TRANSFORM_FUNCTIONS["replace"](0, "0", "zero") == "zero"
+        assert TRANSFORM_FUNCTIONS["lpad"](7, 3, "0") == "007"
+
     def test_concat(self):
         assert TRANSFORM_FUNCTIONS["concat"]("a", "b", "c") == "abc"
         assert TRANSFORM_FUNCTIONS["concat"]("hello", " ", "world") == "hello world"
@@ -254,6 +271,14 @@ class TestResolveAssignment:
         assert "_25da23b938af0807ec37bba8be25d77bae233536" in resolved
         assert "b85f32437e17e520e0c1173f4c3c887563d90de8" in resolved
 
+    def test_shared_field_index(self, sample_fields):
+        """A prebuilt index gives the same result as resolving without one."""
+        index = build_field_index(sample_fields)
+        for assignment in ("first='0' + first", "abc=first + ' ' + last"):
+            assert resolve_assignment(sample_fields, assignment, index=index) == (
+                resolve_assignment(sample_fields, assignment)
+            )
+
 
 class TestFormatResolvedAssignment:
     """Tests for assignment formatting."""
@@ -275,6 +300,17 @@ class TestFormatResolvedAssignment:
         assert '"First Name"' in name_line
         assert "first_name" in key_line
 
+    def test_names_not_replaced_twice(self):
+        """A display name containing another identifier is left intact."""
+        resolutions = {
+            "first": ("first_name", "First name"),
+            "name": ("name", "Name"),
+        }
+        name_line, _ = format_resolved_assignment(
+            "first", "first_name", "first + name", "first_name + name", resolutions
+        )
+        assert name_line == '"First name" = "First name" + Name'
+
 
 class TestEvaluateAssignment:
     """Tests for expression evaluation."""
@@ -316,6 +352,87 @@ class TestEvaluateAssignment:
         assert result == "0123456789"
 
 
+class TestCompileAssignment:
+    """Tests for assignment expressions compiled once and evaluated per record."""
+
+    def test_reused_across_records(self):
+        evaluate = compile_assignment("iif(value > 100, upper(name), name)")
+        assert evaluate({"name": "a", "value": 150}) == "A"
+        assert evaluate({"name": "b", "value": 50}) == "b"
+
+    def test_null_constant(self):
+        evaluate = compile_assignment("coalesce(phone, null)")
+        assert evaluate({"phone": ""}) is None
+
+    def test_bare_literal_and_name(self):
+        """Copies and constant assignments match evaluate_assignment."""
+        record = {"name": "a", "25da": "x"}
+        for expression in ["0", "'fr'", "name", "_25da", "null", "upper"]:
+            assert compile_assignment(expression)(record) == evaluate_assignment(
+                record, expression
+            )
+
+    def test_record_independent_evaluated_once(self, monkeypatch):
+        """A constant expression is evaluated once; field reads are not."""
+        calls = []
+        original = TRANSFORM_FUNCTIONS["upper"]
+
+        def counting_upper(s):
+            calls.append(s)
+            return original(s)
+
+        monkeypatch.setitem(TRANSFORM_FUNCTIONS, "upper", counting_upper)
+        constant = compile_assignment("upper('fr') + str(1 + 2)")
+        assert [constant({"name": n}) for n in "abc"] == ["FR3"] * 3
+        assert len(calls) == 1
+
+        per_record = compile_assignment("upper(name)")
+        assert [per_record({"name": n}) for n in "ab"] == ["A", "B"]
+        assert len(calls) == 3
+
+    def test_default_random_functions_not_cached(self):
+        """simpleeval's rand() is not one of ours and is evaluated every time."""
+        evaluate = compile_assignment("rand()")
+        assert len({evaluate({}) for _ in range(5)}) > 1
+
+    def test_mutable_constant_not_shared(self):
+        """List results are rebuilt per record, never shared."""
+        evaluate = compile_assignment("[1, 2]")
+        first = evaluate({})
+        assert evaluate({}) == first and evaluate({}) is not first
+
+    @pytest.mark.parametrize("expression", [
+        "iif(value > 100, upper(name), lower(name))",
+        "value * 2 - 1 if value else -1",
+        "not (value < 3) or name in ['a', 'b']",
+        "upper(upper)",
+        "coalesce(phone, null, name) + '!'",
+    ])
+    def test_same_result_as_evaluator(self, expression):
+        """Compiled expressions give the same results as the plain evaluator."""
+        evaluate = compile_assignment(expression)
+        for record in [{"name": "a", "value": 150, "phone": None, "upper": "x"},
+                       {"name": "b", "value": 0, "phone": "", "upper": "y"}]:
+            assert evaluate(record) == evaluate_assignment(record, expression)
+
+    def test_operator_limits_kept(self):
+        """simpleeval's size limits still apply to compiled arithmetic."""
+        evaluate = compile_assignment("name * count")
+        assert evaluate({"name": "ab", "count": 2}) == "abab"
+        with pytest.raises(IterableTooLong):
+            evaluate({"name": "ab", "count": 10**8})
+
+    def test_bare_name_missing(self):
+        evaluate = compile_assignment("phone")
+        with pytest.raises(NameNotDefined):
+            evaluate({"name": "a"})
+
+    def test_missing_name_in_compiled_expression(self):
+        evaluate = compile_assignment("upper(phone) + name")
+        with pytest.raises(NameNotDefined, match="'phone' is not defined"):
+            evaluate({"name": "a"})
+
+
 class TestApplyUpdateLocal:
     """Tests for local record updates."""
 
@@ -347,6 +464,45 @@ class TestApplyUpdateLocal:
         assert records[0]["first"] == "JOHN"
         assert records[0]["last"] == "DOE"
 
+    @pytest.mark.parametrize(("expression", "option_lookup"), [
+        ("upper(name)", None),
+        ("iif(status == 'Active', upper(name), name)", {"status": {"37": "Active"}}),
+    ])
+    def test_repeated_target_compares_with_previous_assignment(
+        self, expression, option_lookup
+    ):
+        """A second assignment to the same field compares against the first's result."""
+        records = [{"id": 1, "name": "john", "status": "37"}]
+        assignments = [("name", expression), ("name", expression)]
+        stats, changes = apply_update_local(
+            records, assignments, dry_run=False, option_lookup=option_lookup
+        )
+
+        assert stats.updated == 1
+        assert records[0]["name"] == "JOHN"
+        assert changes == [{"id": 1, "field": "name", "old": "john", "new": "JOHN"}]
+
+    @pytest.mark.parametrize("option_lookup", [
+        None,
+        {"status": {"37": "Active"}},  # Entity with enum fields, none referenced
+    ])
+    @pytest.mark.parametrize("dry_run", [False, True])
+    def test_assignments_read_original_record(self, option_lookup, dry_run):
+        """Later assignments see the values before any assignment ran."""
+        records = [{"id": 1, "status": "37", "a": 1, "b": 0}]
+        assignments = [("a", "a + 1"), ("b", "a")]
+        stats, changes = apply_update_local(
+            records, assignments, dry_run=dry_run, option_lookup=option_lookup
+        )
+
+        assert stats.updated == 1
+        assert changes == [
+            {"id": 1, "field": "a", "old": 1, "new": 2},
+            {"id": 1, "field": "b", "old": 0, "new": 1},
+        ]
+        if not dry_run:
+            assert records[0] == {"id": 1, "status": "37", "a": 2, "b": 1}
+
     def test_dry_run_no_changes(self):
         records = [{"id": 1, "name": "john"}]
         assignments = [("name", "upper(name)")]
@@ -629,6 +785,45 @@ class TestApplyUpdateLocalWithEnumValues:
 
         assert records[0]["label"] == "Y"
 
+    def test_unreferenced_enum_fields_not_copied(self):
+        """Enum fields no assignment reads keep their raw values."""
+        records = [{"id": 1, "status": "37", "name": "a"}]
+        option_lookup = {"status": {"37": "Active"}}
+        stats, _ = apply_update_local(
+            records, [("name", "upper(name)")], dry_run=False, option_lookup=option_lookup
+        )
+        assert stats.updated == 1
+        assert records[0] == {"id": 1, "status": "37", "name": "A"}
+
+    def test_unreferenced_enum_fields_skip_wrapping(self, monkeypatch):
+        """No wrapping at all when the assignments read no enum field."""
+        def fail(*args, **kwargs):
+            raise AssertionError("wrap_enum_values should not be called")
+
+        monkeypatch.setattr(transform, "wrap_enum_values", fail)
+        records = [{"id": 1, "status": "37", "name": "a"}]
+        stats, _ = apply_update_local(
+            records, [("name", "upper(name)")], option_lookup={"status": {"37": "Active"}}
+        )
+        assert stats.updated == 1
+
+    def test_enum_target_chained_into_later_assignment(self):
+        """An assigned enum field and a plain field are both read before assignment."""
+        records = [{"id": 1, "a": 1, "st": "5"}]
+        option_lookup = {"st": {"5": "Open", "6": "Won"}}
+        assignments = [
+            ("st", "'6'"),
+            ("a", "a + 1"),
+            ("b", "iif(st == '6', a, -a)"),
+        ]
+
+        stats, _ = apply_update_local(
+            records, assignments, dry_run=False, option_lookup=option_lookup
+        )
+
+        assert stats.failed == 0
+        assert records[0] == {"id": 1, "a": 2, "st": "6", "b": -1}
+
     def test_without_option_lookup(self):
         """Without option_lookup, raw string comparison still works."""
         records = [{"id": 1, "status": "37", "label": ""}]